@@ -0,0 +1,92 @@
+"""Benchmark for adding runs to the campaign database.
+
+Compares the throughput (runs/second) of `CampaignDB.add_runs`, which bulk
+inserts rows with a chunked executemany, against adding one `RunTable` ORM
+object per run to the session (the approach previously used by `add_runs`).
+
+Usage: python benchmarks/bench_add_runs.py [n_runs ...]
+"""
+import os
+import sys
+import time
+import tempfile
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix
+from easyvvuq.data_structs import CampaignInfo, RunInfo
+from easyvvuq.db.sql import CampaignDB, RunTable, DBInfoTable
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+
+def make_db(tmp_dir, name):
+    info = CampaignInfo(name=name,
+                        campaign_dir_prefix=default_campaign_prefix,
+                        easyvvuq_version=uq.__version__,
+                        campaign_dir=tmp_dir)
+    location = 'sqlite:///' + os.path.join(tmp_dir, name + '.db')
+    return CampaignDB(location=location, new_campaign=True, name=name, info=info)
+
+
+def make_runs(n_runs):
+    return [RunInfo(app=1, sample=1, campaign=1,
+                    params={'a': float(i), 'b': 2.0, 'c': 'output.csv'})
+            for i in range(n_runs)]
+
+
+def add_runs_orm(db, run_info_list):
+    """One ORM object per run, as add_runs used to do."""
+    runs_dir = db.runs_dir()
+    for run_info in run_info_list:
+        run_info.ensemble_name = f"Ensemble_{db._next_ensemble}"
+        run_info.run_name = f"Run_{db._next_run}"
+        run_info.run_dir = os.path.join(runs_dir, run_info.run_name)
+        db.session.add(RunTable(**run_info.to_dict(flatten=True)))
+        db._next_run += 1
+    db._next_ensemble += 1
+    db_info = db.session.query(DBInfoTable).first()
+    db_info.next_run = db._next_run
+    db_info.next_ensemble = db._next_ensemble
+    db.session.commit()
+
+
+def bench(n_runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+        for label, add in [('orm', add_runs_orm),
+                           ('bulk', lambda db, runs: db.add_runs(runs))]:
+            db = make_db(tmp_dir, label)
+            runs = make_runs(n_runs)
+            start = time.perf_counter()
+            add(db, runs)
+            elapsed = time.perf_counter() - start
+            assert db.get_num_runs() == n_runs
+            results[label] = n_runs / elapsed
+        print(f"{n_runs:>9} runs: orm {results['orm']:>10.0f} runs/s, "
+              f"bulk {results['bulk']:>10.0f} runs/s "
+              f"({results['bulk'] / results['orm']:.1f}x)")
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 10000, 100000]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,98 @@
+"""Benchmark for building the collated DataFrame.
+
+Decodes N runs with an in-memory decoder (so only the collation cost is
+measured) through `AggregateSamples.decode_run` and
+`AggregateByVariables.decode_run`, and combines the results either with
+`DataFrame.append` in a loop (as collation used to) or with
+`ColumnAccumulator`. The quadratic `DataFrame.append` loop is skipped for
+more than --max-append runs.
+
+Usage: python benchmarks/bench_collation.py [--max-append N] [n_runs ...]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from easyvvuq.collate import AggregateSamples, AggregateByVariables
+from easyvvuq.collate.accumulator import ColumnAccumulator
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+
+class InMemoryDecoder:
+    """Returns one row of three output values for every run."""
+
+    def sim_complete(self, run_info=None):
+        return True
+
+    def parse_sim_output(self, run_info=None):
+        a = run_info['params']['a']
+        return pd.DataFrame({'x': [a], 'y': [2 * a], 'z': [3 * a]})
+
+
+def make_runs(n_runs):
+    rng = np.random.RandomState(0)
+    return [(f'Run_{i}', {'params': {'a': rng.uniform(), 'b': rng.uniform(), 'c': 'out.csv'},
+                          'ensemble_name': f'Ensemble_{i}'})
+            for i in range(1, n_runs + 1)]
+
+
+def collate_append(collater, decoder, runs):
+    new_data = pd.DataFrame()
+    for run_id, run_info in runs:
+        new_data = new_data.append(collater.decode_run(decoder, run_id, run_info),
+                                   ignore_index=True)
+    return new_data
+
+
+def collate_accumulator(collater, decoder, runs):
+    new_data = ColumnAccumulator()
+    for run_id, run_info in runs:
+        new_data.append(collater.decode_run(decoder, run_id, run_info))
+    return new_data.to_dataframe()
+
+
+def bench(n_runs, max_append):
+    decoder = InMemoryDecoder()
+    runs = make_runs(n_runs)
+    for collater in [AggregateSamples(), AggregateByVariables()]:
+        timings = []
+        for method in [collate_append, collate_accumulator]:
+            if method is collate_append and n_runs > max_append:
+                timings.append('skipped')
+                continue
+            start = time.perf_counter()
+            method(collater, decoder, runs)
+            timings.append(f'{time.perf_counter() - start:.2f}s')
+        print(f"{collater.element_name():>24} {n_runs:>7} runs: "
+              f"append {timings[0]:>8}, accumulator {timings[1]:>8}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    max_append = 10000
+    if args[:1] == ['--max-append']:
+        max_append = int(args[1])
+        args = args[2:]
+    for n in [int(n) for n in args] or [1000, 10000, 100000]:
+        bench(n, max_append)
@@ -0,0 +1,137 @@
+"""Benchmark matrix comparing executor backends on the test apps.
+
+For each of the cooling cup and gauss test apps, draws N runs and times
+`populate_runs_dir`, `apply_for_each_run_dir` (running the model with
+ExecuteLocal) and `collate` with the campaign's executor set to each backend
+in turn ('serial', 'thread', 'process' and, if installed, 'dask', with
+--workers workers). With --pack-size (a number, or 'auto') the runs are
+executed in packs of that many runs per task.
+
+Usage: python benchmarks/bench_executors.py [--workers W] [--backends b1,b2]
+       [--pack-size K] [n_runs ...]
+"""
+import os
+import sys
+import time
+import tempfile
+import chaospy as cp
+import easyvvuq as uq
+from easyvvuq.executors import AVAILABLE_EXECUTORS
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests')
+GAUSS_DIR = os.path.join(TESTS_DIR, 'gauss')
+
+
+def cooling_app():
+    params = {
+        "temp_init": {"type": "float", "min": 0.0, "max": 100.0, "default": 95.0},
+        "kappa": {"type": "float", "min": 0.0, "max": 0.1, "default": 0.025},
+        "t_env": {"type": "float", "min": 0.0, "max": 40.0, "default": 15.0},
+        "out_file": {"type": "string", "default": "output.csv"}}
+    encoder = uq.encoders.GenericEncoder(
+        template_fname=os.path.join(TESTS_DIR, 'cooling', 'cooling.template'),
+        delimiter='$', target_filename='cooling_in.json')
+    decoder = uq.decoders.SimpleCSV(target_filename='output.csv', output_columns=['te'],
+                                    header=0)
+    vary = {"kappa": cp.Uniform(0.025, 0.075), "t_env": cp.Uniform(15, 25)}
+    action = uq.actions.ExecuteLocal(
+        os.path.join(TESTS_DIR, 'cooling', 'cooling_model.py') + ' cooling_in.json',
+        interpret=sys.executable)
+    return params, encoder, decoder, vary, action
+
+
+def gauss_app():
+    params = {
+        "sigma": {"type": "float", "min": 0.0, "max": 100000.0, "default": 0.25},
+        "mu": {"type": "float", "min": 0.0, "max": 100000.0, "default": 1},
+        "num_steps": {"type": "integer", "min": 0, "max": 100000, "default": 10},
+        "out_file": {"type": "string", "default": "output.csv"}}
+    encoder = uq.encoders.GenericEncoder(
+        template_fname=os.path.join(GAUSS_DIR, 'gauss.template'),
+        delimiter='$', target_filename='gauss_in.json')
+    decoder = uq.decoders.SimpleCSV(target_filename='output.csv', output_columns=['numbers'],
+                                    header=0)
+    vary = {"mu": cp.Uniform(1.0, 100.0), "sigma": cp.Uniform(0.1, 1.0)}
+    action = uq.actions.ExecuteLocal(
+        os.path.join(GAUSS_DIR, 'gauss_json.py') + ' gauss_in.json',
+        interpret=sys.executable)
+    return params, encoder, decoder, vary, action
+
+
+APPS = {'cooling': cooling_app, 'gauss': gauss_app}
+
+
+def make_executor(backend, workers):
+    if backend == 'serial':
+        return AVAILABLE_EXECUTORS['serial']()
+    if backend == 'dask':
+        return AVAILABLE_EXECUTORS['dask'](n_workers=workers)
+    return AVAILABLE_EXECUTORS[backend](max_workers=workers)
+
+
+def bench(app_name, backend, n_runs, workers, pack_size=1):
+    params, encoder, decoder, vary, action = APPS[app_name]()
+    with tempfile.TemporaryDirectory() as tmp_dir, make_executor(backend, workers) as executor:
+        campaign = uq.Campaign(name='bench', work_dir=tmp_dir, executor=executor)
+        campaign.add_app(name=app_name, params=params, encoder=encoder, decoder=decoder,
+                         collater=uq.collate.AggregateSamples())
+        campaign.set_sampler(uq.sampling.RandomSampler(vary=vary, max_num=n_runs))
+        campaign.draw_samples()
+        # Start the workers (e.g. of a Dask cluster) before timing
+        executor.map(abs, [0])
+        times = []
+        for step in [campaign.populate_runs_dir,
+                     lambda: campaign.apply_for_each_run_dir(action, pack_size=pack_size),
+                     campaign.collate]:
+            start = time.perf_counter()
+            step()
+            times.append(time.perf_counter() - start)
+        assert(len(campaign.get_collation_result()) > 0)
+    print(f"{app_name:>8} {backend:>7} {n_runs:>6} runs: encode {times[0]:7.2f}s, "
+          f"execute {times[1]:7.2f}s, collate {times[2]:7.2f}s, total {sum(times):7.2f}s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = os.cpu_count()
+    backends = ['serial', 'thread', 'process', 'dask']
+    pack_size = 1
+    while args[:1] in (['--workers'], ['--backends'], ['--pack-size']):
+        if args[0] == '--workers':
+            workers = int(args[1])
+        elif args[0] == '--backends':
+            backends = args[1].split(',')
+        else:
+            pack_size = args[1] if args[1] == 'auto' else int(args[1])
+        args = args[2:]
+    if 'dask' in backends:
+        try:
+            import dask.distributed  # noqa: F401
+        except ImportError:
+            backends.remove('dask')
+    for n in [int(n) for n in args] or [100, 1000]:
+        for app_name in APPS:
+            for backend in backends:
+                bench(app_name, backend, n, workers, pack_size)
@@ -0,0 +1,89 @@
+"""Benchmark for selecting runs on parameter values.
+
+Times counting the runs with `viscosity > 0.999` (0.1% of the runs) by
+decoding every run in Python, by a `where` condition evaluated on the JSON
+params of the run table and by a `where` condition evaluated on the indexed
+parameter table of the app.
+
+Usage: python benchmarks/bench_param_where.py [n_runs ...]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix
+from easyvvuq.data_structs import CampaignInfo, RunInfo, AppInfo
+from easyvvuq.db.sql import CampaignDB
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+WHERE = [('viscosity', '>', 0.999)]
+
+
+def make_db(tmp_dir, n_runs):
+    info = CampaignInfo(name='bench',
+                        campaign_dir_prefix=default_campaign_prefix,
+                        easyvvuq_version=uq.__version__,
+                        campaign_dir=tmp_dir)
+    location = 'sqlite:///' + os.path.join(tmp_dir, 'bench.db')
+    db = CampaignDB(location=location, new_campaign=True, name='bench', info=info)
+    params = uq.ParamsSpecification({
+        "viscosity": {"type": "float", "default": 0.5},
+        "n": {"type": "integer", "default": 1}})
+    decoder = uq.decoders.SimpleCSV(target_filename='output.csv', output_columns=['x'], header=0)
+    db.add_app(AppInfo('bench', params, uq.encoders.DirectoryBuilder(tree={}), decoder,
+                       uq.collate.AggregateSamples()), param_table=True)
+    rng = random.Random(0)
+    db.add_runs([RunInfo(app=1, sample=1, campaign=1,
+                         params={'viscosity': rng.random(), 'n': i})
+                 for i in range(n_runs)])
+    return db
+
+
+def python_loop(db):
+    return sum(1 for _, run in db.runs(app_id=1) if run['params']['viscosity'] > 0.999)
+
+
+def bench(n_runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = make_db(tmp_dir, n_runs)
+        timings = {}
+        counts = set()
+        for label, method in [
+                ('python', python_loop),
+                ('json', lambda db: db.get_num_runs(where=WHERE)),
+                ('param table', lambda db: db.get_num_runs(app_id=1, where=WHERE))]:
+            start = time.perf_counter()
+            counts.add(method(db))
+            timings[label] = time.perf_counter() - start
+        assert len(counts) == 1
+        print(f"{n_runs:>9} runs: " + ', '.join(
+            f"{label} {timing:.3f}s" for label, timing in timings.items()))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [100000, 1000000]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,119 @@
+"""Benchmark for the pipelined encode, execute and decode scheduler.
+
+Runs N runs of a shell model that sleeps for --sleep seconds, once with the
+phases `populate_runs_dir`, `apply_for_each_run_dir` and `collate` in turn,
+and once with `Campaign.run_pipeline`, both with --workers concurrent
+executions. Reports the time until the first result is in the collation
+store and the total time.
+
+Usage: python benchmarks/bench_pipeline.py [--sleep S] [--workers W] [n_runs ...]
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+import easyvvuq as uq
+from easyvvuq.constants import Status
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+MODEL = """#!/bin/sh
+sleep {sleep}
+a=$(cat input.txt)
+printf 'x\\n%s\\n' "$a" > output.csv
+"""
+
+
+def make_campaign(tmp_dir, n_runs, sleep):
+    model = os.path.join(tmp_dir, 'model.sh')
+    with open(model, 'w') as fd:
+        fd.write(MODEL.format(sleep=sleep))
+    os.chmod(model, 0o755)
+    template = os.path.join(tmp_dir, 'input.template')
+    with open(template, 'w') as fd:
+        fd.write('$a\n')
+    campaign = uq.Campaign(name='bench', work_dir=tmp_dir)
+    campaign.add_app(name='bench',
+                     params={"a": {"type": "float", "min": 0.0, "max": 1.0, "default": 0.5}},
+                     encoder=uq.encoders.GenericEncoder(template_fname=template, delimiter='$',
+                                                        target_filename='input.txt'),
+                     decoder=uq.decoders.SimpleCSV(target_filename='output.csv',
+                                                   output_columns=['x'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(
+        sweep={"a": [i / n_runs for i in range(n_runs)]}))
+    campaign.draw_samples()
+    return campaign, uq.actions.ExecuteLocal(model)
+
+
+def time_to_first_result(campaign, run):
+    """Run `run()`, polling the database for the first collated run from a
+    second connection. Returns the time to the first result and in total."""
+    db = uq.db.sql.CampaignDB(location=campaign.db_location, name=campaign.campaign_name)
+    first = []
+    done = threading.Event()
+
+    def poll():
+        while not done.is_set():
+            if db.status_counts()[Status.COLLATED] > 0:
+                first.append(time.perf_counter())
+                return
+            time.sleep(0.01)
+    poller = threading.Thread(target=poll)
+    start = time.perf_counter()
+    poller.start()
+    run()
+    total = time.perf_counter() - start
+    done.set()
+    poller.join()
+    return (first[0] - start if first else total), total
+
+
+def bench(n_runs, sleep, workers):
+    for label in ['phases', 'pipeline']:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            campaign, action = make_campaign(tmp_dir, n_runs, sleep)
+            if label == 'phases':
+                def run():
+                    campaign.populate_runs_dir()
+                    campaign.apply_for_each_run_dir(action, max_workers=workers)
+                    campaign.collate()
+            else:
+                def run():
+                    campaign.run_pipeline(action, execute_workers=workers, flush_seconds=0.5)
+            first, total = time_to_first_result(campaign, run)
+            print(f"{label:>8} {n_runs:>6} runs: first result {first:6.2f}s, total {total:6.2f}s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sleep, workers = 0.1, os.cpu_count()
+    while args[:1] in (['--sleep'], ['--workers']):
+        if args[0] == '--sleep':
+            sleep = float(args[1])
+        else:
+            workers = int(args[1])
+        args = args[2:]
+    for n in [int(n) for n in args] or [100, 1000]:
+        bench(n, sleep, workers)
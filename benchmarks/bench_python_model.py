@@ -0,0 +1,97 @@
+"""Benchmark for evaluating a Python model in process.
+
+Runs N samples of the cooling cup model, once through the file based cycle
+(`populate_runs_dir` with a GenericEncoder, `ExecuteLocal` running the
+model script, `collate` with SimpleCSV) and once in process with
+`ExecutePython` and `Campaign.apply_for_each_run`, and reports the time
+per run of each.
+
+Usage: python benchmarks/bench_python_model.py [n_runs ...]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import chaospy as cp
+import easyvvuq as uq
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+COOLING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'cooling')
+PARAMS = {
+    "temp_init": {"type": "float", "min": 0.0, "max": 100.0, "default": 95.0},
+    "kappa": {"type": "float", "min": 0.0, "max": 0.1, "default": 0.025},
+    "t_env": {"type": "float", "min": 0.0, "max": 40.0, "default": 15.0},
+    "out_file": {"type": "string", "default": "output.csv"}}
+VARY = {"kappa": cp.Uniform(0.025, 0.075), "t_env": cp.Uniform(15, 25)}
+
+
+def cooling_model(params):
+    """The cooling cup model of tests/cooling/cooling_model.py."""
+    from scipy.integrate import odeint
+    t = np.linspace(0, 200, 150)
+    te = odeint(lambda T, time: -params['kappa'] * (T - params['t_env']),
+                params['temp_init'], t)[:, 0]
+    return {'te': te}
+
+
+def make_campaign(tmp_dir, n_runs, files):
+    campaign = uq.Campaign(name='bench', work_dir=tmp_dir)
+    if files:
+        encoder = uq.encoders.GenericEncoder(
+            template_fname=os.path.join(COOLING_DIR, 'cooling.template'),
+            delimiter='$', target_filename='cooling_in.json')
+        decoder = uq.decoders.SimpleCSV(target_filename='output.csv', output_columns=['te'],
+                                        header=0)
+    else:
+        encoder, decoder = None, None
+    campaign.add_app(name='cooling', params=PARAMS, encoder=encoder, decoder=decoder,
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.RandomSampler(vary=VARY, max_num=n_runs))
+    campaign.draw_samples()
+    return campaign
+
+
+def bench(n_runs):
+    for label in ['files', 'in-process']:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            campaign = make_campaign(tmp_dir, n_runs, label == 'files')
+            start = time.perf_counter()
+            if label == 'files':
+                campaign.populate_runs_dir()
+                campaign.apply_for_each_run_dir(uq.actions.ExecuteLocal(
+                    os.path.join(COOLING_DIR, 'cooling_model.py') + ' cooling_in.json',
+                    interpret=sys.executable))
+                campaign.collate()
+            else:
+                campaign.apply_for_each_run(uq.actions.ExecutePython(cooling_model))
+            elapsed = time.perf_counter() - start
+            assert(len(campaign.get_collation_result()) == 150 * n_runs)
+        print(f"{label:>10} {n_runs:>6} runs: {elapsed:8.2f}s, "
+              f"{1000 * elapsed / n_runs:8.2f}ms per run")
+
+
+if __name__ == "__main__":
+    for n in [int(n) for n in sys.argv[1:]] or [100, 1000]:
+        bench(n)
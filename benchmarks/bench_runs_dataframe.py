@@ -0,0 +1,83 @@
+"""Benchmark for reading run information from the campaign database.
+
+Compares building a DataFrame of all runs (with one column per parameter)
+from the dicts yielded by `CampaignDB.runs` against
+`CampaignDB.runs_dataframe`, which uses a single query and parses the
+parameters of all runs at once.
+
+Usage: python benchmarks/bench_runs_dataframe.py [n_runs ...]
+"""
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix
+from easyvvuq.data_structs import CampaignInfo, RunInfo
+from easyvvuq.db.sql import CampaignDB
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+
+def make_db(tmp_dir, n_runs):
+    info = CampaignInfo(name='bench',
+                        campaign_dir_prefix=default_campaign_prefix,
+                        easyvvuq_version=uq.__version__,
+                        campaign_dir=tmp_dir)
+    location = 'sqlite:///' + os.path.join(tmp_dir, 'bench.db')
+    db = CampaignDB(location=location, new_campaign=True, name='bench', info=info)
+    db.add_runs([RunInfo(app=1, sample=1, campaign=1,
+                         params={'a': float(i), 'b': i, 'c': 'output.csv'})
+                 for i in range(n_runs)])
+    return db
+
+
+def runs_loop(db):
+    rows = []
+    for run_name, run_info in db.runs():
+        row = {key: value for key, value in run_info.items() if key != 'params'}
+        row.update(run_info['params'])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def bench(n_runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = make_db(tmp_dir, n_runs)
+        timings = {}
+        for label, method in [('runs() loop', runs_loop),
+                              ('runs_dataframe', lambda db: db.runs_dataframe())]:
+            start = time.perf_counter()
+            df = method(db)
+            timings[label] = time.perf_counter() - start
+            assert len(df) == n_runs
+        print(f"{n_runs:>9} runs: runs() loop {timings['runs() loop']:7.2f}s, "
+              f"runs_dataframe {timings['runs_dataframe']:7.2f}s "
+              f"({timings['runs() loop'] / timings['runs_dataframe']:.1f}x)")
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10000, 100000, 1000000]
+    for n in sizes:
+        bench(n)
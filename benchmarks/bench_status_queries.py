@@ -0,0 +1,122 @@
+"""Benchmark for status queries on a large run table.
+
+Builds a campaign database with N runs (most COLLATED, 1% ENCODED and 0.1%
+NEW), copies it and drops the run table indexes from the copy, then times
+common queries on both: counting runs with one status, counting runs
+with every status at once, reading the first page of ENCODED runs of the
+app, looking up the status of single runs by name and setting the status
+of a list of runs.
+
+Usage: python benchmarks/bench_status_queries.py [n_runs ...]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+from sqlalchemy import text
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix, Status
+from easyvvuq.data_structs import CampaignInfo, RunInfo
+from easyvvuq.db.sql import CampaignDB, RunTable
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+N_LOOKUPS = 200
+N_UPDATES = 1000
+
+
+def make_db(path, n_runs):
+    info = CampaignInfo(name='bench',
+                        campaign_dir_prefix=default_campaign_prefix,
+                        easyvvuq_version=uq.__version__,
+                        campaign_dir=os.path.dirname(path))
+    db = CampaignDB(location='sqlite:///' + path, new_campaign=True, name='bench', info=info)
+    db.add_runs([RunInfo(app=1, sample=1, campaign=1, params={'a': float(i)})
+                 for i in range(n_runs)])
+    with db.engine.begin() as connection:
+        connection.execute(text(f"UPDATE run SET status = {int(Status.COLLATED)}"))
+        connection.execute(text(f"UPDATE run SET status = {int(Status.ENCODED)} "
+                                f"WHERE id % 100 = 0"))
+        connection.execute(text(f"UPDATE run SET status = {int(Status.NEW)} "
+                                f"WHERE id % 1000 = 1"))
+    db.close()
+    db.engine.dispose()
+
+
+def drop_indexes(path):
+    db = CampaignDB(location='sqlite:///' + path, name='bench')
+    with db.engine.begin() as connection:
+        for index in RunTable.__table__.indexes:
+            connection.execute(text(f"DROP INDEX {index.name}"))
+    db.close()
+    db.engine.dispose()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_queries(path, n_runs):
+    # The schema version is kept, so opening does not recreate dropped indexes
+    db = CampaignDB(location='sqlite:///' + path, name='bench')
+    rng = random.Random(0)
+    names = [f"Run_{rng.randint(1, n_runs)}" for _ in range(N_UPDATES)]
+    timings = {
+        'count NEW': timed(lambda: db.get_num_runs(status=Status.NEW)),
+        'status counts': timed(lambda: db.status_counts(app_id=1)),
+        'page ENCODED': timed(lambda: list(zip(
+            range(1000), db.runs(status=Status.ENCODED, app_id=1)))),
+        f'{N_LOOKUPS} status lookups': timed(
+            lambda: [db.get_run_status(name) for name in names[:N_LOOKUPS]]),
+        f'set {N_UPDATES} statuses': timed(
+            lambda: db.set_run_statuses(names, Status.ENCODED)),
+    }
+    db.close()
+    db.engine.dispose()
+    return timings
+
+
+def bench(n_runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        indexed = os.path.join(tmp_dir, 'indexed.db')
+        unindexed = os.path.join(tmp_dir, 'unindexed.db')
+        make_db(indexed, n_runs)
+        shutil.copy(indexed, unindexed)
+        drop_indexes(unindexed)
+        with_indexes = bench_queries(indexed, n_runs)
+        without_indexes = bench_queries(unindexed, n_runs)
+        print(f"{n_runs} runs:")
+        for query in with_indexes:
+            print(f"  {query:>22}: no indexes {without_indexes[query]:8.3f}s, "
+                  f"indexes {with_indexes[query]:8.3f}s "
+                  f"({without_indexes[query] / with_indexes[query]:.0f}x)")
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1000000]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,86 @@
+"""Benchmark for evaluating a vectorized model on a full Saltelli design.
+
+Draws the QMCSampler design for N Monte Carlo samples of the Ishigami
+function and times its evaluation and QMCAnalysis, with
+`Campaign.apply_to_samples` and a vectorized model (for the 'sql' and
+'parquet' collation stores), and, for designs of up to --max-per-run
+samples, run by run with `draw_samples` and `apply_for_each_run`.
+
+Usage: python benchmarks/bench_vectorized.py [--max-per-run M] [n_mc_samples ...]
+"""
+import sys
+import time
+import tempfile
+import numpy as np
+import chaospy as cp
+import easyvvuq as uq
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+PARAMS = {p: {"type": "float", "min": -4.0, "max": 4.0, "default": 0.0} for p in 'xyz'}
+
+
+def ishigami(params):
+    x, y, z = params['x'], params['y'], params['z']
+    return {'f': np.sin(x) + 7 * np.sin(y) ** 2 + 0.1 * z ** 4 * np.sin(x)}
+
+
+def ishigami_block(block):
+    x, y, z = block.T
+    return np.sin(x) + 7 * np.sin(y) ** 2 + 0.1 * z ** 4 * np.sin(x)
+
+
+def bench(n_mc_samples, label, collation_store='sql'):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        campaign = uq.Campaign(name='bench', work_dir=tmp_dir, collation_store=collation_store)
+        campaign.add_app(name='ishigami', params=PARAMS, collater=uq.collate.AggregateSamples())
+        sampler = uq.sampling.QMCSampler({p: cp.Uniform(-np.pi, np.pi) for p in 'xyz'},
+                                         n_mc_samples=n_mc_samples)
+        campaign.set_sampler(sampler)
+        start = time.perf_counter()
+        if label == 'per run':
+            campaign.draw_samples()
+            campaign.apply_for_each_run(uq.actions.ExecutePython(ishigami))
+        else:
+            campaign.apply_to_samples(uq.actions.ExecuteVectorized(ishigami_block, ['f']))
+        evaluate = time.perf_counter() - start
+        start = time.perf_counter()
+        campaign.apply_analysis(uq.analysis.QMCAnalysis(sampler=sampler, qoi_cols=['f']))
+        analyse = time.perf_counter() - start
+        first = campaign.get_last_analysis()['sobols_first']['f']
+    print(f"{label:>10} {collation_store:>7} {sampler.n_samples:>8} samples: evaluate "
+          f"{evaluate:7.2f}s, analyse {analyse:7.2f}s, "
+          f"S_x {float(first['x']):.3f} S_y {float(first['y']):.3f} S_z {float(first['z']):.3f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    max_per_run = 10 ** 4
+    if args[:1] == ['--max-per-run']:
+        max_per_run = int(args[1])
+        args = args[2:]
+    for n in [int(n) for n in args] or [10 ** 4, 10 ** 5]:
+        bench(n, 'vectorized', 'sql')
+        bench(n, 'vectorized', 'parquet')
+        if n <= max_per_run:
+            bench(n, 'per run')
@@ -6,6 +6,7 @@ from .campaign import Campaign
 from .campaign_dask import CampaignDask
 from .worker import Worker
 from . import actions
+from . import executors
 from . import encoders
 from . import decoders
 from .base_element import BaseElement
@@ -1,5 +1,6 @@
-from .base import BaseAction
+from .base import BaseAction, ExecutionResult
 from .execute_local import ExecuteLocal
+from .execute_python import ExecutePython, ExecuteVectorized
 
 __copyright__ = """
 
@@ -43,3 +43,31 @@ class BaseAction:
 
         """
         raise NotImplementedError
+
+
+class ExecutionResult:
+    """
+    Outcome of executing a run, as returned by actions that run a command.
+
+    Parameters
+    ----------
+    exit_code : int
+        Exit code of the command (negative if killed by a signal).
+    wall_time : float
+        Seconds the command took.
+    timed_out : bool
+        Was the command killed because it exceeded its timeout.
+    """
+
+    def __init__(self, exit_code, wall_time, timed_out=False):
+        self.exit_code = exit_code
+        self.wall_time = wall_time
+        self.timed_out = timed_out
+
+    @property
+    def failed(self):
+        return self.timed_out or self.exit_code != 0
+
+    def __repr__(self):
+        return (f"ExecutionResult(exit_code={self.exit_code}, wall_time={self.wall_time:.3f}, "
+                f"timed_out={self.timed_out})")
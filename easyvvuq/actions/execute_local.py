@@ -2,9 +2,12 @@
 """
 
 import os
-import sys
+import time
+import signal
 import logging
-from . import BaseAction
+import contextlib
+import subprocess
+from .base import BaseAction, ExecutionResult
 
 __copyright__ = """
 
@@ -33,7 +36,8 @@ logger = logging.getLogger(__name__)
 
 class ExecuteLocal(BaseAction):
 
-    def __init__(self, run_cmd, interpret=None):
+    def __init__(self, run_cmd, interpret=None, timeout=None, stdout='stdout.log',
+                 stderr='stderr.log'):
         """
         Provides an action element to run a shell command in a specified
         directory.
@@ -45,6 +49,15 @@ class ExecuteLocal(BaseAction):
             Command to execute.
         interpret : str or None
             Interpreter to use to execute cmd.
+        timeout : float or None
+            Seconds after which the command (and any processes it started)
+            is killed and the run counted as failed.
+        stdout : str or None
+            File in the run directory that receives the standard output of
+            the command. If None, it is not captured.
+        stderr : str or None
+            File in the run directory that receives the standard error of the
+            command. If None, it is not captured.
 
         """
 
@@ -57,20 +70,53 @@ class ExecuteLocal(BaseAction):
         # Need to expand users, get absolute path and dereference symlinks
         self.run_cmd = os.path.realpath(os.path.expanduser(run_cmd))
         self.interpreter = interpret
+        self.timeout = timeout
+        self.stdout = stdout
+        self.stderr = stderr
 
     def act_on_dir(self, target_dir):
         """
-        Executes `self.run_cmd` in the shell in `target_dir`.
+        Executes `self.run_cmd` in the shell in `target_dir`. A failing
+        command is logged and reported in the result, so that one bad run
+        does not stop the others.
 
         target_dir : str
             Directory in which to execute command.
 
+        Returns
+        -------
+        :obj:`easyvvuq.actions.ExecutionResult`
+            Exit code and wall time of the command.
         """
 
         if self.interpreter is None:
-            full_cmd = f'cd "{target_dir}"\n{self.run_cmd}\n'
+            full_cmd = self.run_cmd
         else:
-            full_cmd = f'cd "{target_dir}"\n{self.interpreter} {self.run_cmd}\n'
-        result = os.system(full_cmd)
-        if result != 0:
-            sys.exit(f'Non-zero exit code from command "{full_cmd}"\n')
+            full_cmd = f'{self.interpreter} {self.run_cmd}'
+
+        with contextlib.ExitStack() as stack:
+            outputs = [None if name is None else
+                       stack.enter_context(open(os.path.join(target_dir, name), 'wb'))
+                       for name in (self.stdout, self.stderr)]
+            start = time.monotonic()
+            # Start a new session, so that on timeout the processes started by
+            # the command are killed with it
+            process = subprocess.Popen(full_cmd, shell=True, cwd=target_dir,
+                                       stdout=outputs[0], stderr=outputs[1],
+                                       start_new_session=True)
+            timed_out = False
+            try:
+                process.wait(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+            result = ExecutionResult(process.returncode, time.monotonic() - start, timed_out)
+
+        if timed_out:
+            logger.error(f'Command "{full_cmd}" in {target_dir} timed out after '
+                         f'{self.timeout} seconds')
+        elif result.failed:
+            logger.error(f'Non-zero exit code {result.exit_code} from command "{full_cmd}" '
+                         f'in {target_dir}')
+        return result
@@ -0,0 +1,151 @@
+"""Provides elements to evaluate a Python model in the campaign's process,
+one run at a time or as a vectorized function of a block of runs.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from .base import BaseAction
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutePython(BaseAction):
+
+    def __init__(self, function):
+        """
+        Provides an action element that calls a Python function with the
+        parameters of each run, for models cheap enough that writing input
+        files, starting a process and decoding output files would cost more
+        than the model. Its output is collated directly, without run
+        directories, by `Campaign.apply_for_each_run`.
+
+        Parameters
+        ----------
+
+        function : callable
+            Called with the parameters of a run (a dict) and returning a
+            dict, or a DataFrame, of the quantities of interest. A dict of
+            scalars gives one row, a dict of sequences one row per element.
+            To be used by a pool of processes, it must be picklable (e.g.
+            defined at the top level of a module).
+
+        """
+        if not callable(function):
+            msg = f"ExecutePython needs a callable, got {function!r}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        self.function = function
+
+    def act_on_params(self, params):
+        """
+        Evaluate the model for one run.
+
+        Parameters
+        ----------
+
+        params : dict
+            Parameters of the run.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The output of the model.
+        """
+        output = self.function(params)
+        if isinstance(output, pd.DataFrame):
+            return output
+        if isinstance(output, dict):
+            if all(np.ndim(value) == 0 for value in output.values()):
+                return pd.DataFrame([output])
+            return pd.DataFrame(output)
+        msg = f"Model must return a dict or a DataFrame, got {type(output).__name__}"
+        logger.error(msg)
+        raise RuntimeError(msg)
+
+    def act_on_dir(self, target_dir):
+        msg = ("ExecutePython works on run parameters rather than run directories, "
+               "apply it with Campaign.apply_for_each_run")
+        logger.error(msg)
+        raise RuntimeError(msg)
+
+
+class ExecuteVectorized(BaseAction):
+
+    def __init__(self, function, output_columns):
+        """
+        Provides an action element that evaluates a vectorized model for a
+        block of samples at once, e.g. a NumPy surrogate model. It is used by
+        `Campaign.apply_to_samples`, which collates its output without adding
+        runs to the database, or decoding.
+
+        Parameters
+        ----------
+
+        function : callable
+            Called with an array of shape (n, n_params), one row per sample
+            with the parameters in the order of the sampler's `vary`, and
+            returning an array of shape (n, n_qoi).
+        output_columns : list of str
+            Names of the n_qoi output quantities.
+
+        """
+        if not callable(function):
+            msg = f"ExecuteVectorized needs a callable, got {function!r}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        self.function = function
+        self.output_columns = list(output_columns)
+
+    def act_on_block(self, block):
+        """
+        Evaluate the model for a block of samples.
+
+        Parameters
+        ----------
+
+        block : numpy.ndarray
+            Parameters of the samples, of shape (n, n_params).
+
+        Returns
+        -------
+        numpy.ndarray
+            The output of the model, of shape (n, n_qoi).
+        """
+        output = np.asarray(self.function(block))
+        if output.ndim == 1 and len(self.output_columns) == 1:
+            output = output.reshape(-1, 1)
+        expected = (len(block), len(self.output_columns))
+        if output.shape != expected:
+            msg = f"Model output has shape {output.shape}, expected {expected}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        return output
+
+    def act_on_dir(self, target_dir):
+        msg = ("ExecuteVectorized works on blocks of samples rather than run directories, "
+               "apply it with Campaign.apply_to_samples")
+        logger.error(msg)
+        raise RuntimeError(msg)
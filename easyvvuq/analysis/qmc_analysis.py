@@ -2,6 +2,7 @@
 """
 import logging
 import numpy as np
+import pandas as pd
 from easyvvuq import OutputType
 from .base import BaseAnalysisElement
 
@@ -79,15 +80,11 @@ class QMCAnalysis(BaseAnalysisElement):
 
         # Get the number of samples and uncertain parameters
         n_params = self.sampler.n_params
-        n_sobol_samples = int(np.round(2 * self.sampler.n_samples /
+        n_sobol_samples = int(np.round(self.sampler.n_samples /
                               (2 + n_params)))
 
         # Extract output values for each quantity of interest from Dataframe
-        samples = {k: [] for k in qoi_cols}
-        for run_id in data_frame.run_id.unique():
-            for k in qoi_cols:
-                data = data_frame.loc[data_frame['run_id'] == run_id][k]
-                samples[k].append(data.values)
+        samples = self._run_samples(data_frame, qoi_cols)
 
         # Compute descriptive statistics for each quantity of interest
         for k in qoi_cols:
@@ -119,10 +116,24 @@ class QMCAnalysis(BaseAnalysisElement):
             results['sobols_total'][k] = sobols_total_dict
 
             # Correlation matrix
-            results['correlation_matrices'][k] = np.corrcoef(samples[k])
+            results['correlation_matrices'][k] = np.corrcoef(samples[k], rowvar=False)
 
         return results
 
+    @staticmethod
+    def _run_samples(data_frame, qoi_cols):
+        """Return the values of each quantity of interest for each run, in
+        order of first appearance of the runs. If all runs have the same
+        number of rows, as an array with one row per run."""
+        codes, run_ids = pd.factorize(data_frame['run_id'])
+        counts = np.bincount(codes)
+        if counts.min() == counts.max():
+            order = np.argsort(codes, kind='stable')
+            return {k: data_frame[k].values[order].reshape(len(run_ids), -1)
+                    for k in qoi_cols}
+        return {k: [data.values for _, data in data_frame.groupby('run_id', sort=False)[k]]
+                for k in qoi_cols}
+
     # Adapted from SALib
     @staticmethod
     def _separate_output_values(evaluations, n_uncertain_params, n_samples):
@@ -4,14 +4,22 @@ This module contains the Campaign class that is used to coordinate all
 EasyVVUQ workflows.
 """
 import os
+import time
 import logging
 import tempfile
 import json
+import itertools
+import functools
 import easyvvuq
 from easyvvuq import ParamsSpecification
 from easyvvuq.constants import default_campaign_prefix, Status
 from easyvvuq.data_structs import RunInfo, CampaignInfo, AppInfo
 from easyvvuq.sampling import BaseSamplingElement
+from easyvvuq.encoders import BaseEncoder
+from easyvvuq.actions import ExecutionResult
+from easyvvuq.executors import SerialExecutor, ThreadExecutor, ProcessExecutor
+from easyvvuq.executors import choose_pack_size
+from easyvvuq.collate.accumulator import ColumnAccumulator
 
 __copyright__ = """
 
@@ -38,6 +46,9 @@ __license__ = "LGPL"
 
 logger = logging.getLogger(__name__)
 
+# Number of runs after which the results of executing them are recorded
+EXECUTION_RECORD_INTERVAL = 1000
+
 
 class Campaign:
     """Campaigns organise the dataflow in EasyVVUQ workflows.
@@ -73,6 +84,21 @@ class Campaign:
         app), values lying within defined physical range, type checking etc. This should normally
         always be set to True, but in cases where the performance is too degraded, the checks can
         be disabled by setting to False.
+    collation_store: str, optional, default='sql'
+        Where collated results are kept, 'sql' (a table in the campaign database)
+        or 'parquet' (a Parquet dataset in the `collation` subdirectory of the
+        campaign directory, requires pyarrow). The store is recorded in the
+        campaign database, and is ignored when loading from a `state_file`.
+    db_options: dict, optional
+        Options for the database engine, see `easyvvuq.db.sql.CampaignDB`.
+        For example `{'journal_mode': 'WAL'}` lets worker processes read and
+        update the runs of an SQLite database while the campaign uses it.
+        Saved in the state file, and taken from it unless given.
+    executor: :obj:`easyvvuq.executors.BaseExecutor`, optional
+        Executor used by `populate_runs_dir`, `apply_for_each_run_dir` and
+        `collate` (unless they are given one), e.g. a `ProcessExecutor` or a
+        `DaskExecutor`. If None, those methods keep their own defaults. Not
+        saved in the state file.
 
     Attributes
     ----------
@@ -119,7 +145,10 @@ class Campaign:
             work_dir="./",
             state_file=None,
             change_to_state=False,
-            verify_all_runs=True
+            verify_all_runs=True,
+            collation_store='sql',
+            db_options=None,
+            executor=None
     ):
 
         self.work_dir = os.path.realpath(os.path.expanduser(work_dir))
@@ -129,6 +158,9 @@ class Campaign:
         self._campaign_dir = None
         self.db_location = db_location
         self.db_type = db_type
+        self.collation_store = collation_store
+        self.db_options = db_options
+        self.executor = executor
         self._log = []
 
         self.campaign_id = None
@@ -168,6 +200,18 @@ class Campaign:
 
         return os.path.join(self.work_dir, self._campaign_dir)
 
+    @property
+    def collation_dir(self):
+        """Get the path used by file based collation stores.
+
+        Returns
+        -------
+        str
+            The `collation` subdirectory of the campaign directory.
+        """
+
+        return os.path.join(self.campaign_dir, 'collation')
+
     def init_fresh(self, name, db_type='sql',
                    db_location=None, work_dir='.'):
         """
@@ -221,7 +265,10 @@ class Campaign:
             campaign_dir=self.campaign_dir)
         self.campaign_db = CampaignDB(location=self.db_location,
                                       new_campaign=True,
-                                      name=name, info=info)
+                                      name=name, info=info,
+                                      collation_store=self.collation_store,
+                                      collation_dir=self.collation_dir,
+                                      engine_options=self.db_options)
 
         # Record the campaign's name and its associated ID in the database
         self.campaign_name = name
@@ -269,8 +316,12 @@ class Campaign:
         logger.info(f"Opening session with CampaignDB at {self.db_location}")
         self.campaign_db = CampaignDB(location=self.db_location,
                                       new_campaign=False,
-                                      name=self.campaign_name)
+                                      name=self.campaign_name,
+                                      collation_store=self.collation_store,
+                                      collation_dir=self.collation_dir,
+                                      engine_options=self.db_options)
         campaign_db = self.campaign_db
+        self.collation_store = campaign_db.collation_store
         self.campaign_id = campaign_db.get_campaign_id(self.campaign_name)
 
         # Resurrect the sampler
@@ -294,6 +345,8 @@ class Campaign:
         output_json = {
             "db_location": self.db_location,
             "db_type": self.db_type,
+            "collation_store": self.collation_store,
+            "db_options": self.db_options,
             "active_app": self._active_app_name,
             "campaign_name": self.campaign_name,
             "campaign_dir": self._campaign_dir,
@@ -320,6 +373,9 @@ class Campaign:
 
         self.db_location = input_json["db_location"]
         self.db_type = input_json["db_type"]
+        self.collation_store = input_json.get("collation_store")
+        if self.db_options is None:
+            self.db_options = input_json.get("db_options")
         self._active_app_name = input_json["active_app"]
         self.campaign_name = input_json["campaign_name"]
         self._campaign_dir = input_json["campaign_dir"]
@@ -333,7 +389,7 @@ class Campaign:
 
     def add_app(self, name=None, params=None,
                 encoder=None, decoder=None, collater=None,
-                set_active=True):
+                set_active=True, param_table=False):
         """Add an application to the CampaignDB.
 
         Parameters
@@ -342,15 +398,21 @@ class Campaign:
             Name of the application.
         params : dict
             Description of the parameters to associate with the application.
-        encoder : :obj:`easyvvuq.encoders.base.BaseEncoder`
+        encoder : :obj:`easyvvuq.encoders.base.BaseEncoder` or None
             Encoder element to convert parameters into application run inputs.
-        decoder : :obj:`easyvvuq.decoders.base.BaseDecoder`
+            Not needed for models evaluated in process (see
+            `apply_for_each_run`).
+        decoder : :obj:`easyvvuq.decoders.base.BaseDecoder` or None
             Decoder element to convert application run output into data for
-            VVUQ analysis.
+            VVUQ analysis. Not needed for models evaluated in process.
         collater : obj:`easyvvuq.collate.base.BaseCollationElement`
             Collation element for this app.
         set_active: bool
             Should the added app be set to be the currently active app?
+        param_table: bool
+            Store the scalar parameters of the runs in typed, indexed columns
+            as well, so that runs can be selected on parameter values
+            efficiently (see `CampaignDB.create_param_table`).
 
         Returns
         -------
@@ -369,7 +431,7 @@ class Campaign:
             collater=collater
         )
 
-        self.campaign_db.add_app(app)
+        self.campaign_db.add_app(app, param_table=param_table)
         if set_active:
             self.set_app(app.name)
 
@@ -418,7 +480,7 @@ class Campaign:
         self._active_sampler_id = self.campaign_db.add_sampler(sampler)
         self.campaign_db.set_sampler(self.campaign_id, self._active_sampler_id)
 
-    def add_runs(self, runs):
+    def add_runs(self, runs, ensemble_size=None):
         """Add a new run to the queue.
 
         Parameters
@@ -426,6 +488,9 @@ class Campaign:
         runs : list of dicts
             Each dict defines the value of each model parameter listed in
             `self.params_info` for a run to be added to `self.runs`
+        ensemble_size : int or None
+            Number of consecutive runs that share an ensemble. If None, all
+            `runs` are added as a single ensemble.
 
         Returns
         -------
@@ -440,17 +505,17 @@ class Campaign:
 
         app_default_params = self._active_app["params"]
 
-        run_info_list = []
         for new_run in runs:
-
             if new_run is None:
                 msg = ("add_run() was passed new_run of type None. Bad sampler?")
                 logging.error(msg)
                 raise Exception(msg)
 
-            # Verify and complete run with missing/default param values
-            new_run = app_default_params.process_run(new_run, verify=self.verify_all_runs)
+        # Verify and complete runs with missing/default param values
+        runs = app_default_params.process_runs(runs, verify=self.verify_all_runs)
 
+        run_info_list = []
+        for new_run in runs:
             # Add to run queue
             run_info = RunInfo(app=self._active_app['id'],
                                params=new_run,
@@ -459,7 +524,7 @@ class Campaign:
 
             run_info_list.append(run_info)
 
-        self.campaign_db.add_runs(run_info_list)
+        self.campaign_db.add_runs(run_info_list, ensemble_size=ensemble_size)
 
     def add_default_run(self):
         """
@@ -470,13 +535,17 @@ class Campaign:
         new_run = {}
         self.add_runs([new_run])
 
-    def draw_samples(self, num_samples=0, replicas=1):
+    def draw_samples(self, num_samples=0, replicas=1, batch_size=10000):
         """Draws `num_samples` sets of parameters from the currently set
         sampler, resulting in `num_samples` * `replicas` new runs added to the
         runs list. If `num_samples` is 0 (its default value) then
         this method draws ALL samples from the sampler, until exhaustion (this
         will fail if the sampler is not finite).
 
+        Samples are drawn in batches of `batch_size`, each of which is
+        verified and written to the database in a single transaction. Each
+        sample (and its replicas) forms its own ensemble.
+
         Notes
         -----
         Do NOT use this in cases where you need 'replicas' with a different
@@ -492,6 +561,9 @@ class Campaign:
                 Number of replica runs to create with each set of parameters.
                 Default is 1 - so only a single run added for each set of
                 parameters.
+        batch_size : int
+                Number of samples to draw before adding them (and their
+                replicas) to the database. Default is 10000.
 
         Returns
         -------
@@ -510,17 +582,28 @@ class Campaign:
             msg = "Number of replicas ({replicas}) must be at least 1"
             raise RuntimeError(msg)
 
+        if batch_size < 1:
+            msg = f"Batch size ({batch_size}) must be at least 1"
+            raise RuntimeError(msg)
+
         num_added = 0
+        list_of_runs = []
         for new_run in self._active_sampler:
 
-            list_of_runs = [new_run for i in range(replicas)]
-            self.add_runs(list_of_runs)
+            list_of_runs.extend([new_run for i in range(replicas)])
 
             num_added += 1
 
+            if len(list_of_runs) >= batch_size * replicas:
+                self.add_runs(list_of_runs, ensemble_size=replicas)
+                list_of_runs = []
+
             if num_samples != 0 and num_added >= num_samples:
                 break
 
+        if list_of_runs:
+            self.add_runs(list_of_runs, ensemble_size=replicas)
+
         # Write sampler's new state to database
         self.campaign_db.update_sampler(self._active_sampler_id, self._active_sampler)
 
@@ -528,15 +611,40 @@ class Campaign:
         self.log_element_application(self._active_sampler,
                                      {"num_added": num_added, "replicas": replicas})
 
-    def list_runs(self, sampler=None, campaign=None, status=None):
+    def list_runs(self, sampler=None, campaign=None, status=None, where=None):
         """Get list of runs in the CampaignDB.
 
+        Parameters
+        ----------
+        where: list of tuple or None
+            Only list runs of the active app whose parameters satisfy all
+            `(param, op, value)` conditions, e.g. `[('kappa', '>', 0.05)]`
+            (see `CampaignDB.runs`).
+
         Returns
         -------
             list of runs
 
         """
-        return list(self.campaign_db.runs(sampler=sampler, campaign=campaign, status=status))
+        app_id = self._active_app['id'] if where else None
+        return list(self.campaign_db.runs(sampler=sampler, campaign=campaign, status=status,
+                                          app_id=app_id, where=where))
+
+    def runs_dataframe(self, sampler=None, campaign=None, status=None, columns=None,
+                       where=None):
+        """Get a DataFrame of the runs in the CampaignDB, with one column per
+        parameter (see `CampaignDB.runs_dataframe`). If `where` conditions
+        are given only runs of the active app are included.
+
+        Returns
+        -------
+            pandas.DataFrame
+
+        """
+        app_id = self._active_app['id'] if where else None
+        return self.campaign_db.runs_dataframe(
+            sampler=sampler, campaign=campaign, status=status, columns=columns,
+            app_id=app_id, where=where)
 
     def scan_completed(self, *args, **kwargs):
         """
@@ -549,6 +657,24 @@ class Campaign:
         """
         return self.list_runs(status=Status.COLLATED)
 
+    def progress(self, all_apps=False):
+        """
+        Count the runs of this campaign in each status, with a single query
+        (so it is cheap to call repeatedly, even for very large campaigns).
+
+        Parameters
+        ----------
+        all_apps : bool
+            Count the runs of all apps, rather than of the active app only.
+
+        Returns
+        -------
+        dict:
+            Number of runs with each `Status`.
+        """
+        app_id = None if all_apps else self._active_app['id']
+        return self.campaign_db.status_counts(campaign=self.campaign_id, app_id=app_id)
+
     def all_complete(self):
         """
         Check if all runs have reported having output generated by
@@ -565,7 +691,7 @@ class Campaign:
             return True
         return False
 
-    def populate_runs_dir(self):
+    def populate_runs_dir(self, workers=1, chunk_size=100, executor=None):
         """Populate run directories based on runs in the CampaignDB.
 
         This calls the encoder element defined for the current application to
@@ -575,6 +701,20 @@ class Campaign:
         in relation to the work_dir argument you have specified when creating
         the Campaign object.
 
+        Parameters
+        ----------
+        workers : int or None
+            Number of processes used to encode runs, with a `ProcessExecutor`.
+            If 1 (the default) runs are encoded serially in this process, if
+            None one process per core is used.
+        chunk_size : int
+            Number of runs sent to a worker process at a time. The status of
+            each chunk is set to ENCODED as soon as it has been encoded.
+        executor : :obj:`easyvvuq.executors.BaseExecutor` or None
+            Executor encoding the runs, `chunk_size` runs per task, in place
+            of `workers`. Defaults to the executor of the campaign. Executors
+            using other processes need a restartable (or picklable) encoder.
+
         Returns
         -------
 
@@ -586,6 +726,23 @@ class Campaign:
         if active_encoder is None:
             logger.warning('No encoder set for this app. Creating directory structure only.')
 
+        executor = executor or self.executor
+        own_executor = False
+        if executor is None and workers != 1:
+            if active_encoder is None or active_encoder.is_restartable():
+                executor = ProcessExecutor(max_workers=workers)
+                own_executor = True
+            else:
+                logger.warning('Encoder for this app is not restartable, so cannot be sent '
+                               'to worker processes. Encoding runs serially.')
+        if executor is not None:
+            try:
+                self._populate_runs_dir_executor(active_encoder, executor, chunk_size)
+            finally:
+                if own_executor:
+                    executor.shutdown()
+            return
+
         run_ids = []
 
         for run_id, run_data in self.campaign_db.runs(
@@ -602,6 +759,27 @@ class Campaign:
             run_ids.append(run_id)
         self.campaign_db.set_run_statuses(run_ids, Status.ENCODED)
 
+    def _populate_runs_dir_executor(self, encoder, executor, chunk_size):
+        """Encode the NEW runs of the active app with `executor`, in chunks
+        of `chunk_size` runs, with about one chunk per worker at a time.
+        Restartable encoders are sent serialized, so they can be used by
+        executors running in other processes.
+        """
+        if encoder is not None and encoder.is_restartable():
+            encode = functools.partial(_encode_serialized_chunk, encoder.serialize())
+        else:
+            encode = functools.partial(_encode_chunk, encoder)
+        runs = self.campaign_db.runs(status=Status.NEW, app_id=self._active_app['id'])
+        n_runs = chunk_size * executor.n_workers
+        while True:
+            batch = [(run_id, run_data['run_dir'], run_data['params'])
+                     for run_id, run_data in itertools.islice(runs, n_runs)]
+            if not batch:
+                break
+            chunks = [batch[i:i + chunk_size] for i in range(0, len(batch), chunk_size)]
+            for run_ids in executor.map(encode, chunks):
+                self.campaign_db.set_run_statuses(run_ids, Status.ENCODED)
+
     def get_campaign_runs_dir(self):
         """Get the runs directory from the CampaignDB.
 
@@ -620,39 +798,302 @@ class Campaign:
         for run_id, run_data in self.campaign_db.runs(status=status, app_id=self._active_app['id']):
             fn(run_id, run_data)
 
-    def apply_for_each_run_dir(self, action, status=Status.ENCODED):
+    def apply_for_each_run_dir(self, action, status=Status.ENCODED, max_workers=1,
+                               executor=None, pack_size=1, pack_workers=1):
         """
         For each run in this Campaign's run list, apply the specified action
         (an object of type Action)
 
+        Actions returning an `ExecutionResult` (e.g. `ExecuteLocal`) have the
+        exit code and wall time of each run recorded in the database, every
+        EXECUTION_RECORD_INTERVAL runs. Runs whose execution failed are set to
+        Status.FAILED, the other runs carry on.
+
+        Short runs can be packed into tasks of several runs each (with
+        `pack_size`), so the overhead of scheduling a task is spread over
+        them. With `pack_size='auto'` the number of runs per task is chosen
+        (see `easyvvuq.executors.choose_pack_size`) from the mean wall time
+        of the app's runs recorded so far, or, if none has been, from timing
+        a first task per worker.
+
         Parameters
         ----------
         action : the action to be applied to each run directory
             The function to be applied to each run directory. func() will
             be called with the run directory path as its only argument.
+        status : enum(Status)
+            Status of the runs to apply the action to.
+        max_workers : int or None
+            Number of runs the action is applied to at the same time. By
+            default the runs are handled one after the other; otherwise in a
+            pool of threads (so the action must be thread safe), one per core
+            if None.
+        executor : :obj:`easyvvuq.executors.BaseExecutor` or None
+            Executor applying the action, in place of the pool of
+            `max_workers` threads. Defaults to the executor of the campaign.
+        pack_size : int or 'auto'
+            Number of runs per task.
+        pack_workers : int
+            Number of threads applying the action within a task.
 
         Returns
         -------
+        dict:
+            The value returned by the action for each run, keyed by run id.
         """
 
+        if pack_size != 'auto' and not (isinstance(pack_size, int) and pack_size >= 1):
+            msg = f"pack_size must be 'auto' or a positive integer, got {pack_size}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+        own_executor = False
+        executor = executor or self.executor
+        if executor is None:
+            executor = _make_executor(max_workers)
+            own_executor = True
+        app_id = self._active_app['id']
+        wall_time = None
+
         # Loop through all runs in this campaign with status ENCODED, and
         # run the specified action on each run's dir
-        for run_id, run_data in self.campaign_db.runs(status=status, app_id=self._active_app['id']):
-            logger.info("Applying " + action.__module__ + " to " + run_data['run_dir'])
-            action.act_on_dir(run_data['run_dir'])
+        runs = self.campaign_db.runs(status=status, app_id=app_id)
+        results = {}
+        try:
+            while True:
+                chunk_size, chunk_pack_size = EXECUTION_RECORD_INTERVAL, pack_size
+                if pack_size == 'auto':
+                    wall_time = self.campaign_db.mean_wall_time(app_id=app_id) or wall_time
+                    if wall_time is None:
+                        # Time a first run per worker
+                        chunk_size, chunk_pack_size = executor.n_workers, 1
+                chunk = list(itertools.islice(runs, chunk_size))
+                if not chunk:
+                    break
+                if pack_size == 'auto' and wall_time is not None:
+                    chunk_pack_size = choose_pack_size(len(chunk), executor.n_workers, wall_time)
+                    logger.info(f"Packing {chunk_pack_size} runs per task")
+                run_dirs = [run_data['run_dir'] for run_id, run_data in chunk]
+                start = time.monotonic()
+                chunk_results = _map_packed(executor, action, run_dirs, chunk_pack_size,
+                                            pack_workers)
+                if pack_size == 'auto':
+                    # Estimate for actions which do not report their wall time
+                    concurrency = min(len(chunk), executor.n_workers * pack_workers)
+                    wall_time = (time.monotonic() - start) * concurrency / len(chunk)
+                executions = {}
+                for (run_id, run_data), result in zip(chunk, chunk_results):
+                    results[run_id] = result
+                    if isinstance(result, ExecutionResult):
+                        executions[run_id] = result
+                self.campaign_db.record_executions(executions)
+        finally:
+            if own_executor:
+                executor.shutdown()
+        failed = [run_id for run_id, result in results.items()
+                  if isinstance(result, ExecutionResult) and result.failed]
+        if failed:
+            logger.warning(f"Execution failed for {len(failed)} runs, e.g. {failed[:5]}")
+        return results
+
+    def apply_for_each_run(self, action, status=Status.NEW, executor=None, flush_runs=1000):
+        """
+        Evaluate an in-process model (e.g. `easyvvuq.actions.ExecutePython`)
+        for each run of the current app, and collate its output directly:
+        no run directories are created and no decoder is used, so there is
+        no need to call `populate_runs_dir` or `collate`.
+
+        The output is added to the collation store, and the runs marked as
+        COLLATED, every `flush_runs` runs. Runs for which the model raises
+        an exception are set to Status.FAILED.
 
-    def collate(self):
+        Parameters
+        ----------
+        action : :obj:`easyvvuq.actions.ExecutePython`
+            Action with an `act_on_params` method, returning the output of a
+            run (as a DataFrame) given its parameters.
+        status : enum(Status)
+            Status of the runs to evaluate.
+        executor : :obj:`easyvvuq.executors.BaseExecutor` or None
+            Executor evaluating the runs, e.g. a `ProcessExecutor` (which
+            needs a picklable model). Defaults to the executor of the
+            campaign, or to evaluating the runs one after the other.
+        flush_runs : int
+            Maximum number of runs evaluated between updates of the
+            collation store.
+
+        Returns
+        -------
+        int:
+            The number of runs collated.
+        """
+
+        collater = self._active_app_collater
+        if not hasattr(collater, 'prepare_run_data'):
+            msg = (f"Collater {collater.element_name()} cannot collate the output of "
+                   f"in-process models")
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+        own_executor = False
+        executor = executor or self.executor
+        if executor is None:
+            executor = SerialExecutor()
+            own_executor = True
+        evaluate = functools.partial(_evaluate_run, action, collater)
+
+        app_id = self._active_app['id']
+        runs = self.campaign_db.runs(status=status, app_id=app_id)
+        num_collated = 0
+        try:
+            while True:
+                chunk = list(itertools.islice(runs, flush_runs))
+                if not chunk:
+                    break
+                new_data = ColumnAccumulator()
+                collated, failed = [], []
+                for (run_id, run_info), (run_data, error) in zip(
+                        chunk, executor.map(evaluate, chunk)):
+                    if error is not None:
+                        logger.error(f"Evaluating run {run_id} failed: {error}")
+                        failed.append(run_id)
+                        continue
+                    new_data.append(run_data)
+                    collated.append(run_id)
+                # In one transaction, so collated runs are never left NEW
+                with self.campaign_db.transaction():
+                    if collated:
+                        collater.append_data(self, new_data.to_dataframe(), app_id)
+                        self.campaign_db.set_run_statuses(collated, Status.COLLATED)
+                    if failed:
+                        self.campaign_db.set_run_statuses(failed, Status.FAILED)
+                num_collated += len(collated)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        # Log application of this collation element
+        info = {'num_collated': num_collated}
+        self.log_element_application(collater, info)
+        return num_collated
+
+    def apply_to_samples(self, action, num_samples=0, batch_size=100000):
+        """
+        Evaluate a vectorized model (e.g. `easyvvuq.actions.ExecuteVectorized`)
+        for samples drawn from the active sampler in blocks of `batch_size`
+        (see `BaseSamplingElement.sample_block`), adding its output straight
+        to the collation store.
+
+        No runs are added to the database, no run directories are created
+        and no decoder is used: the collated results (e.g. for
+        `QMCAnalysis`), which hold the sampled parameters and the output of
+        each sample, are the only record. Each sample is given a run name,
+        and an ensemble of its own, reserved in the database.
+
+        Parameters
+        ----------
+        action : :obj:`easyvvuq.actions.ExecuteVectorized`
+            Action with an `act_on_block` method, returning the output for a
+            block of samples.
+        num_samples : int
+            Number of samples to draw from the active sampler. By default is
+            0 (draw ALL samples).
+        batch_size : int
+            Maximum number of samples evaluated in one call of the model.
+
+        Returns
+        -------
+        int:
+            The number of samples evaluated.
+        """
+
+        sampler = self._active_sampler
+        if not sampler.is_finite() and num_samples <= 0:
+            msg = (f"Sampling_element '{sampler.element_name()}' "
+                   f"is an infinite generator, therefore a finite number of "
+                   f"draws (n > 0) must be specified.")
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+        if batch_size < 1:
+            msg = f"Batch size ({batch_size}) must be at least 1"
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+        collater = self._active_app_collater
+        if not hasattr(collater, 'prepare_block_data'):
+            msg = (f"Collater {collater.element_name()} cannot collate the output of "
+                   f"vectorized models")
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+        app_id = self._active_app['id']
+        num_added = 0
+        while num_samples == 0 or num_added < num_samples:
+            n = batch_size if num_samples == 0 else min(batch_size, num_samples - num_added)
+            block, names = sampler.sample_block(n)
+            if len(block) == 0:
+                break
+            output = action.act_on_block(block)
+            # Store the output together with the sampler's new state, so a
+            # restart never evaluates (and collates) the same samples twice
+            with self.campaign_db.transaction():
+                first_run, first_ensemble = self.campaign_db.reserve_run_numbers(
+                    len(block), len(block))
+                run_data = collater.prepare_block_data(
+                    {name: block[:, i] for i, name in enumerate(names)},
+                    {name: output[:, i] for i, name in enumerate(action.output_columns)},
+                    [f"Run_{i}" for i in range(first_run, first_run + len(block))],
+                    [f"Ensemble_{i}"
+                     for i in range(first_ensemble, first_ensemble + len(block))])
+                collater.append_data(self, run_data, app_id)
+                self.campaign_db.update_sampler(self._active_sampler_id, sampler)
+            num_added += len(block)
+
+        # Log application of the sampling and collation elements
+        self.log_element_application(sampler, {"num_added": num_added, "replicas": 1})
+        self.log_element_application(collater, {'num_collated': num_added})
+        return num_added
+
+    def collate(self, workers=1, use_processes=False, executor=None, **options):
         """Combine the output from all runs associated with the current app.
 
         Uses the collation element held in `self._active_app_collater`.
 
+        Parameters
+        ----------
+        workers : int or None
+            Number of threads (or processes) used to decode run output, with
+            a `ThreadExecutor` (or `ProcessExecutor`). If None, one per core
+            is used.
+        use_processes : bool
+            Decode run output in a pool of processes rather than threads.
+        executor : :obj:`easyvvuq.executors.BaseExecutor` or None
+            Executor decoding the runs, in place of `workers` and
+            `use_processes`. Defaults to the executor of the campaign.
+        options
+            Passed on to the `collate` method of the collater, e.g.
+            `flush_runs` and `flush_mb` (see `AggregateSamples.collate`).
+
         Returns
         -------
 
         """
 
-        # Apply collation element
-        num_collated = self._active_app_collater.collate(self, self._active_app['id'])
+        collater = self._active_app_collater
+        executor = executor or self.executor
+        own_executor = False
+        if executor is None and workers != 1:
+            executor = _make_executor(workers, use_processes)
+            own_executor = True
+        if executor is not None:
+            options['executor'] = executor
+        try:
+            # Apply collation element
+            num_collated = collater.collate(self, self._active_app['id'], **options)
+        finally:
+            if own_executor:
+                executor.shutdown()
 
         if num_collated < 1:
             logger.warning("No data collected during collation.")
@@ -661,6 +1102,44 @@ class Campaign:
         info = {'num_collated': num_collated}
         self.log_element_application(self._active_app_collater, info)
 
+    def run_pipeline(self, action=None, encode_workers=1, execute_workers=None,
+                     decode_workers=1, flush_runs=1000, flush_seconds=5.0):
+        """Encode, execute and collate the NEW runs of the current app in a
+        pipeline: each run is passed on to the next stage as soon as it is
+        through the previous one, rather than `populate_runs_dir`,
+        `apply_for_each_run_dir` and `collate` each processing every run in
+        turn. See `easyvvuq.pipeline.Pipeline`.
+
+        Parameters
+        ----------
+        action : :obj:`easyvvuq.actions.BaseAction` or None
+            Action applied to each run directory, e.g. `ExecuteLocal`.
+        encode_workers : int
+            Number of threads encoding runs.
+        execute_workers : int or None
+            Number of threads applying the action, one per core if None.
+        decode_workers : int
+            Number of threads decoding run output.
+        flush_runs : int
+            Maximum number of finished runs between updates of the database.
+        flush_seconds : float
+            Maximum time between updates of the database.
+
+        Returns
+        -------
+        dict:
+            The number of runs set to each Status.
+        """
+        from easyvvuq.pipeline import Pipeline
+        counts = Pipeline(self, action=action, encode_workers=encode_workers,
+                          execute_workers=execute_workers, decode_workers=decode_workers,
+                          flush_runs=flush_runs, flush_seconds=flush_seconds).run()
+
+        # Log application of this collation element
+        info = {'num_collated': counts[Status.COLLATED]}
+        self.log_element_application(self._active_app_collater, info)
+        return counts
+
     def clear_collation(self):
         self.campaign_db.clear_collation(self._active_app['id'])
 
@@ -678,19 +1157,27 @@ class Campaign:
         self.campaign_db.set_run_statuses(collated_run_ids, Status.ENCODED)
         self.collate()
 
-    def get_collation_result(self):
+    def get_collation_result(self, columns=None, filters=None):
         """
         Return dataframe containing all collated results
 
         Parameters
         ----------
+        columns : list or None
+            Only return these columns (all if None). The name of a vector
+            quantity selects all of its sub-columns.
+        filters : list of tuple or None
+            Only return rows for which all `(column, op, value)` conditions
+            hold, e.g. `[('run_id', '==', 'Run_1')]`. `op` is one of '==',
+            '!=', '<', '<=', '>', '>=', 'in' or 'not in'.
 
         Returns
         -------
             pandas dataframe
 
         """
-        return self._active_app_collater.get_collated_dataframe(self, self._active_app['id'])
+        return self._active_app_collater.get_collated_dataframe(
+            self, self._active_app['id'], columns=columns, filters=filters)
 
     def apply_analysis(self, analysis):
         """Run the `analysis` element on the output of the last run collation.
@@ -813,9 +1300,14 @@ class Campaign:
 
         """
 
+        list_of_run_IDs = list(list_of_run_IDs)
+        statuses = self.campaign_db.get_run_statuses(list_of_run_IDs)
         for run_ID in list_of_run_IDs:
-            status = self.campaign_db.get_run_status(run_ID)
-            if status == Status.NEW:
+            if run_ID not in statuses:
+                msg = f"Cannot rerun {run_ID} as no run with that ID exists."
+                logger.error(msg)
+                raise RuntimeError(msg)
+            if statuses[run_ID] == Status.NEW:
                 msg = (f"Cannot rerun {run_ID} as it has status NEW, and must"
                        f"be encoded before execution.")
                 raise RuntimeError(msg)
@@ -828,3 +1320,78 @@ class Campaign:
         set for this campaign.
         """
         return self._active_app
+
+
+def _make_executor(workers, use_processes=False):
+    """Return an executor with `workers` threads (or processes), one per
+    core if None, or a serial one if `workers` is 1."""
+    if workers == 1:
+        return SerialExecutor()
+    if use_processes:
+        return ProcessExecutor(max_workers=workers)
+    return ThreadExecutor(max_workers=workers)
+
+
+def _encode_serialized_chunk(serialized_encoder, runs):
+    """Encode a chunk of runs with a serialized encoder."""
+    return _encode_chunk(BaseEncoder.deserialize(serialized_encoder), runs)
+
+
+def _encode_chunk(encoder, runs):
+    """Create the directory for, and encode, each of a chunk of runs.
+
+    Parameters
+    ----------
+    encoder : :obj:`easyvvuq.encoders.BaseEncoder` or None
+        Encoder of the runs, if None only the directories are created.
+    runs : list of tuples
+        (run_id, run_dir, params) for each run.
+
+    Returns
+    -------
+    list of str
+        The ids of the encoded runs.
+    """
+    for run_id, run_dir, params in runs:
+        os.makedirs(run_dir)
+        if encoder is not None:
+            encoder.encode(params=params, target_dir=run_dir)
+    return [run_id for run_id, run_dir, params in runs]
+
+
+def _act_on_dir(action, run_dir):
+    """Apply `action` to `run_dir`, at module level so it can be sent to
+    other processes."""
+    logger.info("Applying " + action.__module__ + " to " + run_dir)
+    return action.act_on_dir(run_dir)
+
+
+def _act_on_dirs(action, run_dirs, workers=1):
+    """Apply `action` to each of a pack of `run_dirs`, in a pool of `workers`
+    threads, returning the results in order."""
+    apply = functools.partial(_act_on_dir, action)
+    if workers == 1:
+        return [apply(run_dir) for run_dir in run_dirs]
+    with ThreadExecutor(max_workers=workers) as executor:
+        return executor.map(apply, run_dirs)
+
+
+def _evaluate_run(action, collater, run):
+    """Evaluate an in-process model for `run`, returning the data to collate
+    and, if the model raised, the error instead."""
+    run_id, run_info = run
+    try:
+        run_output = action.act_on_params(run_info['params'])
+        return collater.prepare_run_data(run_output, run_id, run_info), None
+    except Exception as e:
+        return None, repr(e)
+
+
+def _map_packed(executor, action, run_dirs, pack_size=1, pack_workers=1):
+    """Apply `action` to each of `run_dirs` with `executor`, in tasks of
+    `pack_size` runs, returning the results in order."""
+    if pack_size == 1 and pack_workers == 1:
+        return executor.map(functools.partial(_act_on_dir, action), run_dirs)
+    packs = [run_dirs[i:i + pack_size] for i in range(0, len(run_dirs), pack_size)]
+    apply = functools.partial(_act_on_dirs, action, workers=pack_workers)
+    return [result for pack_results in executor.map(apply, packs) for result in pack_results]
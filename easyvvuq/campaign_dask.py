@@ -1,6 +1,32 @@
+import logging
+import itertools
 from easyvvuq import Campaign
-import dask.bag
+from dask.distributed import as_completed
 from easyvvuq.constants import Status
+from easyvvuq.actions import ExecutionResult
+from easyvvuq.executors import choose_pack_size
+from easyvvuq.collate.accumulator import ColumnAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+def _apply_to_partition(action, runs, collater=None, decoder=None):
+    """Apply `action` to the run directories of a partition of `runs` (on a
+    Dask worker), decoding their output if a `collater` is given. Returns a
+    `(run_id, result, run_data, error)` tuple per run."""
+    outcomes = []
+    for run_id, run_info in runs:
+        result, run_data = None, None
+        try:
+            result = action.act_on_dir(run_info['run_dir'])
+            failed = isinstance(result, ExecutionResult) and result.failed
+            if collater is not None and not failed:
+                run_data = collater.decode_run(decoder, run_id, run_info)
+        except Exception as e:
+            outcomes.append((run_id, result, None, repr(e)))
+            continue
+        outcomes.append((run_id, result, run_data, None))
+    return outcomes
 
 
 class CampaignDask(Campaign):
@@ -8,11 +34,20 @@ class CampaignDask(Campaign):
     the Dask JobQueue functionality.
     """
 
-    def apply_for_each_run_dir(self, action, client, status=Status.ENCODED):
+    def apply_for_each_run_dir(self, action, client, status=Status.ENCODED,
+                               partition_size=None, decode=False):
         """
         For each run in this Campaign's run list, apply the specified action
         (an object of type Action)
 
+        The runs are sent to the cluster in partitions, as they are read from
+        the database, with a bounded number of partitions outstanding. The
+        outcome of each partition is recorded in the database as soon as it
+        completes: exit codes and wall times of `ExecutionResult`s (with
+        failed runs set to FAILED, as are runs whose action raises) and, if
+        `decode` is set, the output of the runs, decoded on the Dask workers
+        and appended to the collation store (marking the runs COLLATED).
+
         Parameters
         ----------
         action : the action to be applied to each run directory
@@ -20,13 +55,80 @@ class CampaignDask(Campaign):
             be called with the run directory path as its only argument.
         client : a Dask client associated with a cluster you want to
             run your jobs on.
+        status : enum(Status)
+            Status of the runs to apply the action to.
+        partition_size : int or None
+            Number of runs per Dask task. If None, it is chosen (see
+            `easyvvuq.executors.choose_pack_size`) from the mean wall time of
+            the app's runs recorded so far, with at least four partitions per
+            thread in the cluster.
+        decode : bool
+            Decode the output of each run on the worker that ran it.
 
         Returns
         -------
+        dict:
+            The value returned by the action for each run, keyed by run id.
         """
-        run_dirs = []
-        for run_id, run_data in self.campaign_db.runs(status=status, app_id=self._active_app['id']):
-            run_dirs.append(run_data['run_dir'])
-        bag = dask.bag.from_sequence(run_dirs)
-        future = client.compute(bag.map(action.act_on_dir))
-        future.result()
+        app_id = self._active_app['id']
+        n_threads = max(1, sum(client.nthreads().values()))
+        if partition_size is None:
+            n_runs = self.campaign_db.get_num_runs(status=status, app_id=app_id)
+            wall_time = self.campaign_db.mean_wall_time(app_id=app_id)
+            partition_size = choose_pack_size(n_runs, n_threads, wall_time)
+        collater, decoder = None, None
+        if decode:
+            collater, decoder = self._active_app_collater, self._active_app_decoder
+            if not hasattr(collater, 'decode_run'):
+                msg = (f"Collater {collater.element_name()} does not decode single runs, "
+                       f"so cannot decode on the Dask workers")
+                logger.error(msg)
+                raise RuntimeError(msg)
+
+        runs = self.campaign_db.runs(status=status, app_id=app_id)
+
+        def submit_partition():
+            partition = list(itertools.islice(runs, partition_size))
+            if not partition:
+                return None
+            return client.submit(_apply_to_partition, action, partition, collater, decoder,
+                                 pure=False)
+
+        # Keep about two partitions per thread in flight
+        futures = [submit_partition() for _ in range(2 * n_threads)]
+        completed = as_completed([future for future in futures if future is not None])
+        results = {}
+        for future in completed:
+            self._record_partition(future.result(), results)
+            future.release()
+            next_future = submit_partition()
+            if next_future is not None:
+                completed.add(next_future)
+        return results
+
+    def _record_partition(self, outcomes, results):
+        """Record the outcome of a partition of runs in the database."""
+        executions = {}
+        new_data = ColumnAccumulator()
+        statuses = {}
+        for run_id, result, run_data, error in outcomes:
+            results[run_id] = result
+            if error is not None:
+                logger.error(f"Applying action to run {run_id} failed: {error}")
+                statuses[run_id] = Status.FAILED
+                continue
+            if isinstance(result, ExecutionResult):
+                executions[run_id] = result
+            if run_data is not None:
+                new_data.append(run_data)
+                statuses[run_id] = Status.COLLATED
+        # In one transaction, so collated runs are never left ENCODED
+        with self.campaign_db.transaction():
+            if new_data.n_rows > 0:
+                self._active_app_collater.append_data(
+                    self, new_data.to_dataframe(), self._active_app['id'])
+            self.campaign_db.record_executions(executions)
+            for status in set(statuses.values()):
+                self.campaign_db.set_run_statuses(
+                    [run_id for run_id, run_status in statuses.items() if run_status == status],
+                    status)
@@ -0,0 +1,111 @@
+"""Provides a columnar accumulator for building the collated DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+
+class ColumnAccumulator:
+    """
+    Collects the per-run DataFrames produced during collation and combines
+    them into a single DataFrame. Equivalent to repeatedly calling
+    `DataFrame.append(run_data, ignore_index=True)`, but the column arrays
+    of each run are only stored, and concatenated once (per column) when
+    `to_dataframe` is called, so the cost is linear in the number of runs.
+
+    Consecutive runs with the same columns are stored as one block of
+    column arrays. A change of columns starts a new block, and blocks are
+    combined with `pandas.concat`.
+
+    Attributes
+    ----------
+    n_rows : int
+        Number of rows added so far.
+    nbytes : int
+        Approximate memory used by the rows added so far (object columns
+        are counted by the size of their references only).
+    """
+
+    def __init__(self):
+        self._blocks = []
+        self._columns = None
+        self._multi_index = False
+        self._arrays = []
+        self.n_rows = 0
+        self.nbytes = 0
+
+    def __len__(self):
+        return self.n_rows
+
+    def append(self, frame):
+        """
+        Add the rows of `frame` to the accumulator.
+
+        Parameters
+        ----------
+        frame : pandas.DataFrame
+            Data for a single run.
+        """
+        columns = frame.columns.tolist()
+        if columns != self._columns:
+            self._close_block()
+            self._columns = columns
+            self._multi_index = isinstance(frame.columns, pd.MultiIndex)
+            self._arrays = [[] for _ in columns]
+        for i, arrays in enumerate(self._arrays):
+            values = frame.iloc[:, i].values
+            arrays.append(values)
+            self.nbytes += values.nbytes
+        self.n_rows += len(frame)
+
+    def to_dataframe(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            All of the rows added so far, with a fresh RangeIndex.
+        """
+        self._close_block()
+        if len(self._blocks) == 0:
+            return pd.DataFrame()
+        if len(self._blocks) == 1:
+            return self._blocks[0]
+        return pd.concat(self._blocks, ignore_index=True, sort=False)
+
+    def clear(self):
+        """Remove all of the rows added so far."""
+        self.__init__()
+
+    def _close_block(self):
+        if self._columns is None or len(self._arrays[0]) == 0:
+            return
+        block = pd.DataFrame({i: np.concatenate(arrays)
+                              for i, arrays in enumerate(self._arrays)})
+        if self._multi_index:
+            block.columns = pd.MultiIndex.from_tuples(self._columns)
+        else:
+            block.columns = self._columns
+        self._blocks.append(block)
+        self._arrays = [[] for _ in self._columns]
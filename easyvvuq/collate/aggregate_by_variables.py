@@ -2,7 +2,7 @@
 """
 
 from .aggregate_samples import AggregateSamples
-from easyvvuq import OutputType, constants
+import numpy as np
 import pandas as pd
 
 __copyright__ = """
@@ -30,60 +30,95 @@ __license__ = "LGPL"
 
 class AggregateByVariables(AggregateSamples, collater_name="aggregate_by_variables"):
 
-    def collate(self, campaign, app_id):
+    def decode_run(self, decoder, run_id, run_info):
         """
-        Collected the decoded run results for all completed runs with ENCODED status
+        Decode the output of a single run, if it has completed, into one row
+        per output variable (holding the run's parameters, the variable
+        name and its value).
 
         Parameters
         ----------
-        campaign : :obj:`easyvvuq.campaign.Campaign`
-            EasyVVUQ coordination object from which to get information on runs
-            to be collated.
+        decoder : :obj:`easyvvuq.decoders.base.BaseDecoder`
+            Decoder for the app's output.
+        run_id : str
+            Name of the run.
+        run_info : dict
+            Information on the run (as returned by `CampaignDB.runs`).
 
         Returns
         -------
-        `int`:
-            The number of new data rows added during collation
+        pandas.DataFrame or None
+            Data to be collated for this run, None if it has not completed.
         """
 
-        decoder = campaign._active_app_decoder
+        # Use decoder to check if run has completed (in general application-specific)
+        if not decoder.sim_complete(run_info=run_info):
+            return None
 
-        if decoder.output_type != OutputType.SAMPLE:
-            raise RuntimeError('Can only aggregate sample type data')
+        return self.prepare_run_data(decoder.parse_sim_output(run_info=run_info),
+                                     run_id, run_info)
 
-        # Aggregate any uncollated runs into a dataframe (for appending to existing full df)
-        new_data = pd.DataFrame()
-
-        # Loop through all runs with status ENCODED (and therefore not yet COLLATED)
-        processed_run_IDs = []
-        for run_id, run_info in campaign.campaign_db.runs(
-                status=constants.Status.ENCODED, app_id=app_id):
+    def prepare_run_data(self, sim_output, run_id, run_info):
+        """
+        Turn the output of a run into one row per output variable (holding
+        the run's parameters, the variable name and its value).
 
-            # Use decoder to check if run has completed (in general application-specific)
-            if decoder.sim_complete(run_info=run_info):
-                sim_output = decoder.parse_sim_output(run_info=run_info)
+        Parameters
+        ----------
+        sim_output : pandas.DataFrame
+            Output of the run.
+        run_id : str
+            Name of the run.
+        run_info : dict
+            Information on the run (as returned by `CampaignDB.runs`).
 
-                run_data = pd.DataFrame()
+        Returns
+        -------
+        pandas.DataFrame
+            Data to be collated for this run.
+        """
 
-                params = run_info['params']
+        # make a row for every sim_output value, building each column at once
+        variables = sim_output.columns.tolist()
+        n_rows = len(variables)
 
-                # make a row for every sim_output value
-                for i, output_val in enumerate(sim_output.columns.tolist()):
-                    for param, value in params.items():
-                        run_data.loc[i, param] = value
-                    run_data.loc[i, 'Variable'] = output_val
-                    run_data.loc[i, 'Value'] = sim_output.loc[0, output_val]
-                    run_data.loc[i, 'run_id'] = run_id
-                    run_data.loc[i, 'ensemble_id'] = run_info['ensemble_name']
+        run_data = {param: [value] * n_rows for param, value in run_info['params'].items()}
+        run_data['Variable'] = variables
+        run_data['Value'] = [sim_output.loc[0, output_val] for output_val in variables]
+        run_data['run_id'] = [run_id] * n_rows
+        run_data['ensemble_id'] = [run_info['ensemble_name']] * n_rows
 
-                new_data = new_data.append(run_data, ignore_index=True)
+        return pd.DataFrame(run_data)
 
-                processed_run_IDs.append(run_id)
+    def prepare_block_data(self, params, outputs, run_ids, ensemble_ids):
+        """
+        Combine the parameters and output of a block of runs evaluated at
+        once into one row per run and output variable.
 
-        self.append_data(campaign, new_data, app_id)
-        campaign.campaign_db.set_run_statuses(processed_run_IDs, constants.Status.COLLATED)
+        Parameters
+        ----------
+        params : dict
+            Array of the values of each parameter, one per run.
+        outputs : dict
+            Array of the values of each output quantity, one per run.
+        run_ids : list of str
+            Names of the runs.
+        ensemble_ids : list of str
+            Names of the ensembles of the runs.
 
-        return len(processed_run_IDs)
+        Returns
+        -------
+        pandas.DataFrame
+            Data to be collated for the runs.
+        """
+        variables = list(outputs.keys())
+        n_rows = len(variables)
+        run_data = {param: np.repeat(values, n_rows) for param, values in params.items()}
+        run_data['Variable'] = np.tile(variables, len(run_ids))
+        run_data['Value'] = np.column_stack([outputs[name] for name in variables]).ravel()
+        run_data['run_id'] = np.repeat(run_ids, n_rows)
+        run_data['ensemble_id'] = np.repeat(ensemble_ids, n_rows)
+        return pd.DataFrame(run_data)
 
     def element_version(self):
         return "0.1"
@@ -1,9 +1,14 @@
 """Provides an element for aggregation of results from all complete runs.
 """
 
+import logging
+import functools
+import itertools
 from .base import BaseCollationElement
+from .accumulator import ColumnAccumulator
 from easyvvuq import OutputType, constants
 from easyvvuq.utils.helpers import multi_index_tuple_parser
+from easyvvuq.executors import SerialExecutor
 import pandas as pd
 
 __copyright__ = """
@@ -44,15 +49,35 @@ class AggregateSamples(BaseCollationElement, collater_name="aggregate_samples"):
     def __init__(self, average=False):
         self.average = average
 
-    def collate(self, campaign, app_id):
+    def collate(self, campaign, app_id, flush_runs=1000, flush_mb=100, executor=None,
+                **options):
         """
         Collected the decoded run results for all completed runs with ENCODED status
 
+        The decoded results are written to the collation store, and the runs
+        marked as COLLATED, every `flush_runs` runs or once `flush_mb`
+        megabytes of results have been decoded, whichever comes first. This
+        bounds the memory used and means an interrupted collation only has
+        to redo the runs decoded since the last flush.
+
         Parameters
         ----------
         campaign : :obj:`easyvvuq.campaign.Campaign`
             EasyVVUQ coordination object from which to get information on runs
             to be collated.
+        app_id : int
+            ID of the app whose runs are collated.
+        flush_runs : int
+            Maximum number of runs decoded between flushes.
+        flush_mb : float
+            Maximum size (in megabytes) of the decoded results held between
+            flushes.
+        executor : :obj:`easyvvuq.executors.BaseExecutor` or None
+            Executor used to check for completion of, and decode, the runs,
+            serially in this thread if None. Executors using other processes
+            need a picklable decoder.
+        options
+            Other options, which are ignored with a warning.
 
         Returns
         -------
@@ -60,73 +85,182 @@ class AggregateSamples(BaseCollationElement, collater_name="aggregate_samples"):
             The number of new data rows added during collation
         """
 
+        self.warn_ignored_options(**options)
         decoder = campaign._active_app_decoder
 
+        if decoder is None:
+            msg = 'The app has no decoder, so its run output cannot be collated'
+            logging.error(msg)
+            raise RuntimeError(msg)
+
         if decoder.output_type != OutputType.SAMPLE:
             raise RuntimeError('Can only aggregate sample type data')
 
-        # Aggregate any uncollated runs into a dataframe (for appending to existing full df)
-        new_data = pd.DataFrame()
+        if flush_runs < 1:
+            msg = f"flush_runs must be at least 1, got {flush_runs}"
+            logging.error(msg)
+            raise RuntimeError(msg)
 
-        # Loop through all runs with status ENCODED (and therefore not yet COLLATED)
+        # Aggregate uncollated runs into a dataframe (for appending to the collation store)
+        new_data = ColumnAccumulator()
         processed_run_IDs = []
-        for run_id, run_info in campaign.campaign_db.runs(
-                status=constants.Status.ENCODED, app_id=app_id):
-
-            # Use decoder to check if run has completed (in general application-specific)
-            if decoder.sim_complete(run_info=run_info):
-
-                run_data = decoder.parse_sim_output(run_info=run_info)
-
-                if self.average:
-                    run_data = pd.DataFrame(run_data.mean()).transpose()
-
-                mult = isinstance(run_data.columns, pd.MultiIndex)
-
-                params = run_info['params']
-                for param, value in params.items():
-                    if isinstance(value, list):
-                        # need to have multi-index dataframe
-                        if not mult:
-                            col, mult = multi_index_tuple_parser(run_data.columns.values)
-                            col = [(c, '') for c in col]
-                            run_data.columns = pd.MultiIndex.from_tuples(col)
-                        # add list values using columns tuple
-                        for i in range(len(value)):
-                            run_data[(param, i)] = value[i]
-                    else:
-                        run_data[param] = value
-                column_list = run_data.columns.tolist()
-
-                # we need to convert columns to tuples to account for multi-indexing
-                # should not influence non-multi-index frames, I hope. hacky?
-                # TODO from Jalal: I think we don't need it, must be handled in the decoder
-                if any([isinstance(x, tuple) for x in column_list]):
-                    column_list_ = []
-                    for column in column_list:
-                        if not isinstance(column, tuple):
-                            column_list_.append((column, ''))
-                        else:
-                            column_list_.append(column)
-                    column_list = column_list_
-
-                # Reorder columns
-                run_data = run_data[column_list]
-                run_data['run_id'] = run_id
-                run_data['ensemble_id'] = run_info['ensemble_name']
-                new_data = new_data.append(run_data, ignore_index=True)
+        num_collated = 0
+
+        def flush():
+            if processed_run_IDs:
+                # Store the results and mark their runs as COLLATED together, so
+                # an interrupted collation never stores the results of a run twice
+                with campaign.campaign_db.transaction():
+                    self.append_data(campaign, new_data.to_dataframe(), app_id)
+                    campaign.campaign_db.set_run_statuses(
+                        processed_run_IDs, constants.Status.COLLATED)
+            new_data.clear()
+            processed_run_IDs.clear()
+
+        # Decode all runs with status ENCODED (and therefore not yet COLLATED),
+        # reading and decoding up to flush_runs of them at a time. Results come
+        # back in the same order as the runs.
+        runs = campaign.campaign_db.runs(status=constants.Status.ENCODED, app_id=app_id)
+        decode = functools.partial(_decode_run, self, decoder)
+        if executor is None:
+            executor = SerialExecutor()
+        while True:
+            chunk = list(itertools.islice(runs, flush_runs - len(processed_run_IDs)))
+            if not chunk:
+                break
+            for (run_id, run_info), run_data in zip(chunk, executor.map(decode, chunk)):
+                if run_data is None:
+                    continue
+                new_data.append(run_data)
                 processed_run_IDs.append(run_id)
+                num_collated += 1
+                if new_data.nbytes >= flush_mb * 1024 * 1024:
+                    flush()
+            if len(processed_run_IDs) >= flush_runs:
+                flush()
+        flush()
 
-        self.append_data(campaign, new_data, app_id)
-        campaign.campaign_db.set_run_statuses(processed_run_IDs, constants.Status.COLLATED)
+        return num_collated
 
-        return len(processed_run_IDs)
+    def decode_run(self, decoder, run_id, run_info):
+        """
+        Decode the output of a single run, if it has completed, and add the
+        run's parameters and ids to it.
+
+        Parameters
+        ----------
+        decoder : :obj:`easyvvuq.decoders.base.BaseDecoder`
+            Decoder for the app's output.
+        run_id : str
+            Name of the run.
+        run_info : dict
+            Information on the run (as returned by `CampaignDB.runs`).
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            Data to be collated for this run, None if it has not completed.
+        """
+
+        # Use decoder to check if run has completed (in general application-specific)
+        if not decoder.sim_complete(run_info=run_info):
+            return None
+
+        return self.prepare_run_data(decoder.parse_sim_output(run_info=run_info),
+                                     run_id, run_info)
+
+    def prepare_run_data(self, run_data, run_id, run_info):
+        """
+        Add the run's parameters and ids to its output, as decoded (or as
+        returned by an in-process model, see `easyvvuq.actions.ExecutePython`).
+
+        Parameters
+        ----------
+        run_data : pandas.DataFrame
+            Output of the run.
+        run_id : str
+            Name of the run.
+        run_info : dict
+            Information on the run (as returned by `CampaignDB.runs`).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Data to be collated for this run.
+        """
+
+        if self.average:
+            run_data = pd.DataFrame(run_data.mean()).transpose()
+
+        mult = isinstance(run_data.columns, pd.MultiIndex)
+
+        params = run_info['params']
+        for param, value in params.items():
+            if isinstance(value, list):
+                # need to have multi-index dataframe
+                if not mult:
+                    col, mult = multi_index_tuple_parser(run_data.columns.values)
+                    col = [(c, '') for c in col]
+                    run_data.columns = pd.MultiIndex.from_tuples(col)
+                # add list values using columns tuple
+                for i in range(len(value)):
+                    run_data[(param, i)] = value[i]
+            else:
+                run_data[param] = value
+        column_list = run_data.columns.tolist()
+
+        # we need to convert columns to tuples to account for multi-indexing
+        # should not influence non-multi-index frames, I hope. hacky?
+        # TODO from Jalal: I think we don't need it, must be handled in the decoder
+        if any([isinstance(x, tuple) for x in column_list]):
+            column_list_ = []
+            for column in column_list:
+                if not isinstance(column, tuple):
+                    column_list_.append((column, ''))
+                else:
+                    column_list_.append(column)
+            column_list = column_list_
+
+        # Reorder columns
+        run_data = run_data[column_list]
+        run_data['run_id'] = run_id
+        run_data['ensemble_id'] = run_info['ensemble_name']
+        return run_data
+
+    def prepare_block_data(self, params, outputs, run_ids, ensemble_ids):
+        """
+        Combine the parameters and output of a block of runs evaluated at
+        once (see `Campaign.apply_to_samples`) into the data to be collated,
+        with one row per run.
+
+        Parameters
+        ----------
+        params : dict
+            Array of the values of each parameter, one per run.
+        outputs : dict
+            Array of the values of each output quantity, one per run.
+        run_ids : list of str
+            Names of the runs.
+        ensemble_ids : list of str
+            Names of the ensembles of the runs.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Data to be collated for the runs.
+        """
+        columns = dict(outputs)
+        columns.update(params)
+        columns['run_id'] = run_ids
+        columns['ensemble_id'] = ensemble_ids
+        return pd.DataFrame(columns)
 
     def append_data(self, campaign, new_data, app_id):
         campaign.campaign_db.append_collation_dataframe(new_data, app_id)
 
-    def get_collated_dataframe(self, campaign, app_id):
-        return campaign.campaign_db.get_collation_dataframe(app_id)
+    def get_collated_dataframe(self, campaign, app_id, columns=None, filters=None):
+        return campaign.campaign_db.get_collation_dataframe(
+            app_id, columns=columns, filters=filters)
 
     def element_version(self):
         return "0.1"
@@ -144,3 +278,11 @@ class AggregateSamples(BaseCollationElement, collater_name="aggregate_samples"):
             collated data.
         """
         return {"average": self.average}
+
+
+def _decode_run(collater, decoder, run):
+    """Module level wrapper around `decode_run`, so it can be sent to a
+    process pool."""
+    run_id, run_info = run
+    return collater.decode_run(decoder, run_id, run_info)
+
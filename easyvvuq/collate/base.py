@@ -42,13 +42,27 @@ class BaseCollationElement(BaseElement):
 
     """
 
-    def collate(self, campaign, app_id):
+    def collate(self, campaign, app_id, flush_runs=1000, flush_mb=100, executor=None,
+                **options):
         """
         Collates the campaign's decoded run output for the specified app.
-        Must be implemented by all collation subclasses.
+        Must be implemented by all collation subclasses. The collater may
+        decode runs concurrently with the `executor` (see
+        `easyvvuq.executors`), if one is given. Results should be
+        stored (and runs marked as COLLATED) at least every `flush_runs` runs
+        or `flush_mb` megabytes of decoded data. Other `options` are not
+        supported, and should be passed to `warn_ignored_options`.
         """
         raise NotImplementedError
 
+    def warn_ignored_options(self, **options):
+        """
+        Log a warning for collate `options` which this collater ignores.
+        """
+        if options:
+            logging.warning(f"Collater {self.element_name()} ignores the collate "
+                            f"options {sorted(options)}")
+
     def __init_subclass__(cls, collater_name, **kwargs):
         """
         Catch any new collaters (all collaters must inherit from
@@ -67,9 +81,10 @@ class BaseCollationElement(BaseElement):
         # Register new collater
         AVAILABLE_COLLATERS[collater_name] = cls
 
-    def get_collated_dataframe(self, campaign, app_id):
+    def get_collated_dataframe(self, campaign, app_id, columns=None, filters=None):
         """
-        Returns collated data as a pandas dataframe
+        Returns collated data as a pandas dataframe, optionally restricted to
+        some `columns` and to the rows matching `filters`.
         """
         raise NotImplementedError
 
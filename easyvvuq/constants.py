@@ -56,3 +56,5 @@ class Status(IntEnum):
     ENCODED = 2
     COLLATED = 3
     IGNORED = 4
+    CLAIMED = 5  # leased to a worker, see CampaignDB.claim_runs
+    FAILED = 6  # execution failed, see CampaignDB.record_executions
@@ -231,10 +231,10 @@ class AppInfo:
         Human readable application name.
     paramsspec : ParamsSpecification or None
         Description of possible parameter values.
-    input_encoder : :obj:`easyvvuq.encoders.base.BaseEncoder`
-        Encoder element for application.
-    output_decoder : :obj:`easyvvuq.decoders.base.BaseDecoder`
-        Decoder element for application.
+    input_encoder : :obj:`easyvvuq.encoders.base.BaseEncoder` or None
+        Encoder element for application, None for in-process models.
+    output_decoder : :obj:`easyvvuq.decoders.base.BaseDecoder` or None
+        Decoder element for application, None for in-process models.
     collater : :obj:`easyvvuq.collation.base.BaseCollationElement`
         Collater element for application.
     """
@@ -259,7 +259,7 @@ class AppInfo:
 
     @input_encoder.setter
     def input_encoder(self, encoder):
-        if not isinstance(encoder, BaseEncoder):
+        if encoder is not None and not isinstance(encoder, BaseEncoder):
             msg = f"Provided 'encoder' must be derived from type BaseEncoder"
             logger.error(msg)
             raise Exception(msg)
@@ -272,7 +272,7 @@ class AppInfo:
 
     @output_decoder.setter
     def output_decoder(self, decoder):
-        if not isinstance(decoder, BaseDecoder):
+        if decoder is not None and not isinstance(decoder, BaseDecoder):
             msg = f"Provided 'decoder' must be derived from type BaseDecoder"
             logger.error(msg)
             raise Exception(msg)
@@ -323,8 +323,8 @@ class AppInfo:
             out_dict = {
                 'name': self.name,
                 'params': self.paramsspec,
-                'input_encoder': self.input_encoder.serialize(),
-                'output_decoder': self.output_decoder.serialize(),
+                'input_encoder': _serialize(self.input_encoder),
+                'output_decoder': _serialize(self.output_decoder),
                 'collater': self.collater.serialize()
             }
 
@@ -429,3 +429,10 @@ class CampaignInfo:
         }
 
         return out_dict
+
+
+def _serialize(element):
+    """Serialize an optional element."""
+    if element is None:
+        return None
+    return element.serialize()
@@ -195,6 +195,100 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
+    def set_dirs_for_runs(self, run_dirs):
+        """
+        Set the 'run_dir' paths of many runs at once.
+
+        Parameters
+        ----------
+        run_dirs: dict
+            Directory path for each run, keyed by run name.
+
+        Returns
+        -------
+
+        """
+
+        raise NotImplementedError
+
+    def record_executions(self, results):
+        """
+        Record the exit code and wall time of executed runs, setting those
+        whose execution failed to Status.FAILED.
+
+        Parameters
+        ----------
+        results: dict
+            An `easyvvuq.actions.ExecutionResult` for each run, keyed by run
+            name.
+
+        Returns
+        -------
+
+        """
+
+        raise NotImplementedError
+
+    def reserve_run_numbers(self, n_runs, n_ensembles):
+        """
+        Reserve run and ensemble numbers for results collated without adding
+        runs to the database.
+
+        Parameters
+        ----------
+        n_runs: int
+            Number of run numbers to reserve.
+        n_ensembles: int
+            Number of ensemble numbers to reserve.
+
+        Returns
+        -------
+        int, int:
+            The first reserved run number and ensemble number.
+        """
+
+        raise NotImplementedError
+
+    def mean_wall_time(self, campaign=None, sampler=None, app_id=None):
+        """
+        Get the mean wall time of the selected runs whose execution has been
+        recorded.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        app_id: int or None
+            App id to filter for.
+
+        Returns
+        -------
+        float or None:
+            Mean wall time in seconds, None if no wall time has been recorded.
+        """
+
+        raise NotImplementedError
+
+    def get_runs(self, run_name_list):
+        """
+        Get the information for each of the listed runs.
+
+        Parameters
+        ----------
+        run_name_list: list of str
+            A list of run names.
+
+        Returns
+        -------
+        dict
+            Information on each run found (as returned by `run`), keyed by
+            run name.
+        """
+
+        raise NotImplementedError
+
     def run(self, run_name, campaign=None, sampler=None):
         """
         Get the information for a specified run.
@@ -239,7 +333,8 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
-    def runs(self, campaign=None, sampler=None, status=None, not_status=None):
+    def runs(self, campaign=None, sampler=None, status=None, not_status=None, app_id=None,
+             where=None):
         """
         A generator to return all run information for selected `campaign` and `sampler`.
 
@@ -253,6 +348,12 @@ class BaseCampaignDB:
             Status string to filter for.
         not_status: enum(Status) or None
             Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Only select runs whose parameters satisfy all `(param, op, value)`
+            conditions, e.g. `[('viscosity', '>', 0.3)]`. `op` is one of '==',
+            '!=', '<', '<=', '>', '>=', 'in' or 'not in'.
 
         Returns
         -------
@@ -263,6 +364,34 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
+    def run_ids(self, campaign=None, sampler=None, status=None, not_status=None, app_id=None,
+                where=None):
+        """
+        A generator to return all run IDs for selected `campaign` and `sampler`.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        status: enum(Status) or None
+            Status string to filter for.
+        not_status: enum(Status) or None
+            Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Conditions `(param, op, value)` on the run parameters, see `runs`.
+
+        Returns
+        -------
+        str:
+            run ID for each selected run, one at a time.
+        """
+
+        raise NotImplementedError
+
     def runs_dir(self, campaign_name=None):
         """
         Get the directory used to store run information for `campaign_name`.
@@ -280,7 +409,40 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
-    def get_num_runs(self, campaign=None, sampler=None, status=None, not_status=None):
+    def runs_dataframe(self, campaign=None, sampler=None, status=None, not_status=None,
+                       app_id=None, columns=None, where=None):
+        """
+        Return the information on the selected runs as a DataFrame, with one
+        column per parameter.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        status: enum(Status) or None
+            Status string to filter for.
+        not_status: enum(Status) or None
+            Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        columns: list of str or None
+            Columns (run information or parameter names) to return, all if None.
+        where: list of tuple or None
+            Only select runs whose parameters satisfy all `(param, op, value)`
+            conditions.
+
+        Returns
+        -------
+        pandas.DataFrame:
+            One row per run.
+        """
+
+        raise NotImplementedError
+
+    def get_num_runs(self, campaign=None, sampler=None, status=None, not_status=None,
+                     app_id=None, where=None):
         """
         Returns the number of runs matching the filtering criteria.
 
@@ -294,6 +456,10 @@ class BaseCampaignDB:
             Status string to filter for.
         not_status: enum(Status) or None
             Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Conditions `(param, op, value)` on the run parameters, see `runs`.
 
         Returns
         -------
@@ -343,6 +509,133 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
+    def claim_runs(self, n, worker_id, lease_seconds=600, status=None, app_id=None,
+                   campaign=None):
+        """
+        Atomically claim up to `n` runs with the given `status` for a worker,
+        setting them to Status.CLAIMED under a lease that expires after
+        `lease_seconds`. Runs with an expired lease can be claimed again.
+
+        Parameters
+        ----------
+        n: int
+            Maximum number of runs to claim.
+        worker_id: str
+            Name of the claiming worker.
+        lease_seconds: float
+            Duration of the lease.
+        status: enum(Status)
+            Status of the runs to claim.
+        app_id: int or None
+            App id to filter for.
+        campaign: int or None
+            Campaign id to filter for.
+
+        Returns
+        -------
+        list of str:
+            Names of the claimed runs.
+        """
+
+        raise NotImplementedError
+
+    def renew_leases(self, worker_id, lease_seconds=600, run_name_list=None):
+        """
+        Extend the leases held by `worker_id`.
+
+        Parameters
+        ----------
+        worker_id: str
+            Name of the worker holding the leases.
+        lease_seconds: float
+            New duration of the leases.
+        run_name_list: list of str or None
+            Only renew the leases on these runs (all if None).
+
+        Returns
+        -------
+        int:
+            The number of leases renewed.
+        """
+
+        raise NotImplementedError
+
+    def release_runs(self, worker_id, run_name_list, status=None):
+        """
+        Release the leases held by `worker_id` on the listed runs.
+
+        Parameters
+        ----------
+        worker_id: str
+            Name of the worker holding the leases.
+        run_name_list: list of str
+            Names of the runs to release.
+        status: enum(Status) or None
+            New status of the runs, None to restore the status they were
+            claimed from.
+
+        Returns
+        -------
+        int:
+            The number of runs released.
+        """
+
+        raise NotImplementedError
+
+    def reclaim_expired_runs(self):
+        """
+        Restore the status that runs had before they were claimed, for all
+        runs whose lease has expired.
+
+        Returns
+        -------
+        int:
+            The number of runs reclaimed.
+        """
+
+        raise NotImplementedError
+
+    def get_run_statuses(self, run_name_list):
+        """
+        Return the status (enum) of each of the runs in `run_name_list`.
+
+        Parameters
+        ----------
+        run_name_list: list of str
+            A list of run names.
+
+        Returns
+        -------
+        dict:
+            The status of each run found, keyed by run name.
+        """
+
+        raise NotImplementedError
+
+    def status_counts(self, campaign=None, sampler=None, app_id=None, group_by=()):
+        """
+        Count the runs with each status.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        app_id: int or None
+            App id to filter for.
+        group_by: tuple of str
+            Also group the counts by 'app' and/or 'sampler' id.
+
+        Returns
+        -------
+        dict:
+            Number of runs for every Status (keyed by the group_by ids, if
+            grouping).
+        """
+
+        raise NotImplementedError
+
     def set_run_statuses(self, run_name_list, status):
         """
         Set the specified 'status' (enum) for all runs in the list run_ID_list
@@ -361,6 +654,15 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
+    def transaction(self):
+        """
+        Return a context manager grouping the operations done in a `with`
+        block into a single transaction, committed when the block ends and
+        rolled back if it raises.
+        """
+
+        raise NotImplementedError
+
     def append_collation_dataframe(self, df, app_id):
         """
         Append the data in dataframe 'df' to that already collated in the database
@@ -379,7 +681,7 @@ class BaseCampaignDB:
 
         raise NotImplementedError
 
-    def get_collation_dataframe(self, app_id):
+    def get_collation_dataframe(self, app_id, columns=None, filters=None):
         """
         Returns a dataframe containing the full collated results stored in this database
         i.e. the total of what was added with the append_collation_dataframe() method.
@@ -389,6 +691,10 @@ class BaseCampaignDB:
         app_id: int
             The id of this app in the sql database. Used to determine which collation
             table is returned.
+        columns: list or None
+            Only return these columns (all if None).
+        filters: list of tuple or None
+            Only return rows for which all `(column, op, value)` conditions hold.
 
         Returns
         -------
@@ -0,0 +1,367 @@
+"""Provides the stores in which a CampaignDB keeps collated results.
+
+A store holds the collated data of a single app. Two stores are available:
+'sql' keeps the data in a `COLLATION_APP<id>` table of the campaign database
+and 'parquet' appends one Parquet file per collation to a directory next to
+the database. Both support reading a subset of the columns and filtering
+rows on read (pushed down into the query or the Parquet reader).
+"""
+import os
+import json
+import uuid
+import shutil
+import logging
+import operator
+import pandas as pd
+from sqlalchemy import table, column, select, text, inspect
+from sqlalchemy.exc import OperationalError
+from easyvvuq.utils.helpers import multi_index_tuple_parser
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+logger = logging.getLogger(__name__)
+
+# Dict to store all registered collation stores (any class which extends
+# BaseCollationStore is automatically registered)
+AVAILABLE_COLLATION_STORES = {}
+
+# Comparison operators allowed in filters
+FILTER_OPERATORS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda col, value: col.in_(value),
+    'not in': lambda col, value: col.notin_(value),
+}
+
+
+class BaseCollationStore:
+    """Baseclass for all stores of collated data.
+
+    Parameters
+    ----------
+    campaign_db : :obj:`easyvvuq.db.sql.CampaignDB`
+        The campaign database the store belongs to.
+    app_id : int
+        ID of the app whose collated data is kept in the store.
+    """
+
+    def __init__(self, campaign_db, app_id):
+        self.campaign_db = campaign_db
+        self.app_id = app_id
+
+    def __init_subclass__(cls, store_name, **kwargs):
+        """
+        Catch any new collation stores and add them to the dict of
+        available stores.
+
+        Parameters
+        ----------
+        store_name : str
+            Name of the collation store represented by the class.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.store_name = store_name
+        AVAILABLE_COLLATION_STORES[store_name] = cls
+
+    def append(self, df):
+        """
+        Append the rows in `df` to the store.
+        """
+        raise NotImplementedError
+
+    def get(self, columns=None, filters=None):
+        """
+        Return the stored data as a pandas DataFrame, or None if nothing has
+        been stored.
+
+        Parameters
+        ----------
+        columns : list or None
+            Columns to return, all if None. Giving the first level of a
+            MultiIndex column (e.g. the name of a vector QoI) selects all of
+            its sub-columns.
+        filters : list of tuple or None
+            Only return rows for which all `(column, op, value)` conditions
+            hold. `op` is one of '==', '!=', '<', '<=', '>', '>=', 'in' or
+            'not in'.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Delete all the stored data.
+        """
+        raise NotImplementedError
+
+
+def _matches(label, col):
+    """Does the requested column `col` select the column labelled `label`?"""
+    return label == col or (isinstance(label, tuple) and label[0] == col)
+
+
+def _select_labels(labels, columns):
+    """Return the indices of `labels` selected by the requested `columns`
+    (all if None), raising if a requested column is not present."""
+    if columns is None:
+        return list(range(len(labels)))
+    selected = []
+    for col in columns:
+        matches = [i for i, label in enumerate(labels) if _matches(label, col)]
+        if not matches:
+            msg = f"Column {col} not found in collation store"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        selected += [i for i in matches if i not in selected]
+    return selected
+
+
+def _resolve_filters(labels, filters):
+    """Replace the column in each `(column, op, value)` filter by the index
+    of the label it refers to. Returns None if a filtered column is not
+    present."""
+    resolved = []
+    for col, op, value in filters or []:
+        if op not in FILTER_OPERATORS:
+            msg = (f"Invalid filter operator '{op}', supported operators are "
+                   f"{list(FILTER_OPERATORS)}")
+            logger.error(msg)
+            raise RuntimeError(msg)
+        if col in labels:
+            matches = [labels.index(col)]
+        else:
+            matches = [i for i, label in enumerate(labels) if _matches(label, col)]
+        if len(matches) > 1:
+            msg = (f"Filter column {col} is ambiguous, specify one of "
+                   f"{[labels[i] for i in matches]}")
+            logger.error(msg)
+            raise RuntimeError(msg)
+        if not matches:
+            return None
+        resolved.append((matches[0], op, value))
+    return resolved
+
+
+def _set_columns(df, labels):
+    """Label the columns of `df`, using a MultiIndex if all labels are tuples."""
+    if len(labels) > 0 and all(isinstance(label, tuple) for label in labels):
+        df.columns = pd.MultiIndex.from_tuples(labels)
+    else:
+        df.columns = labels
+    return df
+
+
+class SQLCollationStore(BaseCollationStore, store_name='sql'):
+    """Keeps collated data in the `COLLATION_APP<id>` table of the campaign
+    database, with an `index` column numbering the rows in the order they
+    were appended. MultiIndex column names are stored as strings and parsed
+    back into tuples on read.
+    """
+
+    @property
+    def tablename(self):
+        return 'COLLATION_APP' + str(self.app_id)
+
+    def append(self, df):
+        # Write in the transaction of the campaign database's session, so the
+        # rows can be committed together with the status of their runs
+        conn = self.campaign_db.session.connection()
+        # Number the rows on from those already stored, so the stored index
+        # does not depend on how the collated data was split into appends
+        offset = 0
+        if inspect(conn).has_table(self.tablename):
+            offset = conn.execute(text(f"select count(*) from {self.tablename}")).scalar()
+        df = df.copy(deep=False)
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        try:
+            df.to_sql(self.tablename, conn, if_exists='append')
+        except OperationalError:
+            # Another process (e.g. a worker) may have created the table after
+            # to_sql found it missing, in which case appending now succeeds
+            if not inspect(conn).has_table(self.tablename):
+                raise
+            df.to_sql(self.tablename, conn, if_exists='append')
+
+    def get(self, columns=None, filters=None):
+        engine = self.campaign_db.engine
+        if self.tablename not in engine.table_names():
+            return None
+        engine = engine.execution_options(sqlite_raw_colnames=True)
+        if columns is None and not filters:
+            query = "select * from " + self.tablename
+            df = pd.read_sql_query(query, engine)
+            columns, multi = multi_index_tuple_parser(df.columns.values[1:])
+            if multi:
+                df = pd.DataFrame(df.values[:, 1:],
+                                  columns=pd.MultiIndex.from_tuples(columns))
+            return df
+        with engine.connect() as conn:
+            names = list(conn.execute(text(f"select * from {self.tablename} limit 0")).keys())
+        # Skip the dataframe index stored by to_sql
+        names = names[1:]
+        labels, _ = multi_index_tuple_parser(names)
+        selected = _select_labels(labels, columns)
+        resolved = _resolve_filters(labels, filters)
+        if resolved is None:
+            msg = f"Filter column not found in collation store: {filters}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        collation = table(self.tablename, *[column(name) for name in names])
+        query = select(*[collation.c[names[i]] for i in selected])
+        for index, op, value in resolved:
+            query = query.where(FILTER_OPERATORS[op](collation.c[names[index]], value))
+        df = pd.read_sql_query(query, engine)
+        return _set_columns(df, [labels[i] for i in selected])
+
+    def clear(self):
+        engine = self.campaign_db.engine
+        if self.tablename in engine.table_names():
+            engine.execute(text(f'DROP TABLE {self.tablename};'))
+
+
+class ParquetCollationStore(BaseCollationStore, store_name='parquet'):
+    """Keeps collated data as a dataset of Parquet files, one per call to
+    `append`, in the `app<id>` subdirectory of the campaign database's
+    `collation_dir`. Column labels (including MultiIndex tuples) are kept in
+    the file metadata. A file only becomes part of the store once it is
+    recorded in the campaign database, in the transaction of the append, so
+    files written by an append that was rolled back are ignored. Requires
+    pyarrow.
+    """
+
+    METADATA_KEY = b'easyvvuq.columns'
+
+    @property
+    def path(self):
+        if self.campaign_db.collation_dir is None:
+            msg = "The 'parquet' collation store requires a collation_dir"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        return os.path.join(self.campaign_db.collation_dir, 'app' + str(self.app_id))
+
+    def _files(self):
+        return [os.path.join(self.path, filename)
+                for filename in self.campaign_db.collation_parts(self.app_id)]
+
+    def append(self, df):
+        pa, pq = _import_pyarrow()
+        labels = list(df.columns)
+        frame = df.copy(deep=False)
+        frame.columns = [str(label) for label in labels]
+        if frame.columns.has_duplicates:
+            msg = f"Duplicate column names in collated data: {labels}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        try:
+            arrow_table = pa.Table.from_pandas(frame, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            msg = f"Unable to store collated data as Parquet: {e}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        metadata = dict(arrow_table.schema.metadata or {})
+        metadata[self.METADATA_KEY] = json.dumps([_label_to_json(label) for label in labels])
+        arrow_table = arrow_table.replace_schema_metadata(metadata)
+        os.makedirs(self.path, exist_ok=True)
+        filename = f'part-{uuid.uuid4().hex}.parquet'
+        pq.write_table(arrow_table, os.path.join(self.path, filename))
+        self.campaign_db.record_collation_part(self.app_id, filename)
+
+    def get(self, columns=None, filters=None):
+        files = self._files()
+        if not files:
+            return None
+        pa, pq = _import_pyarrow()
+        all_labels = []
+        parts = []
+        for filename in files:
+            labels = self._labels(pq.read_schema(filename))
+            all_labels += [label for label in labels if label not in all_labels]
+            resolved = _resolve_filters(labels, filters)
+            if resolved is None:
+                # Rows with no value for a filtered column never match
+                continue
+            selected = [label for label in labels
+                        if columns is None or any(_matches(label, col) for col in columns)]
+            arrow_table = pq.read_table(
+                filename, columns=[str(label) for label in selected],
+                filters=[(str(labels[index]), op, value)
+                         for index, op, value in resolved] or None)
+            parts.append((arrow_table.to_pandas(), selected))
+        labels = [all_labels[i] for i in _select_labels(all_labels, columns)]
+        # Align the parts by position, tuple labels upset reindexing
+        positions = {label: i for i, label in enumerate(labels)}
+        frames = []
+        for frame, selected in parts:
+            frame.columns = [positions[label] for label in selected]
+            frames.append(frame)
+        if frames:
+            df = pd.concat(frames, ignore_index=True, sort=False)
+            df = df.reindex(columns=range(len(labels)))
+        else:
+            df = pd.DataFrame(columns=range(len(labels)))
+        return _set_columns(df, labels)
+
+    def _labels(self, schema):
+        metadata = schema.metadata or {}
+        if self.METADATA_KEY in metadata:
+            return [_label_from_json(label)
+                    for label in json.loads(metadata[self.METADATA_KEY])]
+        return list(schema.names)
+
+    def clear(self):
+        self.campaign_db.clear_collation_parts(self.app_id)
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+
+
+def _label_to_json(label):
+    if isinstance(label, tuple):
+        return {'tuple': [_label_to_json(level) for level in label]}
+    if hasattr(label, 'item'):
+        return label.item()
+    return label
+
+
+def _label_from_json(label):
+    if isinstance(label, dict):
+        return tuple(_label_from_json(level) for level in label['tuple'])
+    return label
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        msg = "The 'parquet' collation store requires pyarrow to be installed"
+        logger.error(msg)
+        raise RuntimeError(msg)
+    return pyarrow, pyarrow.parquet
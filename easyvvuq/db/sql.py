@@ -2,14 +2,19 @@
 """
 import os
 import json
+import time
+import uuid
 import logging
+import functools
+import contextlib
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, ForeignKey
+from sqlalchemy import Index, Table, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import MetaData
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import text
+from sqlalchemy import text, select, func, update, event, and_, or_, bindparam
 from .base import BaseCampaignDB
 from easyvvuq import constants
 from easyvvuq.sampling.base import BaseSamplingElement
@@ -17,7 +22,7 @@ from easyvvuq.encoders.base import BaseEncoder
 from easyvvuq.decoders.base import BaseDecoder
 from easyvvuq.collate.base import BaseCollationElement
 from easyvvuq import ParamsSpecification
-from easyvvuq.utils.helpers import multi_index_tuple_parser
+from .collation_store import AVAILABLE_COLLATION_STORES, FILTER_OPERATORS
 
 __copyright__ = """
 
@@ -43,6 +48,43 @@ __license__ = "LGPL"
 
 logger = logging.getLogger(__name__)
 
+# Number of rows passed to each executemany() when bulk inserting runs
+BULK_INSERT_CHUNK_SIZE = 10000
+
+# Maximum number of run names bound to a single query (SQLite versions
+# before 3.32 allow at most 999 parameters per statement)
+MAX_SQL_PARAMETERS = 900
+
+# Columns of the run table included in CampaignDB.runs_dataframe
+RUN_COLUMNS = ['run_name', 'ensemble_name', 'status', 'sample', 'campaign', 'app', 'run_dir']
+
+# Columns recording the execution of runs, returned by runs_dataframe on request
+EXECUTION_COLUMNS = ['exit_code', 'wall_time']
+
+# Column types of the parameter types (in the params specification) which are
+# stored in the typed parameter tables, see CampaignDB.create_param_table
+PARAM_COLUMN_TYPES = {
+    'float': Float,
+    'number': Float,
+    'integer': Integer,
+    'string': String,
+    'boolean': Boolean,
+}
+
+# Options of CampaignDB.engine_options applied to SQLite connections as PRAGMAs
+SQLITE_PRAGMAS = ('journal_mode', 'busy_timeout', 'synchronous')
+
+# Engine options used unless overridden. Waiting (for up to busy_timeout ms)
+# for locks held by other processes avoids 'database is locked' errors.
+DEFAULT_ENGINE_OPTIONS = {'busy_timeout': 60000}
+
+# Number of runs fetched per query when iterating over runs
+RUNS_PAGE_SIZE = 10000
+
+# Version of the database schema defined below. Databases created with an
+# older schema are upgraded by the functions in MIGRATIONS when opened.
+SCHEMA_VERSION = 6
+
 Base = declarative_base()
 
 
@@ -66,6 +108,8 @@ class CampaignTable(Base):
     campaign_dir = Column(String)
     runs_dir = Column(String)
     sampler = Column(Integer, ForeignKey('sample.id'))
+    collation_store = Column(String)
+    collation_dir = Column(String)
 
 
 class AppTable(Base):
@@ -93,6 +137,25 @@ class RunTable(Base):
     run_dir = Column(String)
     campaign = Column(Integer, ForeignKey('campaign_info.id'))
     sample = Column(Integer, ForeignKey('sample.id'))
+    # Lease held on a CLAIMED run by a worker (see CampaignDB.claim_runs)
+    lease_owner = Column(String)
+    lease_id = Column(String)
+    lease_expires = Column(Float)
+    lease_status = Column(Integer)
+    # Outcome of executing the run (see CampaignDB.record_executions)
+    exit_code = Column(Integer)
+    wall_time = Column(Float)
+
+    # Runs are looked up by name (or by lease, when claimed) and selected by
+    # status and app (or campaign), in order of id (the SQLite rowid is
+    # implicitly part of every index)
+    __table_args__ = (
+        Index('ix_run_run_name', 'run_name'),
+        Index('ix_run_status_app', 'status', 'app'),
+        Index('ix_run_app_status', 'app', 'status'),
+        Index('ix_run_campaign_status', 'campaign', 'status'),
+        Index('ix_run_lease_id', 'lease_id'),
+    )
 
 
 class SamplerTable(Base):
@@ -103,18 +166,190 @@ class SamplerTable(Base):
     sampler = Column(String)
 
 
+class CollationPartTable(Base):
+    """An SQLAlchemy schema for the table recording the parts of file based
+    collation stores (see `easyvvuq.db.collation_store`).
+    """
+    __tablename__ = 'collation_part'
+    id = Column(Integer, primary_key=True)
+    app = Column(Integer, ForeignKey('app.id'))
+    filename = Column(String)
+
+
+class SchemaVersionTable(Base):
+    """An SQLAlchemy schema for the table holding the version of the database
+    schema (missing in databases created before versioning, version 0).
+    """
+    __tablename__ = 'schema_version'
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer)
+
+
+def _create_indexes(connection, names):
+    """Create the named indexes of the run table, if they do not exist yet."""
+    for index in RunTable.__table__.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+
+def _migrate_to_1(connection):
+    """Version 1 adds indexes to the run table."""
+    _create_indexes(connection, ['ix_run_run_name', 'ix_run_status_app',
+                                 'ix_run_app_status', 'ix_run_campaign_status'])
+
+
+def _add_columns(connection, names, table=RunTable):
+    """Add the named columns of the table (the run table by default), if they
+    do not exist yet."""
+    table_name = table.__tablename__
+    existing = [col['name'] for col in inspect(connection).get_columns(table_name)]
+    for name in names:
+        if name not in existing:
+            col = table.__table__.c[name]
+            col_type = col.type.compile(dialect=connection.dialect)
+            connection.execute(
+                text(f'ALTER TABLE {table_name} ADD COLUMN {name} {col_type}'))
+
+
+def _migrate_to_2(connection):
+    """Version 2 adds the lease columns to the run table."""
+    _add_columns(connection, ['lease_owner', 'lease_id', 'lease_expires', 'lease_status'])
+
+
+def _migrate_to_3(connection):
+    """Version 3 adds the execution columns to the run table."""
+    _add_columns(connection, EXECUTION_COLUMNS)
+
+
+def _migrate_to_4(connection):
+    """Version 4 records the collation store of each campaign."""
+    _add_columns(connection, ['collation_store', 'collation_dir'], table=CampaignTable)
+
+
+def _migrate_to_5(connection):
+    """Version 5 indexes the lease id, by which claimed runs are selected."""
+    _create_indexes(connection, ['ix_run_lease_id'])
+
+
+def _migrate_to_6(connection):
+    """Version 6 adds the table recording the parts of file based collation
+    stores."""
+    CollationPartTable.__table__.create(connection, checkfirst=True)
+
+
+# Functions upgrading the schema to each version from the previous one
+MIGRATIONS = {
+    1: _migrate_to_1,
+    2: _migrate_to_2,
+    3: _migrate_to_3,
+    4: _migrate_to_4,
+    5: _migrate_to_5,
+    6: _migrate_to_6,
+}
+
+
+def _param_table_name(app_id):
+    return 'PARAMS_APP' + str(app_id)
+
+
+def _operation(method):
+    """Decorator for CampaignDB methods which use its session. The session
+    (and its database connection) is closed when the outermost such method
+    returns, so no session outlives a single operation."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.close()
+    return wrapper
+
+
+def _create_engine(location, engine_options):
+    """Create the engine for `location`, applying the SQLite PRAGMAs in
+    `engine_options` to every new connection and passing the other options
+    to `sqlalchemy.create_engine`."""
+    options = dict(engine_options)
+    pragmas = {key: options.pop(key) for key in SQLITE_PRAGMAS if key in options}
+    engine = create_engine(location, **options)
+    if engine.dialect.name != 'sqlite':
+        if [key for key in pragmas if key not in DEFAULT_ENGINE_OPTIONS]:
+            message = f"Engine options {list(pragmas)} are only supported for SQLite"
+            logger.error(message)
+            raise RuntimeError(message)
+        return engine
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for key, value in pragmas.items():
+            if value is not None:
+                cursor.execute(f'PRAGMA {key} = {value}')
+        cursor.close()
+    return engine
+
+
 class CampaignDB(BaseCampaignDB):
+    """An SQL (SQLAlchemy) implementation of the CampaignDB.
+
+    Parameters
+    ----------
+    location : str or None
+        SQLAlchemy URI of the database, an in-memory SQLite database if None.
+    new_campaign : bool
+        Create a new campaign in the database (rather than open an existing one).
+    name : str
+        Name of the campaign.
+    info : :obj:`easyvvuq.data_structs.CampaignInfo`
+        Information on the campaign, required when `new_campaign` is True.
+    collation_store : str or None
+        Name of the store used for collated results, 'sql' (a table in this
+        database) or 'parquet' (see `easyvvuq.db.collation_store`). It is
+        recorded with the campaign, and if None the recorded store is used
+        ('sql' for new campaigns).
+    collation_dir : str or None
+        Directory for file based collation stores. If None, the recorded
+        directory is used, or else a `collation` directory next to an SQLite
+        database file.
+    engine_options : dict or None
+        Options for the database engine, overriding DEFAULT_ENGINE_OPTIONS.
+        For SQLite, 'journal_mode' (e.g. 'WAL', which lets readers and a
+        writer in other processes work concurrently, but should not be used
+        on network file systems), 'busy_timeout' (milliseconds to wait for
+        locks) and 'synchronous' (e.g. 'NORMAL') are set as PRAGMAs. Other
+        options, e.g. 'pool_size' or 'poolclass', are passed on to
+        `sqlalchemy.create_engine`.
+    migrate : bool
+        Upgrade the schema of an existing database to the version used by
+        this version of EasyVVUQ. If False (e.g. to monitor a campaign
+        without writing to its database), nothing is written when opening a
+        campaign, and a RuntimeError is raised if the schema is out of date.
+    """
 
-    def __init__(self, location=None, new_campaign=False, name=None, info=None):
+    def __init__(self, location=None, new_campaign=False, name=None, info=None,
+                 collation_store=None, collation_dir=None, engine_options=None,
+                 migrate=True):
 
-        if location is not None:
-            self.engine = create_engine(location)
-        else:
-            self.engine = create_engine('sqlite://')
+        if location is None:
+            location = 'sqlite://'
+        self.engine_options = dict(DEFAULT_ENGINE_OPTIONS, **(engine_options or {}))
+        self.engine = _create_engine(location, self.engine_options)
 
-        session_maker = sessionmaker(bind=self.engine)
+        if collation_store is not None and collation_store not in AVAILABLE_COLLATION_STORES:
+            message = (f"Invalid collation store '{collation_store}'. Supported "
+                       f"stores are {list(AVAILABLE_COLLATION_STORES)}.")
+            logger.error(message)
+            raise RuntimeError(message)
+        self._param_tables = {}
 
-        self.session = session_maker()
+        # Sessions are created when needed and closed after each operation
+        self._session_maker = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self._session = None
+        self._depth = 0
+        self._transaction_depth = 0
 
         if new_campaign:
             if info is None:
@@ -126,7 +361,14 @@ class CampaignDB(BaseCampaignDB):
                 logging.critical(message)
                 raise RuntimeError(message)
 
+            is_db_new = not inspect(self.engine).has_table(DBInfoTable.__tablename__)
             Base.metadata.create_all(self.engine)
+            if is_db_new:
+                self._set_schema_version(SCHEMA_VERSION)
+            elif migrate:
+                self.migrate()
+            else:
+                self._check_schema_version()
 
             is_db_empty = (self.session.query(CampaignTable).first() is None)
 
@@ -140,22 +382,150 @@ class CampaignDB(BaseCampaignDB):
             self._next_run = 1
             self._next_ensemble = 1
 
-            self.session.add(CampaignTable(**info.to_dict(flatten=True)))
+            campaign_row = CampaignTable(**info.to_dict(flatten=True))
+            self._set_collation_store(campaign_row, collation_store, collation_dir)
+            self.session.add(campaign_row)
             self.session.add(
                 DBInfoTable(
                     next_run=self._next_run,
                     next_ensemble=self._next_ensemble))
-            self.session.commit()
+            self._commit()
         else:
+            if migrate:
+                self.migrate()
+            else:
+                self._check_schema_version()
             info = self.session.query(
                 CampaignTable).filter_by(name=name).first()
             if info is None:
                 raise ValueError('Campaign with the given name not found.')
+            self._set_collation_store(info, collation_store, collation_dir, record=migrate)
+            if migrate:
+                self._commit()
 
             db_info = self.session.query(DBInfoTable).first()
             self._next_run = db_info.next_run
             self._next_ensemble = db_info.next_ensemble
 
+        self.close()
+
+    def _set_collation_store(self, campaign_row, collation_store, collation_dir,
+                             record=True):
+        """Choose the collation store of the campaign, preferring the given
+        store and directory over those recorded in its `campaign_row`, and
+        (if `record` is set) record the choice where none was recorded yet.
+        """
+        if collation_store is None:
+            collation_store = campaign_row.collation_store or 'sql'
+        if collation_dir is None:
+            collation_dir = campaign_row.collation_dir
+        if (collation_dir is None and self.engine.url.get_backend_name() == 'sqlite'
+                and self.engine.url.database):
+            collation_dir = os.path.join(
+                os.path.dirname(os.path.abspath(self.engine.url.database)), 'collation')
+        if record and campaign_row.collation_store is None:
+            campaign_row.collation_store = collation_store
+            campaign_row.collation_dir = collation_dir
+        self.collation_store = collation_store
+        self.collation_dir = collation_dir
+
+    @property
+    def session(self):
+        """The session of the current operation, created when first used."""
+        if self._session is None:
+            self._session = self._session_maker()
+        return self._session
+
+    def close(self):
+        """Close the current session, releasing its database connection."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Group the operations done in a `with` block into a single
+        transaction, committed when the block ends and rolled back if it
+        raises, e.g. to store collated results together with the status of
+        the runs they come from.
+        """
+        self._depth += 1
+        self._transaction_depth += 1
+        try:
+            yield
+            if self._transaction_depth == 1:
+                self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            raise
+        finally:
+            self._transaction_depth -= 1
+            self._depth -= 1
+            if self._depth == 0:
+                self.close()
+
+    def _commit(self):
+        """Commit the session, unless it is part of a longer transaction."""
+        if self._transaction_depth == 0:
+            self.session.commit()
+
+    @_operation
+    def schema_version(self):
+        """
+        Returns
+        -------
+        int:
+            Version of the schema of the database, 0 for databases created
+            before schema versioning was introduced.
+        """
+        if not inspect(self.engine).has_table(SchemaVersionTable.__tablename__):
+            return 0
+        version = self.session.query(SchemaVersionTable).first()
+        return 0 if version is None else version.version
+
+    def _set_schema_version(self, version, connection=None):
+        if connection is None:
+            with self.engine.begin() as connection:
+                return self._set_schema_version(version, connection)
+        table = SchemaVersionTable.__table__
+        table.create(connection, checkfirst=True)
+        connection.execute(table.delete())
+        connection.execute(table.insert(), {'version': version})
+
+    def _check_schema_version(self):
+        """Raise a RuntimeError if the database schema is not the version
+        used by this version of EasyVVUQ."""
+        version = self.schema_version()
+        if version != SCHEMA_VERSION:
+            message = (f'Database schema version {version} differs from the version '
+                       f'used by this version of EasyVVUQ ({SCHEMA_VERSION}). Open the '
+                       f'database with migrate=True (the default) to upgrade an older schema.')
+            logger.error(message)
+            raise RuntimeError(message)
+
+    @_operation
+    def migrate(self):
+        """
+        Upgrade the database schema, in place, to the version used by this
+        version of EasyVVUQ. Each migration is applied in its own transaction,
+        together with the update of the stored schema version.
+        """
+        version = self.schema_version()
+        if version > SCHEMA_VERSION:
+            message = (f'Database schema version {version} is newer than the version '
+                       f'supported by this version of EasyVVUQ ({SCHEMA_VERSION})')
+            logger.error(message)
+            raise RuntimeError(message)
+        # Release any locks held by the session before altering the schema
+        self._commit()
+        for new_version in range(version + 1, SCHEMA_VERSION + 1):
+            logger.info(f'Migrating database schema to version {new_version}')
+            with self.engine.begin() as connection:
+                MIGRATIONS[new_version](connection)
+                self._set_schema_version(new_version, connection)
+
+    @_operation
     def app(self, name=None):
         """
         Get app information. Specific applications selected by `name`,
@@ -202,7 +572,8 @@ class CampaignDB(BaseCampaignDB):
 
         return app_dict
 
-    def add_app(self, app_info):
+    @_operation
+    def add_app(self, app_info, param_table=False):
         """
         Add application to the 'app' table.
 
@@ -210,6 +581,9 @@ class CampaignDB(BaseCampaignDB):
         ----------
         app_info: AppInfo
             Application definition.
+        param_table: bool
+            Also create a table with a typed, indexed, column per scalar
+            parameter of the app (see `create_param_table`).
 
         Returns
         -------
@@ -231,8 +605,73 @@ class CampaignDB(BaseCampaignDB):
 
         db_entry = AppTable(**app_dict)
         self.session.add(db_entry)
-        self.session.commit()
+        self._commit()
+
+        if param_table:
+            self.create_param_table(db_entry.id)
 
+    @_operation
+    def create_param_table(self, app_id):
+        """
+        Create the `PARAMS_APP<id>` table for an app, with one typed and
+        indexed column per scalar (float, integer, string or boolean)
+        parameter, keyed by run name. Parameters of other types are only kept
+        in the JSON `params` of the run table. The table is filled from the
+        app's existing runs and then kept up to date by `add_runs`, and lets
+        `where` conditions on run parameters be evaluated by the database.
+        If the table exists already it is returned as it is.
+
+        Parameters
+        ----------
+        app_id: int
+            ID of the app.
+
+        Returns
+        -------
+        sqlalchemy.Table:
+            The parameter table.
+        """
+
+        existing = self._param_table(app_id)
+        if existing is not None:
+            # Kept up to date by add_runs since it was created
+            return existing
+        params = ParamsSpecification.deserialize(
+            self.session.query(AppTable).filter_by(id=app_id).one().params)
+        columns = [Column(name, PARAM_COLUMN_TYPES[spec['type']], index=True)
+                   for name, spec in params.params_dict.items()
+                   if spec.get('type') in PARAM_COLUMN_TYPES]
+        table = Table(_param_table_name(app_id), MetaData(),
+                      Column('run_name', String, primary_key=True), *columns)
+
+        self._commit()
+        with self.engine.begin() as connection:
+            table.create(connection)
+            rows = [self._param_row(table, run_name, json.loads(run_params))
+                    for run_name, run_params in connection.execute(
+                        select(RunTable.run_name, RunTable.params).where(
+                            RunTable.app == app_id))]
+            for i in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                connection.execute(table.insert(), rows[i:i + BULK_INSERT_CHUNK_SIZE])
+        self._param_tables[app_id] = table
+        return table
+
+    def _param_table(self, app_id):
+        """Return the parameter table of the app, None if it has none."""
+        if app_id not in self._param_tables:
+            name = _param_table_name(app_id)
+            if not inspect(self.engine).has_table(name):
+                return None
+            self._param_tables[app_id] = Table(name, MetaData(), autoload_with=self.engine)
+        return self._param_tables[app_id]
+
+    @staticmethod
+    def _param_row(table, run_name, params):
+        row = {name: params.get(name) for name in table.c.keys()}
+        row['run_name'] = run_name
+        return row
+
+    @_operation
     def add_sampler(self, sampler_element):
         """
         Add new Sampler to the 'sampler' table.
@@ -248,10 +687,11 @@ class CampaignDB(BaseCampaignDB):
         db_entry = SamplerTable(sampler=sampler_element.serialize())
 
         self.session.add(db_entry)
-        self.session.commit()
+        self._commit()
 
         return db_entry.id
 
+    @_operation
     def update_sampler(self, sampler_id, sampler_element):
         """
         Update the state of the Sampler with id 'sampler_id' to
@@ -271,8 +711,9 @@ class CampaignDB(BaseCampaignDB):
 
         selected = self.session.query(SamplerTable).get(sampler_id)
         selected.sampler = sampler_element.serialize()
-        self.session.commit()
+        self._commit()
 
+    @_operation
     def resurrect_sampler(self, sampler_id):
         """
         Return the sampler object corresponding to id sampler_id in the database.
@@ -294,6 +735,7 @@ class CampaignDB(BaseCampaignDB):
         sampler = BaseSamplingElement.deserialize(serialized_sampler)
         return sampler
 
+    @_operation
     def resurrect_app(self, app_name):
         """
         Return the 'live' encoder, decoder and collation objects corresponding to the app with
@@ -309,19 +751,26 @@ class CampaignDB(BaseCampaignDB):
         -------
         BaseEncoder, BaseDecoder, BaseCollationElement
             The 'live' encoder and decoder objects associated with this app
+            (None for apps without an encoder or decoder)
 
         """
 
         app_info = self.app(app_name)
 
-        encoder = BaseEncoder.deserialize(app_info['input_encoder'])
-        decoder = BaseDecoder.deserialize(app_info['output_decoder'])
+        encoder, decoder = None, None
+        if app_info['input_encoder'] is not None:
+            encoder = BaseEncoder.deserialize(app_info['input_encoder'])
+        if app_info['output_decoder'] is not None:
+            decoder = BaseDecoder.deserialize(app_info['output_decoder'])
         collater = BaseCollationElement.deserialize(app_info['collater'])
         return encoder, decoder, collater
 
-    def add_runs(self, run_info_list=None, run_prefix='Run_', ensemble_prefix='Ensemble_'):
+    @_operation
+    def add_runs(self, run_info_list=None, run_prefix='Run_', ensemble_prefix='Ensemble_',
+                 ensemble_size=None):
         """
-        Add list of runs to the `runs` table in the database.
+        Add list of runs to the `runs` table in the database. All runs are
+        bulk inserted in a single transaction.
 
         Parameters
         ----------
@@ -332,30 +781,99 @@ class CampaignDB(BaseCampaignDB):
             Prefix for run id
         ensemble_prefix: str
             Prefix for ensemble id
+        ensemble_size: int or None
+            Number of consecutive runs in `run_info_list` that share an
+            ensemble. If None, all of the runs belong to a single ensemble.
 
         Returns
         -------
 
         """
 
-        # Add all runs to RunTable
+        if ensemble_size is None:
+            ensemble_size = max(len(run_info_list), 1)
+
+        # Reserve the run and ensemble numbers first, in the same transaction
+        n_runs = len(run_info_list)
+        n_ensembles = max(-(-n_runs // ensemble_size), 1)
+        self._next_run, self._next_ensemble = self._reserve_numbers(n_runs, n_ensembles)
+
+        # Add all runs to RunTable. Rows are written with a Core executemany
+        # (in chunks) rather than one ORM object per run, which is far cheaper
+        # for the very large numbers of runs some samplers produce.
         runs_dir = self.runs_dir()
-        for run_info in run_info_list:
+        insert = RunTable.__table__.insert()
+
+        # Scalar parameters of apps with a parameter table are also written there
+        param_tables = {app: self._param_table(app)
+                        for app in set(run_info.app for run_info in run_info_list)}
+        param_tables = {app: table for app, table in param_tables.items() if table is not None}
+        param_rows = {app: [] for app in param_tables}
+
+        def write_rows():
+            self.session.execute(insert, rows)
+            rows.clear()
+            for app, table in param_tables.items():
+                if param_rows[app]:
+                    self.session.execute(table.insert(), param_rows[app])
+                    param_rows[app].clear()
+
+        rows = []
+        for i, run_info in enumerate(run_info_list):
+            if i > 0 and i % ensemble_size == 0:
+                self._next_ensemble += 1
             run_info.ensemble_name = f"{ensemble_prefix}{self._next_ensemble}"
             run_info.run_name = f"{run_prefix}{self._next_run}"
             run_info.run_dir = os.path.join(runs_dir, run_info.run_name)
 
-            run = RunTable(**run_info.to_dict(flatten=True))
-            self.session.add(run)
+            rows.append(run_info.to_dict(flatten=True))
+            if run_info.app in param_tables:
+                param_rows[run_info.app].append(self._param_row(
+                    param_tables[run_info.app], run_info.run_name, run_info.params))
             self._next_run += 1
+
+            if len(rows) >= BULK_INSERT_CHUNK_SIZE:
+                write_rows()
+        if rows:
+            write_rows()
         self._next_ensemble += 1
 
-        # Update run and ensemble counters in db
-        db_info = self.session.query(DBInfoTable).first()
-        db_info.next_run = self._next_run
-        db_info.next_ensemble = self._next_ensemble
+        self._commit()
 
-        self.session.commit()
+    @_operation
+    def reserve_run_numbers(self, n_runs, n_ensembles):
+        """
+        Reserve run and ensemble numbers for results that are collated without
+        adding runs to the `runs` table (see `Campaign.apply_to_samples`), so
+        their names do not clash with those of other runs.
+
+        Parameters
+        ----------
+        n_runs: int
+            Number of run numbers to reserve.
+        n_ensembles: int
+            Number of ensemble numbers to reserve.
+
+        Returns
+        -------
+        int, int:
+            The first reserved run number and ensemble number.
+        """
+        numbers = self._reserve_numbers(n_runs, n_ensembles)
+        self._commit()
+        return numbers
+
+    def _reserve_numbers(self, n_runs, n_ensembles):
+        """Advance the run and ensemble counters, returning the first number
+        reserved of each. The UPDATE takes the write lock, so other processes
+        reserving numbers concurrently get distinct numbers instead of relying
+        on the counters cached by this instance."""
+        self.session.execute(update(DBInfoTable).values(
+            next_run=DBInfoTable.next_run + n_runs,
+            next_ensemble=DBInfoTable.next_ensemble + n_ensembles))
+        db_info = self.session.execute(
+            select(DBInfoTable.next_run, DBInfoTable.next_ensemble)).first()
+        return db_info.next_run - n_runs, db_info.next_ensemble - n_ensembles
 
     @staticmethod
     def _run_to_dict(run_row):
@@ -388,6 +906,7 @@ class CampaignDB(BaseCampaignDB):
 
         return run_info
 
+    @_operation
     def set_dir_for_run(self, run_name, run_dir, campaign=None, sampler=None):
         """
         Set the 'run_dir' path for the specified run in the database.
@@ -422,8 +941,33 @@ class CampaignDB(BaseCampaignDB):
         selected = selected.first()
 
         selected.run_dir = run_dir
-        self.session.commit()
+        self._commit()
+
+    @_operation
+    def set_dirs_for_runs(self, run_dirs):
+        """
+        Set the 'run_dir' paths of many runs at once, in a single
+        transaction.
+
+        Parameters
+        ----------
+        run_dirs: dict
+            Directory path for each run, keyed by run name.
 
+        Returns
+        -------
+
+        """
+        if not run_dirs:
+            return
+        table = RunTable.__table__
+        self.session.execute(
+            table.update().where(table.c.run_name == bindparam('name')).values(
+                run_dir=bindparam('dir')),
+            [{'name': run_name, 'dir': run_dir} for run_name, run_dir in run_dirs.items()])
+        self._commit()
+
+    @_operation
     def get_run_status(self, run_name, campaign=None, sampler=None):
         """
         Return the status (enum) for the run with name 'run_name' (and, optionally,
@@ -459,6 +1003,7 @@ class CampaignDB(BaseCampaignDB):
 
         return constants.Status(selected.status)
 
+    @_operation
     def set_run_statuses(self, run_name_list, status):
         """
         Set the specified 'status' (enum) for all runs in the list run_ID_list
@@ -474,16 +1019,269 @@ class CampaignDB(BaseCampaignDB):
         -------
 
         """
-        max_entries = 900
+        table = RunTable.__table__
+        for i in range(0, len(run_name_list), MAX_SQL_PARAMETERS):
+            self.session.execute(
+                table.update().where(
+                    table.c.run_name.in_(run_name_list[i:i + MAX_SQL_PARAMETERS])).values(
+                        status=status))
+        self._commit()
+
+    @_operation
+    def record_executions(self, results):
+        """
+        Record the exit code and wall time of executed runs, in a single
+        transaction. Runs whose execution failed are set to Status.FAILED.
+
+        Parameters
+        ----------
+        results: dict
+            An `easyvvuq.actions.ExecutionResult` for each run, keyed by run
+            name.
 
-        for i in range(0, len(run_name_list), max_entries):
-            selected = self.session.query(RunTable).filter(
-                RunTable.run_name.in_(set(run_name_list[i:i + max_entries]))).all()
+        Returns
+        -------
 
-            for run in selected:
-                run.status = status
-            self.session.commit()
+        """
+        if not results:
+            return
+        table = RunTable.__table__
+        self.session.execute(
+            table.update().where(table.c.run_name == bindparam('name')).values(
+                exit_code=bindparam('exit_code'), wall_time=bindparam('wall_time')),
+            [{'name': run_name, 'exit_code': result.exit_code, 'wall_time': result.wall_time}
+             for run_name, result in results.items()])
+        failed = [run_name for run_name, result in results.items() if result.failed]
+        for i in range(0, len(failed), MAX_SQL_PARAMETERS):
+            self.session.execute(
+                table.update().where(
+                    table.c.run_name.in_(failed[i:i + MAX_SQL_PARAMETERS])).values(
+                        status=constants.Status.FAILED))
+        self._commit()
+
+    @_operation
+    def mean_wall_time(self, campaign=None, sampler=None, app_id=None):
+        """
+        Return the mean wall time of the selected runs whose execution has
+        been recorded.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        app_id: int or None
+            App id to filter for.
+
+        Returns
+        -------
+        float or None:
+            Mean wall time in seconds, None if no wall time has been recorded.
+        """
+        selected = self._select_runs(campaign=campaign, sampler=sampler, app_id=app_id)
+        selected = selected.filter(RunTable.wall_time.isnot(None))
+        return selected.with_entities(func.avg(RunTable.wall_time)).scalar()
+
+    @_operation
+    def get_runs(self, run_name_list):
+        """
+        Return the information on each of the runs in `run_name_list`.
+
+        Parameters
+        ----------
+        run_name_list: list of str
+            A list of run names.
+
+        Returns
+        -------
+        dict:
+            Information on each run found (as returned by `run`), keyed by
+            run name, in order of run id.
+        """
+        runs = []
+        for i in range(0, len(run_name_list), MAX_SQL_PARAMETERS):
+            runs += self.session.query(RunTable).filter(
+                RunTable.run_name.in_(run_name_list[i:i + MAX_SQL_PARAMETERS])).all()
+        runs.sort(key=lambda run: run.id)
+        return {run.run_name: self._run_to_dict(run) for run in runs}
+
+    @_operation
+    def claim_runs(self, n, worker_id, lease_seconds=600, status=constants.Status.NEW,
+                   app_id=None, campaign=None):
+        """
+        Atomically claim up to `n` runs with the given `status` for a worker.
+        The runs are set to Status.CLAIMED, with a lease held by `worker_id`
+        that expires after `lease_seconds` unless renewed. Runs whose lease
+        has expired (e.g. because their worker crashed) are claimed again as
+        if they still had their original status. Lease times use the clock
+        of the claiming machine, so the clocks of workers should agree to
+        well within the lease duration.
 
+        Parameters
+        ----------
+        n: int
+            Maximum number of runs to claim.
+        worker_id: str
+            Name of the claiming worker, unique among the workers.
+        lease_seconds: float
+            Duration of the lease.
+        status: enum(Status)
+            Status of the runs to claim, restored if the lease is released or
+            expires.
+        app_id: int or None
+            App id to filter for.
+        campaign: int or None
+            Campaign id to filter for.
+
+        Returns
+        -------
+        list of str:
+            Names of the claimed runs, in order of id (empty if there are no
+            runs left to claim).
+        """
+        if n < 1:
+            message = f"Number of runs to claim must be at least 1, not {n}"
+            logger.error(message)
+            raise RuntimeError(message)
+        table = RunTable.__table__
+        now = time.time()
+        lease_id = uuid.uuid4().hex
+        claimable = or_(table.c.status == status,
+                        and_(table.c.status == constants.Status.CLAIMED,
+                             table.c.lease_status == status,
+                             table.c.lease_expires < now))
+        candidates = select(table.c.id).where(claimable)
+        if app_id:
+            candidates = candidates.where(table.c.app == app_id)
+        if campaign:
+            candidates = candidates.where(table.c.campaign == campaign)
+        candidates = candidates.order_by(table.c.id).limit(n)
+        # A single UPDATE, so concurrent claims can never take the same run
+        self.session.execute(
+            table.update().where(table.c.id.in_(candidates)).where(claimable).values(
+                status=constants.Status.CLAIMED, lease_owner=worker_id, lease_id=lease_id,
+                lease_expires=now + lease_seconds, lease_status=status))
+        claimed = self.session.execute(
+            select(table.c.run_name).where(table.c.lease_id == lease_id).order_by(table.c.id))
+        run_names = [run_name for run_name, in claimed]
+        self._commit()
+        return run_names
+
+    @_operation
+    def renew_leases(self, worker_id, lease_seconds=600, run_name_list=None):
+        """
+        Extend the leases held by `worker_id` to expire `lease_seconds` from
+        now.
+
+        Parameters
+        ----------
+        worker_id: str
+            Name of the worker holding the leases.
+        lease_seconds: float
+            New duration of the leases.
+        run_name_list: list of str or None
+            Only renew the leases on these runs (all of the worker's if None).
+
+        Returns
+        -------
+        int:
+            The number of leases renewed. Runs that have meanwhile been
+            claimed by another worker are not included.
+        """
+        values = {'lease_expires': time.time() + lease_seconds}
+        return self._update_leases(worker_id, run_name_list, values)
+
+    @_operation
+    def release_runs(self, worker_id, run_name_list, status=None):
+        """
+        Release the leases held by `worker_id` on the runs in `run_name_list`,
+        setting their status to `status`, e.g. Status.ENCODED once the worker
+        has encoded them.
+
+        Parameters
+        ----------
+        worker_id: str
+            Name of the worker holding the leases.
+        run_name_list: list of str
+            Names of the runs to release.
+        status: enum(Status) or None
+            New status of the runs, None to restore the status they were
+            claimed from.
+
+        Returns
+        -------
+        int:
+            The number of runs released. Runs that have meanwhile been
+            claimed by another worker are not included.
+        """
+        table = RunTable.__table__
+        values = {'status': table.c.lease_status if status is None else status,
+                  'lease_owner': None, 'lease_id': None,
+                  'lease_expires': None, 'lease_status': None}
+        return self._update_leases(worker_id, run_name_list, values)
+
+    def _update_leases(self, worker_id, run_name_list, values):
+        """Set `values` on the CLAIMED runs of `worker_id`, restricted to
+        `run_name_list` unless None, and return the number of runs updated."""
+        table = RunTable.__table__
+        leased = table.update().where(table.c.status == constants.Status.CLAIMED).where(
+            table.c.lease_owner == worker_id).values(**values)
+        if run_name_list is None:
+            updated = self.session.execute(leased).rowcount
+        else:
+            updated = 0
+            for i in range(0, len(run_name_list), MAX_SQL_PARAMETERS):
+                updated += self.session.execute(leased.where(
+                    table.c.run_name.in_(run_name_list[i:i + MAX_SQL_PARAMETERS]))).rowcount
+        self._commit()
+        return updated
+
+    @_operation
+    def reclaim_expired_runs(self):
+        """
+        Restore the status that runs had before they were claimed, for all
+        runs whose lease has expired.
+
+        Returns
+        -------
+        int:
+            The number of runs reclaimed.
+        """
+        table = RunTable.__table__
+        reclaimed = self.session.execute(
+            table.update().where(table.c.status == constants.Status.CLAIMED).where(
+                table.c.lease_expires < time.time()).values(
+                    status=table.c.lease_status, lease_owner=None, lease_id=None,
+                    lease_expires=None, lease_status=None)).rowcount
+        self._commit()
+        return reclaimed
+
+    @_operation
+    def get_run_statuses(self, run_name_list):
+        """
+        Return the status (enum) of each of the runs in `run_name_list`.
+
+        Parameters
+        ----------
+        run_name_list: list of str
+            A list of run names.
+
+        Returns
+        -------
+        dict:
+            The status of each run found, keyed by run name.
+        """
+        table = RunTable.__table__
+        statuses = {}
+        for i in range(0, len(run_name_list), MAX_SQL_PARAMETERS):
+            selected = self.session.execute(
+                select(table.c.run_name, table.c.status).where(
+                    table.c.run_name.in_(run_name_list[i:i + MAX_SQL_PARAMETERS])))
+            statuses.update({name: constants.Status(status) for name, status in selected})
+        return statuses
+
+    @_operation
     def campaigns(self):
         """Get list of campaigns for which information is stored in the
         database.
@@ -528,6 +1326,7 @@ class CampaignDB(BaseCampaignDB):
 
         return campaign_info.first()
 
+    @_operation
     def get_campaign_id(self, name):
         """
         Return the (database) id corresponding to the campaign with name 'name'.
@@ -561,6 +1360,7 @@ class CampaignDB(BaseCampaignDB):
         # Return the database ID for the specified campaign
         return selected[0][1]
 
+    @_operation
     def get_sampler_id(self, campaign_id):
         """
         Return the (database) id corresponding to the sampler currently set
@@ -580,6 +1380,7 @@ class CampaignDB(BaseCampaignDB):
         sampler_id = self.session.query(CampaignTable).get(campaign_id).sampler
         return sampler_id
 
+    @_operation
     def set_sampler(self, campaign_id, sampler_id):
         """
         Set specified campaign to be using specified sampler
@@ -596,8 +1397,9 @@ class CampaignDB(BaseCampaignDB):
         """
 
         self.session.query(CampaignTable).get(campaign_id).sampler = sampler_id
-        self.session.commit()
+        self._commit()
 
+    @_operation
     def campaign_dir(self, campaign_name=None):
         """Get campaign directory for `campaign_name`.
 
@@ -621,7 +1423,8 @@ class CampaignDB(BaseCampaignDB):
             sampler=None,
             status=None,
             not_status=None,
-            app_id=None):
+            app_id=None,
+            where=None):
         """
         Select all runs in the database which match the input criteria.
 
@@ -637,6 +1440,10 @@ class CampaignDB(BaseCampaignDB):
             Status string to filter for.
         not_status: enum(Status) or None
             Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Conditions `(param, op, value)` on the run parameters, see `runs`.
 
         Returns
         -------
@@ -649,18 +1456,88 @@ class CampaignDB(BaseCampaignDB):
         if campaign:
             filter_options['campaign'] = campaign
         if sampler:
-            filter_options['sampler'] = sampler
+            filter_options['sample'] = sampler
         if status:
             filter_options['status'] = status
-        if app_id:
+        where_clauses, in_param_table = self._where_clauses(where or [], app_id)
+        # Only runs of the app are in its parameter table, and leaving out the
+        # app filter stops SQLite scanning all of the app's runs
+        if app_id and not in_param_table:
             filter_options['app'] = app_id
 
         # Note that for some databases this can be sped up with a yield_per(), but not all
-        selected = self.session.query(RunTable).filter_by(
-            **filter_options).filter(RunTable.status != not_status)
+        selected = self.session.query(RunTable).filter_by(**filter_options)
+        if not_status is not None:
+            selected = selected.filter(RunTable.status != not_status)
+        if where_clauses:
+            selected = selected.filter(*where_clauses)
 
         return selected
 
+    def _where_clauses(self, where, app_id=None):
+        """
+        Translate `(param, op, value)` conditions on run parameters into SQL.
+        Parameters in the parameter table of app `app_id` are compared there
+        (using its indexes), any others are extracted from the JSON params of
+        the run table (SQLite only). Returns the list of SQL conditions and
+        whether they select runs from the parameter table.
+        """
+        if not where:
+            return [], False
+        table = self._param_table(app_id) if app_id else None
+        clauses = []
+        param_clauses = []
+        for name, op, value in where:
+            if op not in FILTER_OPERATORS:
+                msg = (f"Invalid operator '{op}' in run conditions, supported operators are "
+                       f"{list(FILTER_OPERATORS)}")
+                logger.error(msg)
+                raise RuntimeError(msg)
+            if table is not None and name in table.c and name != 'run_name':
+                param_clauses.append(FILTER_OPERATORS[op](table.c[name], value))
+            elif self.engine.dialect.name == 'sqlite':
+                param = func.json_extract(RunTable.params, '$."{}"'.format(name))
+                clauses.append(FILTER_OPERATORS[op](param, value))
+            else:
+                msg = (f"Cannot filter runs on parameter '{name}', it is not in a "
+                       f"parameter table (see CampaignDB.create_param_table)")
+                logger.error(msg)
+                raise RuntimeError(msg)
+        if param_clauses:
+            clauses.append(RunTable.run_name.in_(
+                select(table.c.run_name).where(*param_clauses)))
+        return clauses, len(param_clauses) > 0
+
+    def _paginate(self, selected):
+        """
+        Iterate over the rows of `selected` in order of run id, fetching
+        RUNS_PAGE_SIZE rows per query. Each page starts after the last id seen
+        (keyset pagination), so memory use does not grow with the number of
+        runs and the runs can have their status changed while iterating.
+
+        Parameters
+        ----------
+        selected: sqlalchemy.orm.query.Query
+            Query on the run table, as returned by `_select_runs`.
+
+        Returns
+        -------
+        Rows of the query, one at a time.
+        """
+        last_id = 0
+        while True:
+            page = selected.filter(RunTable.id > last_id).order_by(
+                RunTable.id).limit(RUNS_PAGE_SIZE).all()
+            if self._depth == 0:
+                # Do not hold on to a connection while the page is consumed
+                selected.session.close()
+                self.close()
+            yield from page
+            if len(page) < RUNS_PAGE_SIZE:
+                return
+            last_id = page[-1].id
+
+    @_operation
     def run(self, name, campaign=None, sampler=None, status=None, not_status=None, app_id=None):
         """
         Get the information for a specified run.
@@ -700,7 +1577,8 @@ class CampaignDB(BaseCampaignDB):
 
         return self._run_to_dict(selected)
 
-    def runs(self, campaign=None, sampler=None, status=None, not_status=None, app_id=None):
+    def runs(self, campaign=None, sampler=None, status=None, not_status=None, app_id=None,
+             where=None):
         """
         A generator to return all run information for selected `campaign` and `sampler`.
 
@@ -714,6 +1592,15 @@ class CampaignDB(BaseCampaignDB):
             Status string to filter for.
         not_status: enum(Status) or None
             Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Only select runs whose parameters satisfy all `(param, op, value)`
+            conditions, e.g. `[('viscosity', '>', 0.3)]`. `op` is one of '==',
+            '!=', '<', '<=', '>', '>=', 'in' or 'not in'. The conditions are
+            evaluated by the database, on the indexed columns of the
+            parameter table of `app_id` if it has one (see
+            `create_param_table`), otherwise on the JSON params (SQLite only).
 
         Returns
         -------
@@ -728,12 +1615,86 @@ class CampaignDB(BaseCampaignDB):
             sampler=sampler,
             status=status,
             not_status=not_status,
-            app_id=app_id)
+            app_id=app_id,
+            where=where)
 
-        for r in selected:
+        for r in self._paginate(selected):
             yield r.run_name, self._run_to_dict(r)
 
-    def run_ids(self, campaign=None, sampler=None, status=None, not_status=None, app_id=None):
+    @_operation
+    def runs_dataframe(self, campaign=None, sampler=None, status=None, not_status=None,
+                       app_id=None, columns=None, where=None):
+        """
+        Return the information on the selected runs as a DataFrame, read with
+        a single query. The parameters of all runs are parsed at once and
+        expanded into one (typed) column per parameter.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        status: enum(Status) or None
+            Status string to filter for.
+        not_status: enum(Status) or None
+            Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        columns: list of str or None
+            Columns to return, from RUN_COLUMNS, EXECUTION_COLUMNS and the
+            parameter names (see below). All but the EXECUTION_COLUMNS if None.
+        where: list of tuple or None
+            Conditions `(param, op, value)` on the run parameters, see `runs`.
+
+        Returns
+        -------
+        pandas.DataFrame:
+            One row per run, in order of run id. The status is given as an
+            integer (compare with `Status` members). Parameters whose name
+            clashes with one of the RUN_COLUMNS are prefixed with 'params.'.
+        """
+
+        if columns is None:
+            run_columns = RUN_COLUMNS
+            param_columns = None
+        else:
+            run_columns = [col for col in columns if col in RUN_COLUMNS + EXECUTION_COLUMNS]
+            param_columns = [col for col in columns if col not in run_columns]
+        read_params = param_columns is None or len(param_columns) > 0
+
+        entities = [getattr(RunTable, col) for col in run_columns]
+        if read_params:
+            entities.append(RunTable.params)
+        selected = self._select_runs(
+            campaign=campaign,
+            sampler=sampler,
+            status=status,
+            not_status=not_status,
+            app_id=app_id,
+            where=where).with_entities(*entities).order_by(RunTable.id)
+        df = pd.read_sql(selected.statement, self.engine)
+
+        if not read_params:
+            return df[columns]
+
+        # Parse the params of all runs with a single call to json.loads
+        params = json.loads('[' + ','.join(df.pop('params')) + ']')
+        params = pd.DataFrame(params, index=df.index)
+        params.columns = ['params.' + col if col in RUN_COLUMNS else col
+                          for col in params.columns]
+        if columns is None:
+            return pd.concat([df, params], axis=1)
+        missing = [col for col in param_columns if col not in params.columns]
+        if missing and len(df) > 0:
+            msg = f"Unknown run columns or parameters: {missing}"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        params = params.reindex(columns=param_columns)
+        return pd.concat([df, params], axis=1)[columns]
+
+    def run_ids(self, campaign=None, sampler=None, status=None, not_status=None, app_id=None,
+                where=None):
         """
         A generator to return all run IDs for selected `campaign` and `sampler`.
 
@@ -747,6 +1708,10 @@ class CampaignDB(BaseCampaignDB):
             Status string to filter for.
         not_status: enum(Status) or None
             Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Conditions `(param, op, value)` on the run parameters, see `runs`.
 
         Returns
         -------
@@ -760,12 +1725,15 @@ class CampaignDB(BaseCampaignDB):
             sampler=sampler,
             status=status,
             not_status=not_status,
-            app_id=app_id)
+            app_id=app_id,
+            where=where)
 
-        for r in selected:
+        for r in self._paginate(selected.with_entities(RunTable.id, RunTable.run_name)):
             yield r.run_name
 
-    def get_num_runs(self, campaign=None, sampler=None, status=None, not_status=None):
+    @_operation
+    def get_num_runs(self, campaign=None, sampler=None, status=None, not_status=None,
+                     app_id=None, where=None):
         """
         Returns the number of runs matching the filtering criteria.
 
@@ -779,6 +1747,10 @@ class CampaignDB(BaseCampaignDB):
             Status string to filter for.
         not_status: enum(Status) or None
             Exclude runs with this status string
+        app_id: int or None
+            App id to filter for.
+        where: list of tuple or None
+            Conditions `(param, op, value)` on the run parameters, see `runs`.
 
         Returns
         -------
@@ -791,10 +1763,71 @@ class CampaignDB(BaseCampaignDB):
             campaign=campaign,
             sampler=sampler,
             status=status,
-            not_status=not_status)
+            not_status=not_status,
+            app_id=app_id,
+            where=where)
 
         return selected.count()
 
+    def status_counts(self, campaign=None, sampler=None, app_id=None, group_by=()):
+        """
+        Count the runs with each status, using a single GROUP BY query.
+
+        Parameters
+        ----------
+        campaign: int or None
+            Campaign id to filter for.
+        sampler: int or None
+            Sampler id to filter for.
+        app_id: int or None
+            App id to filter for.
+        group_by: tuple of str
+            Also group the counts by 'app' and/or 'sampler' id.
+
+        Returns
+        -------
+        dict:
+            Number of runs (including zeros) for every Status. When grouping,
+            a dict of these keyed by app id, sampler id or an (app id,
+            sampler id) tuple, in the order given in `group_by`.
+        """
+
+        group_columns = {'app': RunTable.app, 'sampler': RunTable.sample}
+        for group in group_by:
+            if group not in group_columns:
+                msg = (f"Cannot group run status counts by '{group}', options are "
+                       f"{list(group_columns)}")
+                logger.error(msg)
+                raise RuntimeError(msg)
+        groups = [group_columns[group] for group in group_by]
+
+        query = select(*groups, RunTable.status, func.count()).group_by(
+            *groups, RunTable.status)
+        if campaign:
+            query = query.where(RunTable.campaign == campaign)
+        if sampler:
+            query = query.where(RunTable.sample == sampler)
+        if app_id:
+            query = query.where(RunTable.app == app_id)
+
+        # Use a short lived connection, so no read transaction is left open
+        # on the database (this is meant to be polled while runs progress)
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).all()
+
+        counts = {}
+        for row in rows:
+            key = tuple(row[:len(groups)])
+            if len(key) == 1:
+                key = key[0]
+            if key not in counts:
+                counts[key] = {status: 0 for status in constants.Status}
+            counts[key][constants.Status(row[-2])] = row[-1]
+        if not groups:
+            return counts.get((), {status: 0 for status in constants.Status})
+        return counts
+
+    @_operation
     def runs_dir(self, campaign_name=None):
         """
         Get the directory used to store run information for `campaign_name`.
@@ -812,6 +1845,11 @@ class CampaignDB(BaseCampaignDB):
 
         return self._get_campaign_info(campaign_name=campaign_name).runs_dir
 
+    def _collation(self, app_id):
+        """Return the store holding the collated results of app `app_id`."""
+        return AVAILABLE_COLLATION_STORES[self.collation_store](self, app_id)
+
+    @_operation
     def append_collation_dataframe(self, df, app_id):
         """
         Append the data in dataframe 'df' to that already collated in the database
@@ -831,13 +1869,13 @@ class CampaignDB(BaseCampaignDB):
 
         if df.size == 0:
             logging.warning(
-                f"Attempt to append empty dataframe to SQL collation table for app_id {app_id}.")
+                f"Attempt to append empty dataframe to collation store for app_id {app_id}.")
             return
 
-        tablename = 'COLLATION_APP' + str(app_id)
-        df.to_sql(tablename, self.engine, if_exists='append')
+        self._collation(app_id).append(df)
+        self._commit()
 
-    def get_collation_dataframe(self, app_id):
+    def get_collation_dataframe(self, app_id, columns=None, filters=None):
         """
         Returns a dataframe containing the full collated results stored in this database
         for the specified app.
@@ -848,6 +1886,12 @@ class CampaignDB(BaseCampaignDB):
         app_id: int
             The id of the app in the sql database. Used to determine which collation
             table is appended to.
+        columns: list or None
+            Only return these columns (all if None). The name of a vector
+            quantity selects all of its MultiIndex sub-columns.
+        filters: list of tuple or None
+            Only return rows for which all `(column, op, value)` conditions hold,
+            e.g. `[('run_id', 'in', ['Run_1', 'Run_2'])]`.
 
         Returns
         -------
@@ -855,21 +1899,52 @@ class CampaignDB(BaseCampaignDB):
             The dataframe with all contents that were appended to this database
         """
 
-        tablename = 'COLLATION_APP' + str(app_id)
-        if tablename in self.engine.table_names():
-            query = "select * from " + tablename
-            df = pd.read_sql_query(query, self.engine.execution_options(sqlite_raw_colnames=True))
-            columns, multi = multi_index_tuple_parser(df.columns.values[1:])
-            if multi:
-                df = pd.DataFrame(df.values[:, 1:],
-                                  columns=pd.MultiIndex.from_tuples(columns))
-            return df
-        else:
-            return None
+        return self._collation(app_id).get(columns=columns, filters=filters)
 
+    @_operation
     def clear_collation(self, app_id):
-        tablename = 'COLLATION_APP' + str(app_id)
+        self._collation(app_id).clear()
+        self._commit()
 
-        if tablename in self.engine.table_names():
-            sqlcmd = text(f'DROP TABLE {tablename};')
-            self.engine.execute(sqlcmd)
+    @_operation
+    def collation_parts(self, app_id):
+        """
+        Return the names of the files recorded as parts of the collated
+        results of an app, in the order they were recorded.
+
+        Parameters
+        ----------
+        app_id: int
+            The id of the app.
+
+        Returns
+        -------
+        list of str:
+            File names of the parts.
+        """
+        query = self.session.query(CollationPartTable.filename).filter_by(
+            app=app_id).order_by(CollationPartTable.id)
+        return [filename for filename, in query]
+
+    @_operation
+    def record_collation_part(self, app_id, filename):
+        """
+        Record a file as a part of the collated results of an app. Files not
+        recorded (e.g. written by a collation that was interrupted before it
+        could record them) are not part of the results.
+
+        Parameters
+        ----------
+        app_id: int
+            The id of the app.
+        filename: str
+            Name of the file.
+        """
+        self.session.add(CollationPartTable(app=app_id, filename=filename))
+        self._commit()
+
+    @_operation
+    def clear_collation_parts(self, app_id):
+        """Forget the parts recorded for the collated results of an app."""
+        self.session.query(CollationPartTable).filter_by(app=app_id).delete()
+        self._commit()
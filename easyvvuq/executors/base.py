@@ -0,0 +1,101 @@
+"""Provides the base class for executors, which apply a function to many
+items (e.g. runs) serially or in parallel.
+
+Executors let the parallel strategy of a campaign be chosen by passing one
+to `Campaign` (or to `populate_runs_dir`, `apply_for_each_run_dir` or
+`collate`), rather than by the class of the campaign.
+
+Attributes
+----------
+AVAILABLE_EXECUTORS : dict
+    Registers all executors, by name.
+"""
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+# Dict to store all registered executors (any class which extends
+# BaseExecutor is automatically registered)
+AVAILABLE_EXECUTORS = {}
+
+
+class BaseExecutor:
+    """Baseclass for all EasyVVUQ executors.
+
+    Executors can be used as context managers, which shut them down on
+    exit.
+
+    Attributes
+    ----------
+    executor_name : str
+        Name of the executor.
+    """
+
+    def __init_subclass__(cls, executor_name, **kwargs):
+        """
+        Catch any new executors and add them to the dict of available
+        executors.
+
+        Parameters
+        ----------
+        executor_name : str
+            Name of the executor represented by the class.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.executor_name = executor_name
+        AVAILABLE_EXECUTORS[executor_name] = cls
+
+    @property
+    def n_workers(self):
+        """Number of items processed at the same time."""
+        raise NotImplementedError
+
+    def map(self, fn, items):
+        """
+        Apply `fn` to each of `items`.
+
+        Parameters
+        ----------
+        fn : callable
+            Function taking a single item. Executors running it in other
+            processes need it (and the items) to be picklable.
+        items : list
+            The items.
+
+        Returns
+        -------
+        list:
+            The result for each item, in order.
+        """
+        raise NotImplementedError
+
+    def shutdown(self):
+        """
+        Release the resources (e.g. pools of workers) held by the executor.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
@@ -0,0 +1,85 @@
+"""Provides an executor running on a Dask cluster.
+"""
+import logging
+from .base import BaseExecutor
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+logger = logging.getLogger(__name__)
+
+
+class DaskExecutor(BaseExecutor, executor_name='dask'):
+    """Applies the function on the workers of a Dask cluster, one task per
+    item. Without a `client`, a `LocalCluster` is started when first used
+    (and closed on shutdown). The function and the items must be picklable.
+
+    Parameters
+    ----------
+    client : dask.distributed.Client or None
+        Client of the cluster to use.
+    n_workers : int or None
+        Number of workers of the local cluster, Dask's default if None.
+    threads_per_worker : int
+        Number of threads per worker of the local cluster.
+    processes : bool
+        Run the workers of the local cluster in processes (rather than in
+        threads of this process).
+    """
+
+    def __init__(self, client=None, n_workers=None, threads_per_worker=1, processes=True):
+        self.n_local_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+        self.processes = processes
+        self._client = client
+        self._cluster = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                from dask.distributed import Client, LocalCluster
+            except ImportError:
+                msg = "The 'dask' executor requires dask.distributed to be installed"
+                logger.error(msg)
+                raise RuntimeError(msg)
+            self._cluster = LocalCluster(n_workers=self.n_local_workers,
+                                         threads_per_worker=self.threads_per_worker,
+                                         processes=self.processes, dashboard_address=None)
+            self._client = Client(self._cluster)
+        return self._client
+
+    @property
+    def n_workers(self):
+        return max(1, sum(self.client.nthreads().values()))
+
+    def map(self, fn, items):
+        client = self.client
+        return client.gather(client.map(fn, list(items), pure=False))
+
+    def shutdown(self):
+        # Only close the client and cluster if they were started here
+        if self._cluster is not None:
+            self._client.close()
+            self._cluster.close()
+            self._client = None
+            self._cluster = None
@@ -0,0 +1,101 @@
+"""Provides executors running on the local machine: serially, or in a pool
+of threads or processes.
+"""
+import os
+import concurrent.futures
+from .base import BaseExecutor
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+
+class SerialExecutor(BaseExecutor, executor_name='serial'):
+    """Applies the function to one item after the other, in this thread."""
+
+    @property
+    def n_workers(self):
+        return 1
+
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+
+class ThreadExecutor(BaseExecutor, executor_name='thread'):
+    """Applies the function in a pool of threads. Suits functions that spend
+    their time outside Python (e.g. waiting for a simulation to finish or
+    for file I/O) and need not be picklable.
+
+    Parameters
+    ----------
+    max_workers : int or None
+        Number of threads, one per core if None.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count()
+        self._pool = None
+
+    @property
+    def n_workers(self):
+        return self.max_workers
+
+    def map(self, fn, items):
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        return list(self._pool.map(fn, items))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class ProcessExecutor(BaseExecutor, executor_name='process'):
+    """Applies the function in a pool of processes, sending the items in
+    chunks (of about a quarter of the items per process). Suits CPU bound
+    Python functions. The function and the items must be picklable.
+
+    Parameters
+    ----------
+    max_workers : int or None
+        Number of processes, one per core if None.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count()
+        self._pool = None
+
+    @property
+    def n_workers(self):
+        return self.max_workers
+
+    def map(self, fn, items):
+        items = list(items)
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        chunksize = max(1, len(items) // (4 * self.max_workers))
+        return list(self._pool.map(fn, items, chunksize=chunksize))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
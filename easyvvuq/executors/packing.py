@@ -0,0 +1,66 @@
+"""Provides the choice of how many runs to pack into each task sent to an
+executor.
+
+Sending each run as a task of its own costs scheduling overhead (and for
+Dask, a round trip to the scheduler) per run, which matters for models that
+take a few seconds. Packing K runs into a task spreads that cost over K
+runs, at the price of coarser load balancing.
+"""
+import math
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+# Time (in seconds) each task of packed runs should take
+PACK_TARGET_SECONDS = 30.0
+
+
+def choose_pack_size(n_runs, n_workers, wall_time=None, target_seconds=PACK_TARGET_SECONDS,
+                     tasks_per_worker=4):
+    """
+    Choose the number of runs per task, so that a task takes about
+    `target_seconds`, but each worker still gets `tasks_per_worker` tasks
+    to balance the load.
+
+    Parameters
+    ----------
+    n_runs : int
+        Number of runs to be split into tasks.
+    n_workers : int
+        Number of tasks the executor runs at the same time.
+    wall_time : float or None
+        Observed wall time of a run. If None, only the load balancing
+        bound is used.
+    target_seconds : float
+        Wall time aimed for per task.
+    tasks_per_worker : int
+        Minimum number of tasks per worker, where there are enough runs.
+
+    Returns
+    -------
+    int:
+        Number of runs per task.
+    """
+    pack_size = max(1, math.ceil(n_runs / (tasks_per_worker * max(1, n_workers))))
+    if wall_time is not None and wall_time > 0:
+        pack_size = min(pack_size, max(1, int(target_seconds // wall_time)))
+    return pack_size
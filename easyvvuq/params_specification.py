@@ -2,6 +2,7 @@
 
 """
 import logging
+import numbers
 import cerberus
 import json
 import numpy
@@ -79,6 +80,9 @@ class ParamsSpecification:
         # Create a validator for the schema defined by params_dict
         self.cerberus_validator = EasyVVUQValidator(self.params_dict)
 
+        # Compiled form of the schema, used to check blocks of runs at once
+        self._compiled_rules = self._compile_rules()
+
     def process_run(self, new_run, verify=True):
 
         # If necessary parameter names are missing, fill them in from the
@@ -110,6 +114,134 @@ class ParamsSpecification:
 
         return new_run
 
+    def process_runs(self, new_runs, verify=True):
+        """
+        Fill in default values for, and optionally verify, a block of runs.
+        Equivalent to calling `process_run` on each run, but the checks are
+        done a parameter at a time across the whole block using NumPy. Only
+        runs that fail these checks are passed to cerberus, which produces
+        the error message.
+
+        Parameters
+        ----------
+        new_runs : list of dicts
+            Parameter values for each run. The dicts are updated in place.
+        verify : bool
+            Should the runs be verified against the parameter specification?
+
+        Returns
+        -------
+        list of dicts
+            The completed runs.
+        """
+
+        # Runs drawn from the same sampler nearly always share the same keys,
+        # so work out the missing (and unknown) parameters once per key set
+        key_sets = {}
+        unknown_params = []
+        for new_run in new_runs:
+            keys = tuple(new_run.keys())
+            if keys not in key_sets:
+                missing = {param: param_def["default"]
+                           for param, param_def in self.params_dict.items()
+                           if param not in new_run}
+                unknown = any(key not in self.params_dict for key in keys)
+                key_sets[keys] = (missing, unknown)
+            missing, unknown = key_sets[keys]
+            if missing:
+                new_run.update(missing)
+            unknown_params.append(unknown)
+
+        if not verify or len(new_runs) == 0:
+            return new_runs
+
+        failed = numpy.array(unknown_params, dtype=bool)
+
+        for param, rules in self._compiled_rules.items():
+            values = [new_run[param] for new_run in new_runs]
+            if rules is None:
+                # Schema uses rules we can't check in bulk, leave it to cerberus
+                failed[:] = True
+                break
+            failed |= self._check_values(values, rules)
+
+        # Use cerberus on the failed runs to confirm the failure and report it
+        for i in numpy.nonzero(failed)[0]:
+            self.process_run(new_runs[i], verify=True)
+
+        return new_runs
+
+    def _compile_rules(self):
+        """
+        Translate the schema into the checks done by `process_runs`. The
+        value for a parameter is None if its schema uses rules other than
+        type, min, max and allowed.
+        """
+        supported = {'type', 'min', 'max', 'allowed', 'default'}
+        types_mapping = self.cerberus_validator.types_mapping
+        compiled = {}
+        for param, param_def in self.params_dict.items():
+            type_names = param_def.get('type', [])
+            if isinstance(type_names, str):
+                type_names = [type_names]
+            if (not set(param_def.keys()) <= supported or
+                    any(name not in types_mapping for name in type_names)):
+                compiled[param] = None
+                continue
+            compiled[param] = {
+                'types': [types_mapping[name] for name in type_names],
+                'min': param_def.get('min'),
+                'max': param_def.get('max'),
+                'allowed': param_def.get('allowed')
+            }
+        return compiled
+
+    @staticmethod
+    def _check_values(values, rules):
+        """
+        Check the values of one parameter for a block of runs. Returns a
+        boolean array which is True for the values that (may) fail.
+        """
+
+        def type_ok(value_type):
+            # Cerberus rejects None unless the rule is 'nullable', which is
+            # not compiled
+            if value_type is type(None):
+                return False
+            if not rules['types']:
+                return True
+            return any(issubclass(value_type, definition.included_types) and
+                       not issubclass(value_type, definition.excluded_types)
+                       for definition in rules['types'])
+
+        failed = numpy.zeros(len(values), dtype=bool)
+
+        value_types = set(map(type, values))
+        bad_types = {value_type for value_type in value_types if not type_ok(value_type)}
+        if bad_types:
+            failed |= [type(value) in bad_types for value in values]
+
+        bounds = [bound for bound in (rules['min'], rules['max']) if bound is not None]
+        if bounds:
+            if all(isinstance(bound, numbers.Real) for bound in bounds) and \
+                    all(issubclass(value_type, numbers.Real) for value_type in value_types):
+                array = numpy.asarray(values, dtype=float)
+                if rules['min'] is not None:
+                    failed |= array < rules['min']
+                if rules['max'] is not None:
+                    failed |= array > rules['max']
+            else:
+                failed[:] = True
+
+        if rules['allowed'] is not None:
+            try:
+                allowed = set(rules['allowed'])
+                failed |= [value not in allowed for value in values]
+            except TypeError:
+                failed[:] = True
+
+        return failed
+
     def serialize(self):
         return json.dumps(self.params_dict)
 
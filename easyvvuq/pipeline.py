@@ -0,0 +1,227 @@
+"""Provides a scheduler that streams runs through encoding, execution and
+decoding.
+
+`Campaign.populate_runs_dir`, `apply_for_each_run_dir` and `collate` each
+process all the runs before the next one starts. The `Pipeline` instead
+passes every run on to the next stage as soon as it has been through the
+previous one, with a separately sized pool of threads for each stage, so the
+first results are available after seconds and file I/O overlaps with
+computation.
+"""
+
+import os
+import time
+import queue
+import logging
+import concurrent.futures
+from easyvvuq import OutputType
+from easyvvuq.constants import Status
+from easyvvuq.actions import ExecutionResult
+from easyvvuq.collate.accumulator import ColumnAccumulator
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+logger = logging.getLogger(__name__)
+
+
+class Pipeline:
+    """
+    Streams the NEW runs of the campaign's active app through encoding,
+    `action` (e.g. `ExecuteLocal`) and decoding. Each stage has its own pool
+    of threads, so the encoder, action and decoder must be thread safe.
+
+    Results are recorded in the campaign database by the calling thread,
+    every `flush_runs` runs or `flush_seconds` seconds: decoded output is
+    appended to the collation store and the runs marked COLLATED, runs whose
+    output is incomplete are marked ENCODED, and runs whose execution fails
+    (or whose processing raises an exception) are marked FAILED.
+
+    Parameters
+    ----------
+    campaign : :obj:`easyvvuq.campaign.Campaign`
+        Campaign whose runs are processed.
+    action : :obj:`easyvvuq.actions.BaseAction` or None
+        Action applied to each run directory after encoding.
+    encode_workers : int
+        Number of runs encoded at the same time.
+    execute_workers : int or None
+        Number of runs executed at the same time, one per core if None.
+    decode_workers : int
+        Number of runs decoded at the same time.
+    flush_runs : int
+        Maximum number of finished runs between updates of the database.
+    flush_seconds : float
+        Maximum time between updates of the database.
+    max_in_flight : int or None
+        Maximum number of runs in the pipeline at a time, by default twice
+        the total number of workers.
+    """
+
+    def __init__(self, campaign, action=None, encode_workers=1, execute_workers=None,
+                 decode_workers=1, flush_runs=1000, flush_seconds=5.0, max_in_flight=None):
+        self.campaign = campaign
+        self.action = action
+        self.encode_workers = encode_workers
+        self.execute_workers = execute_workers or os.cpu_count()
+        self.decode_workers = decode_workers
+        self.flush_runs = flush_runs
+        self.flush_seconds = flush_seconds
+        if max_in_flight is None:
+            max_in_flight = 2 * (self.encode_workers + self.execute_workers +
+                                 self.decode_workers)
+        self.max_in_flight = max_in_flight
+
+        self.encoder = campaign._active_app_encoder
+        self.decoder = campaign._active_app_decoder
+        self.collater = campaign._active_app_collater
+        self.app_id = campaign._active_app['id']
+        if self.decoder is None:
+            msg = 'The app has no decoder, so its runs cannot be collated in a pipeline'
+            logger.error(msg)
+            raise RuntimeError(msg)
+        if self.decoder.output_type != OutputType.SAMPLE:
+            msg = 'Can only decode sample type data'
+            logger.error(msg)
+            raise RuntimeError(msg)
+        if not hasattr(self.collater, 'decode_run'):
+            msg = (f"Collater {self.collater.element_name()} does not decode single runs, "
+                   f"so cannot be used in a pipeline")
+            logger.error(msg)
+            raise RuntimeError(msg)
+
+    def run(self):
+        """
+        Process all NEW runs of the campaign's active app.
+
+        Returns
+        -------
+        dict:
+            The number of runs set to each Status.
+        """
+        self._finished = queue.Queue()
+        self._stopping = False
+        self._counts = {status: 0 for status in Status}
+        self._clear()
+        runs = self.campaign.campaign_db.runs(status=Status.NEW, app_id=self.app_id)
+        pools = [concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+                 for workers in (self.encode_workers, self.execute_workers,
+                                 self.decode_workers)]
+        self._encode_pool, self._execute_pool, self._decode_pool = pools
+        in_flight = 0
+        exhausted = False
+        last_flush = time.monotonic()
+        try:
+            while True:
+                while not exhausted and in_flight < self.max_in_flight:
+                    run = next(runs, None)
+                    if run is None:
+                        exhausted = True
+                        break
+                    self._submit(self._encode_pool, self._encode, *run)
+                    in_flight += 1
+                if in_flight == 0:
+                    break
+                timeout = max(0.0, last_flush + self.flush_seconds - time.monotonic())
+                try:
+                    self._record(*self._finished.get(timeout=timeout))
+                    in_flight -= 1
+                except queue.Empty:
+                    pass
+                if (len(self._statuses) >= self.flush_runs or
+                        time.monotonic() - last_flush >= self.flush_seconds):
+                    self._flush()
+                    last_flush = time.monotonic()
+        finally:
+            # Finish the stages in progress (so no run is left half done),
+            # runs waiting for a stage are skipped and stay NEW
+            self._stopping = True
+            for pool in pools:
+                pool.shutdown(wait=True)
+            while not self._finished.empty():
+                self._record(*self._finished.get())
+            self._flush()
+        return self._counts
+
+    def _submit(self, pool, stage, run_id, run_info, *args):
+        """Submit `stage` for a run to `pool`, reporting the run as FAILED if
+        it raises. Once the pipeline is stopping, stages are skipped."""
+        def run_stage():
+            if self._stopping:
+                return
+            try:
+                stage(run_id, run_info, *args)
+            except Exception as e:
+                logger.error(f"Processing run {run_id} failed: {e!r}")
+                self._finished.put((run_id, Status.FAILED, None, None))
+        pool.submit(run_stage)
+
+    def _encode(self, run_id, run_info):
+        os.makedirs(run_info['run_dir'], exist_ok=True)
+        if self.encoder is not None:
+            self.encoder.encode(params=run_info['params'], target_dir=run_info['run_dir'])
+        self._submit(self._execute_pool, self._execute, run_id, run_info)
+
+    def _execute(self, run_id, run_info):
+        execution = None
+        if self.action is not None:
+            execution = self.action.act_on_dir(run_info['run_dir'])
+            if not isinstance(execution, ExecutionResult):
+                execution = None
+            elif execution.failed:
+                self._finished.put((run_id, Status.FAILED, execution, None))
+                return
+        self._submit(self._decode_pool, self._decode, run_id, run_info, execution)
+
+    def _decode(self, run_id, run_info, execution):
+        run_data = self.collater.decode_run(self.decoder, run_id, run_info)
+        status = Status.ENCODED if run_data is None else Status.COLLATED
+        self._finished.put((run_id, status, execution, run_data))
+
+    def _record(self, run_id, status, execution, run_data):
+        """Keep the outcome of a finished run until the next flush."""
+        self._statuses[run_id] = status
+        if execution is not None:
+            self._executions[run_id] = execution
+        if run_data is not None:
+            self._new_data.append(run_data)
+
+    def _flush(self):
+        """Record the outcome of the runs finished since the last flush."""
+        db = self.campaign.campaign_db
+        # In one transaction, so collated runs are never left ENCODED
+        with db.transaction():
+            if self._new_data.n_rows > 0:
+                self.collater.append_data(
+                    self.campaign, self._new_data.to_dataframe(), self.app_id)
+            db.record_executions(self._executions)
+            for status in set(self._statuses.values()):
+                run_ids = [run_id for run_id, run_status in self._statuses.items()
+                           if run_status == status]
+                db.set_run_statuses(run_ids, status)
+                self._counts[status] += len(run_ids)
+        self._clear()
+
+    def _clear(self):
+        self._statuses = {}
+        self._executions = {}
+        self._new_data = ColumnAccumulator()
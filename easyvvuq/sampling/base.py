@@ -1,7 +1,9 @@
 from easyvvuq.base_element import BaseElement
 import logging
+import itertools
 import json
 import jsonpickle
+import numpy as np
 
 __copyright__ = """
 
@@ -92,6 +94,39 @@ class BaseSamplingElement(BaseElement):
         """
         raise NotImplementedError
 
+    def sample_block(self, n):
+        """
+        Draw up to `n` samples at once, as a single array rather than one
+        dict per sample. Samplers that can generate their samples in a
+        vectorized way should override this; the default implementation
+        simply iterates over the sampler.
+
+        Only samplers whose parameters are all scalars can be drawn as a
+        block.
+
+        Parameters
+        ----------
+        n : int
+            Maximum number of samples to draw.
+
+        Returns
+        -------
+        numpy.ndarray, list of str
+            Array of shape (m, n_params) with m <= n (fewer than `n` only if a
+            finite sampler runs out of samples) and the names of the
+            parameters corresponding to its columns.
+        """
+        runs = list(itertools.islice(self, n))
+        if len(runs) == 0:
+            return np.empty((0, 0)), []
+        names = list(runs[0].keys())
+        block = np.array([[run[name] for name in names] for run in runs])
+        if block.ndim != 2:
+            msg = f"Sampler '{self.element_name()}' has non-scalar parameters"
+            logging.error(msg)
+            raise RuntimeError(msg)
+        return block, names
+
     @staticmethod
     def deserialize(serialized_sampler):
         """Deserialize a sampler element.
@@ -1,4 +1,5 @@
 import logging
+import numpy as np
 import chaospy as cp
 from .base import BaseSamplingElement, Vary
 
@@ -194,6 +195,15 @@ class PCESampler(BaseSamplingElement, sampler_name="PCE_sampler"):
         else:
             raise StopIteration
 
+    def sample_block(self, n):
+        if any(size != 1 for size in self.params_size):
+            msg = "PCESampler can only draw sample blocks for scalar parameters"
+            logging.error(msg)
+            raise RuntimeError(msg)
+        block = np.column_stack(self._nodes)[self.count:self.count + n]
+        self.count += len(block)
+        return block, list(self.vary.get_keys())
+
     def get_restart_dict(self):
         return {"vary": self.vary.serialize(),
                 "count": self.count,
@@ -67,6 +67,7 @@ class QMCSampler(BaseSamplingElement, sampler_name="QMC_sampler"):
             raise Exception(msg)
 
         self.vary = Vary(vary)
+        self.n_mc_samples = n_mc_samples
 
         # List of the probability distributions of uncertain parameters
         params_distribution = list(vary.values())
@@ -96,8 +97,8 @@ class QMCSampler(BaseSamplingElement, sampler_name="QMC_sampler"):
 
         # Fast forward to specified count, if possible
         self.count = 0
-        if self.count >= self.n_total_samples:
-            msg = (f"Attempt to start sampler fastforwarded to count {self.count}, "
+        if count >= self._n_samples:
+            msg = (f"Attempt to start sampler fastforwarded to count {count}, "
                    f"but sampler only has {self._n_samples} samples, therefore"
                    f"this sampler will not provide any more samples.")
             logging.warning(msg)
@@ -129,7 +130,7 @@ class QMCSampler(BaseSamplingElement, sampler_name="QMC_sampler"):
         return True
 
     def __next__(self):
-        if self.count < self.n_total_samples:
+        if self.count < self._n_samples:
             run_dict = {}
             i_par = 0
             for param_name in self.vary.get_keys():
@@ -140,6 +141,11 @@ class QMCSampler(BaseSamplingElement, sampler_name="QMC_sampler"):
         else:
             raise StopIteration
 
+    def sample_block(self, n):
+        block = self._samples.T[self.count:self.count + n]
+        self.count += len(block)
+        return block, list(self.vary.get_keys())
+
     def get_restart_dict(self):
         return {"vary": self.vary.serialize(),
                 "count": self.count,
@@ -10,37 +10,153 @@ implemented:
 https://en.wikipedia.org/wiki/Latin_hypercube_sampling
 https://en.wikipedia.org/wiki/Halton_sequence
 
+Both generate their points jointly across all the varying parameters (in the
+unit hypercube, mapped through the inverse CDFs of the distributions) and
+serve them by index, so a restarted sampler continues the same design.
 """
 
-
+import logging
 from .random import RandomSampler
 import numpy as np
 import chaospy as cp
 
+# Number of Halton points generated at a time when iterating over the sampler
+HALTON_BLOCK_SIZE = 1000
+
 
 class LHCSampler(RandomSampler, sampler_name='lhc_sampler'):
-    def __next__(self):
-        if self.is_finite():
-            if self.count >= self.max_num:
-                raise StopIteration
+    """
+    Latin hypercube sampler. The full `max_num` point design is generated
+    when the sampler is created, so the sampler must be finite.
 
-        run_dict = {}
-        for param_name, dist in self.vary.get_items():
-            run_dict[param_name] = dist.sample(1, rule='L')[0]
+    Parameters
+    ----------
+    vary : dict
+        keys = parameters to be sampled, values = distributions.
+    count : int, optional
+        Number of samples already drawn from the design (for restarts).
+    max_num : int
+        Number of points in the design.
+    seed : int or None, optional
+        Seed used to generate the design. If None a random seed is chosen
+        and stored with the sampler, so that a restarted sampler will
+        continue the same design.
+    """
 
+    def __init__(self, vary=None, count=0, max_num=0, seed=None):
+        super().__init__(vary=vary, count=count, max_num=max_num)
+        if max_num <= 0:
+            msg = "LHCSampler needs the number of points in the design (max_num > 0)"
+            logging.error(msg)
+            raise RuntimeError(msg)
+        if seed is None:
+            seed = int(np.random.randint(2 ** 31 - 1))
+        self.seed = seed
+
+        rng = np.random.RandomState(self.seed)
+        n_params = len(self.vary.vary_dict)
+        unit = np.empty((n_params, max_num))
+        for i in range(n_params):
+            unit[i] = (rng.permutation(max_num) + rng.uniform(size=max_num)) / max_num
+        self._design = _to_distribution(self.vary, unit)
+
+    def __next__(self):
+        if self.count >= self.max_num:
+            raise StopIteration
+
+        run_dict = dict(zip(self.vary.get_keys(), self._design[self.count]))
         self.count += 1
         return run_dict
 
+    def sample_block(self, n):
+        block = self._design[self.count:self.count + n]
+        self.count += len(block)
+        return block, list(self.vary.get_keys())
+
+    def get_restart_dict(self):
+        restart_dict = super().get_restart_dict()
+        restart_dict["seed"] = self.seed
+        return restart_dict
+
 
 class HaltonSampler(RandomSampler, sampler_name='halton_sampler'):
+    """
+    Halton sequence sampler. Points are generated in blocks as they are
+    needed, so the sampler may be infinite (max_num = 0).
+    """
+
+    def __init__(self, vary=None, count=0, max_num=0):
+        super().__init__(vary=vary, count=count, max_num=max_num)
+        self._block_start = 0
+        self._block = np.empty((0, len(self.vary.vary_dict)))
+
     def __next__(self):
         if self.is_finite():
             if self.count >= self.max_num:
                 raise StopIteration
 
-        run_dict = {}
-        for param_name, dist in self.vary.get_items():
-            run_dict[param_name] = dist.sample(1, rule='H')[0]
+        offset = self.count - self._block_start
+        if offset < 0 or offset >= len(self._block):
+            self._block_start = self.count
+            self._block = self._points(self.count, HALTON_BLOCK_SIZE)
+            offset = 0
 
+        run_dict = dict(zip(self.vary.get_keys(), self._block[offset]))
         self.count += 1
         return run_dict
+
+    def sample_block(self, n):
+        if self.is_finite():
+            n = max(min(n, self.max_num - self.count), 0)
+        block = self._points(self.count, n)
+        self.count += n
+        return block, list(self.vary.get_keys())
+
+    def _points(self, start, n):
+        """
+        Points `start` to `start + n` of the Halton sequence, as an array of
+        shape (n, n_params). The zeroth point (the origin) is skipped.
+        """
+        indices = np.arange(start + 1, start + n + 1)
+        n_params = len(self.vary.vary_dict)
+        unit = np.array([_radical_inverse(indices, base) for base in _primes(n_params)])
+        return _to_distribution(self.vary, unit.reshape(n_params, n))
+
+
+def _to_distribution(vary, unit):
+    """
+    Map points in the unit hypercube, an array of shape (n_params, n), to the
+    distributions in `vary`. Returns an array of shape (n, n_params).
+    """
+    n_params, n = unit.shape
+    if n == 0:
+        return np.empty((0, n_params))
+    joint = cp.J(*vary.get_values())
+    return np.asarray(joint.inv(unit)).reshape(n_params, n).T
+
+
+def _radical_inverse(indices, base):
+    """
+    Van der Corput radical inverse of each of `indices` in the given `base`.
+    """
+    indices = np.array(indices, dtype=np.int64)
+    result = np.zeros(len(indices))
+    factor = 1.0 / base
+    while np.any(indices > 0):
+        result += factor * (indices % base)
+        indices //= base
+        factor /= base
+    return result
+
+
+def _primes(n):
+    """
+    The first `n` prime numbers.
+    """
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p != 0 for p in primes):
+            primes.append(candidate)
+        candidate += 1
+    return primes
@@ -1,3 +1,5 @@
+import numpy as np
+import chaospy as cp
 from .base import BaseSamplingElement, Vary
 
 __copyright__ = """
@@ -66,6 +68,23 @@ class RandomSampler(BaseSamplingElement, sampler_name="random_sampler"):
         self.count += 1
         return run_dict
 
+    def sample_block(self, n):
+        if self.is_finite():
+            n = max(min(n, self.max_num - self.count), 0)
+        block = self._draw_block(n)
+        self.count += n
+        return block, list(self.vary.get_keys())
+
+    def _draw_block(self, n):
+        """
+        Draw `n` random samples jointly from all varying parameters, as an
+        array of shape (n, n_params).
+        """
+        if n == 0:
+            return np.empty((0, len(self.vary.vary_dict)))
+        joint = cp.J(*self.vary.get_values())
+        return np.asarray(joint.sample(n, rule='R')).reshape(-1, n).T
+
     def is_restartable(self):
         return True
 
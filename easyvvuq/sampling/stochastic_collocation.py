@@ -360,6 +360,11 @@ class SCSampler(BaseSamplingElement, sampler_name="sc_sampler"):
         else:
             raise StopIteration
 
+    def sample_block(self, n):
+        block = self.xi_d[self.count:self.count + n]
+        self.count += len(block)
+        return block, list(self.vary.get_keys())
+
     def is_restartable(self):
         return True
 
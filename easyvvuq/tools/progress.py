@@ -0,0 +1,115 @@
+"""Command line tool to watch the progress of a campaign.
+
+Polls the number of runs with each status (a single GROUP BY query on the
+campaign database) and prints one line per poll, e.g.
+
+    python3 -m easyvvuq.tools.progress campaign.db my_campaign --interval 10
+
+The database is only read, so it is not upgraded if its schema is out of
+date; open the campaign with EasyVVUQ first in that case.
+"""
+import sys
+import time
+import argparse
+from easyvvuq.constants import Status
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+# Statuses of runs that need no further processing
+FINISHED = (Status.COLLATED, Status.IGNORED, Status.FAILED)
+
+
+def format_progress(counts, previous=None, elapsed=None):
+    """
+    Describe the run status counts on one line.
+
+    Parameters
+    ----------
+    counts : dict
+        Number of runs with each `Status`, as returned by `Campaign.progress`.
+    previous : dict or None
+        Counts at the previous poll, used to work out the collation rate.
+    elapsed : float or None
+        Seconds since the previous poll.
+
+    Returns
+    -------
+    str
+    """
+    total = sum(counts.values())
+    finished = sum(counts[status] for status in FINISHED)
+    line = ' | '.join(f"{status.name} {count}" for status, count in counts.items())
+    line += f" | total {total}"
+    if total > 0:
+        line += f" | done {100.0 * finished / total:.1f}%"
+    if previous is not None and elapsed:
+        rate = (counts[Status.COLLATED] - previous[Status.COLLATED]) / elapsed
+        line += f" | {rate:.1f} runs/s"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python3 -m easyvvuq.tools.progress',
+        description="Print the number of runs of a campaign in each status.")
+    parser.add_argument('db_location',
+                        help="Path to the campaign database, or an SQLAlchemy URI")
+    parser.add_argument('campaign_name', help="Name of the campaign")
+    parser.add_argument('--app', default=None,
+                        help="Only count the runs of this app")
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help="Seconds between polls (default 5)")
+    parser.add_argument('--once', action='store_true',
+                        help="Print the counts once and exit")
+    args = parser.parse_args(argv)
+
+    from easyvvuq.db.sql import CampaignDB
+    location = args.db_location
+    if '://' not in location:
+        location = 'sqlite:///' + location
+    try:
+        db = CampaignDB(location=location, name=args.campaign_name, migrate=False)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    campaign_id = db.get_campaign_id(args.campaign_name)
+    app_id = db.app(args.app)['id'] if args.app is not None else None
+
+    previous = None
+    try:
+        while True:
+            counts = db.status_counts(campaign=campaign_id, app_id=app_id)
+            now = time.monotonic()
+            elapsed = now - previous[0] if previous is not None else None
+            print(time.strftime('%H:%M:%S'),
+                  format_progress(counts, previous and previous[1], elapsed), flush=True)
+            if args.once:
+                return 0
+            previous = (now, counts)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Command line tool running a worker that processes the runs of a campaign.
+
+The worker claims batches of NEW runs from the campaign database, encodes
+them, executes a command in each run directory and collates their output,
+until no runs are left. Start one per node to share the runs between nodes,
+e.g.
+
+    python3 -m easyvvuq.tools.run_worker campaign.db my_campaign \\
+        --run-cmd ./model.sh --concurrency 8 --wal
+"""
+import sys
+import logging
+import argparse
+import easyvvuq as uq
+
+__copyright__ = """
+
+    Copyright 2018 Robin A. Richardson, David W. Wright
+
+    This file is part of EasyVVUQ
+
+    EasyVVUQ is free software: you can redistribute it and/or modify
+    it under the terms of the Lesser GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    EasyVVUQ is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    Lesser GNU General Public License for more details.
+
+    You should have received a copy of the Lesser GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+__license__ = "LGPL"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python3 -m easyvvuq.tools.run_worker',
+        description="Process the runs of a campaign until none are left.")
+    parser.add_argument('db_location',
+                        help="Path to the campaign database, or an SQLAlchemy URI")
+    parser.add_argument('campaign_name', help="Name of the campaign")
+    parser.add_argument('--app', default=None,
+                        help="App whose runs are processed (default: the first app)")
+    parser.add_argument('--run-cmd', default=None,
+                        help="Command executed in each run directory")
+    parser.add_argument('--interpret', default=None,
+                        help="Interpreter used to execute the command")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Seconds after which the command of a run is killed")
+    parser.add_argument('--batch-size', type=int, default=10,
+                        help="Number of runs claimed at a time (default 10)")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="Number of runs processed at the same time (default 1)")
+    parser.add_argument('--lease', type=float, default=600.0,
+                        help="Seconds before runs of a dead worker are reclaimed (default 600)")
+    parser.add_argument('--no-decode', action='store_true',
+                        help="Leave the runs ENCODED for collation by the campaign")
+    parser.add_argument('--worker-id', default=None,
+                        help="Name of the worker (default: host name and process id)")
+    parser.add_argument('--wal', action='store_true',
+                        help="Use SQLite WAL journal mode, for many concurrent workers")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    location = args.db_location
+    if '://' not in location:
+        location = 'sqlite:///' + location
+    worker = uq.Worker(db_location=location, campaign_name=args.campaign_name,
+                       app_name=args.app, worker_id=args.worker_id,
+                       db_options={'journal_mode': 'WAL'} if args.wal else None)
+    action = None
+    if args.run_cmd is not None:
+        action = uq.actions.ExecuteLocal(args.run_cmd, interpret=args.interpret,
+                                         timeout=args.timeout)
+    counts = worker.serve(action=action, batch_size=args.batch_size,
+                          concurrency=args.concurrency, lease_seconds=args.lease,
+                          decode=not args.no_decode)
+    print(' | '.join(f"{status.name} {count}" for status, count in counts.items() if count))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
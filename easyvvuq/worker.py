@@ -1,6 +1,13 @@
 import os
+import time
+import signal
+import socket
 import logging
-from easyvvuq.constants import Status
+import threading
+import concurrent.futures
+from easyvvuq.constants import Status, OutputType
+from easyvvuq.collate.accumulator import ColumnAccumulator
+from easyvvuq.actions import ExecutionResult
 
 __copyright__ = """
 
@@ -27,12 +34,18 @@ __license__ = "LGPL"
 
 logger = logging.getLogger(__name__)
 
+# Returned for runs not started because the worker was asked to stop
+_NOT_STARTED = object()
+
 
 class Worker:
     """
     A Worker is a stripped down version of the Campaign, providing access to runs in the database,
     encoding etc. The purpose is, for example, to allow encoding/running/decoding of runs to take
     place in a separate process (script) from the main script.
+
+    Rather than being handed a list of run IDs, a pool of Workers can pull runs from the database
+    with `claim_runs`, each identified by its `worker_id` (by default host name and process id).
     """
 
     def __init__(
@@ -41,10 +54,15 @@ class Worker:
             db_location=None,
             campaign_name=None,
             app_name=None,
-            write_to_db=True
+            write_to_db=True,
+            db_options=None,
+            worker_id=None
     ):
 
         self.campaign_name = campaign_name
+        if worker_id is None:
+            worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.worker_id = worker_id
         self.db_type = db_type
         self.db_location = db_location
         self.write_to_db = write_to_db
@@ -59,11 +77,14 @@ class Worker:
             logger.critical(message)
             raise RuntimeError(message)
 
-        # Open session to the database
+        # Open session to the database, which uses the collation store recorded
+        # for the campaign, so decoded output is stored where the campaign reads it
         logger.info(f"Opening session with CampaignDB at {self.db_location}")
+        db_kwargs = {} if db_options is None else {'engine_options': db_options}
         self.campaign_db = CampaignDB(location=self.db_location,
                                       new_campaign=False,
-                                      name=self.campaign_name)
+                                      name=self.campaign_name,
+                                      **db_kwargs)
         self.campaign_id = self.campaign_db.get_campaign_id(self.campaign_name)
 
         # Resurrect the app encoder and decoder elements
@@ -84,25 +105,235 @@ class Worker:
         if active_encoder is None:
             logger.warning('No encoder set for this app. Creating directory structure only.')
 
-        # Loop through all runs in the run_id_list
+        # Fetch all the runs at once and record their directories in one
+        # transaction, rather than one query and commit per run
         runs_dir = self.campaign_db.runs_dir()
+        runs = self.campaign_db.get_runs(run_id_list)
+        run_dirs = {}
         for run_id in run_id_list:
 
-            run_data = self.campaign_db.run(run_id)
-
             # Make run directory
             target_dir = os.path.join(runs_dir, run_id)
             os.makedirs(target_dir)
-            self.campaign_db.set_dir_for_run(run_id, target_dir)
+            run_dirs[run_id] = target_dir
 
             if active_encoder is not None:
-                active_encoder.encode(params=run_data['params'],
+                active_encoder.encode(params=runs[run_id]['params'],
                                       target_dir=target_dir)
 
+        self.campaign_db.set_dirs_for_runs(run_dirs)
+
         # Update run statuses in db (if worker is authorized to write to DB)
         if self.write_to_db:
             self.campaign_db.set_run_statuses(run_id_list, Status.ENCODED)
 
+    def serve(self, action=None, batch_size=10, concurrency=1, lease_seconds=600,
+              decode=True):
+        """
+        Process runs until there are none left: repeatedly claim a batch of
+        NEW runs of this worker's app, encode them, execute `action` in their
+        directories and decode their output, `concurrency` runs at a time,
+        then record the results of the whole batch at once. Any number of
+        workers can serve the same campaign (e.g. one per node), each pulling
+        work as it becomes free.
+
+        Decoded runs are appended to the app's collation store and marked
+        COLLATED. Runs whose output is not complete (or all runs, if `decode`
+        is False) are marked ENCODED, for collation by the campaign. Runs
+        whose execution fails (see `ExecutionResult`), or whose processing
+        raises an exception, are logged and marked FAILED.
+        Leases are renewed while a batch is in progress, so runs are only
+        reclaimed by other workers if this one dies.
+
+        On SIGINT or SIGTERM (when called from the main thread) the worker
+        stops gracefully: runs in progress are finished and recorded, runs
+        not yet started are released for other workers.
+
+        Parameters
+        ----------
+        action : :obj:`easyvvuq.actions.BaseAction` or None
+            Action executed in each run directory, e.g. `ExecuteLocal`.
+        batch_size : int
+            Number of runs claimed at a time.
+        concurrency : int
+            Number of runs processed at the same time (in threads).
+        lease_seconds : float
+            Duration of the leases on claimed runs.
+        decode : bool
+            Decode and collate the output of the runs.
+
+        Returns
+        -------
+        dict:
+            The number of runs set to each Status.
+        """
+        if not self.write_to_db:
+            message = "A worker serving runs needs to write to the database"
+            logger.error(message)
+            raise RuntimeError(message)
+        if decode and self._active_app_decoder is None:
+            message = ("The app has no decoder, so its run output cannot be decoded. "
+                       "Serve with decode=False.")
+            logger.error(message)
+            raise RuntimeError(message)
+        if decode and self._active_app_decoder.output_type != OutputType.SAMPLE:
+            message = 'Can only decode sample type data'
+            logger.error(message)
+            raise RuntimeError(message)
+
+        self._stop_requested = False
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous_handlers[signum] = signal.signal(signum, self._request_stop)
+
+        counts = {status: 0 for status in Status}
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            while not self._stop_requested:
+                run_id_list = self.claim_runs(batch_size, lease_seconds)
+                if not run_id_list:
+                    break
+                statuses = self._serve_batch(run_id_list, action, pool, lease_seconds, decode)
+                for status in statuses.values():
+                    counts[status] += 1
+        finally:
+            pool.shutdown()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        return counts
+
+    def stop(self):
+        """
+        Ask `serve` to stop once the runs in progress are finished.
+        """
+        self._stop_requested = True
+
+    def _request_stop(self, signum, frame):
+        logger.info(f"Received signal {signum}, stopping after the runs in progress")
+        self.stop()
+
+    def _serve_batch(self, run_id_list, action, pool, lease_seconds, decode):
+        """Process the claimed runs in `run_id_list` and record the results,
+        returning the new Status of each run that was processed."""
+        runs = self.campaign_db.get_runs(run_id_list)
+        runs_dir = self.campaign_db.runs_dir()
+        futures = {}
+        for run_id in run_id_list:
+            run_info = runs[run_id]
+            run_info['run_dir'] = os.path.join(runs_dir, run_id)
+            futures[pool.submit(self._process_run, action, decode, run_id, run_info)] = run_id
+
+        statuses = {}
+        run_data = {}
+        executions = {}
+        pending = set(futures)
+        renewed = time.time()
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=lease_seconds / 3,
+                return_when=concurrent.futures.FIRST_COMPLETED)
+            if self._stop_requested:
+                for future in pending:
+                    future.cancel()
+            for future in done:
+                if future.cancelled():
+                    continue
+                run_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Processing run {run_id} failed: {e!r}")
+                    statuses[run_id] = Status.FAILED
+                    continue
+                if result is _NOT_STARTED:
+                    continue
+                execution, result = result
+                if isinstance(execution, ExecutionResult):
+                    executions[run_id] = execution
+                if run_id in executions and executions[run_id].failed:
+                    statuses[run_id] = Status.FAILED
+                elif result is None:
+                    statuses[run_id] = Status.ENCODED
+                else:
+                    run_data[run_id] = result
+                    statuses[run_id] = Status.COLLATED
+            if pending and time.time() - renewed > lease_seconds / 3:
+                self.renew_leases(lease_seconds, [futures[future] for future in pending])
+                renewed = time.time()
+
+        # Record the results of the whole batch, in one transaction so
+        # collated runs are never left claimed
+        with self.campaign_db.transaction():
+            self.campaign_db.set_dirs_for_runs(
+                {run_id: runs[run_id]['run_dir'] for run_id in statuses})
+            self.campaign_db.record_executions(executions)
+            if run_data:
+                new_data = ColumnAccumulator()
+                for run_id in run_id_list:
+                    if run_id in run_data:
+                        new_data.append(run_data[run_id])
+                self._active_app_collater.append_data(
+                    self, new_data.to_dataframe(), self._active_app['id'])
+            for status in set(statuses.values()):
+                self.release_runs([run_id for run_id in run_id_list
+                                   if statuses.get(run_id) == status], status=status)
+        unprocessed = [run_id for run_id in run_id_list if run_id not in statuses]
+        if unprocessed:
+            self.release_runs(unprocessed)
+        return statuses
+
+    def _process_run(self, action, decode, run_id, run_info):
+        """Encode, execute and (optionally) decode a single run, returning the
+        result of the action and the decoded output (or None)."""
+        if self._stop_requested:
+            return _NOT_STARTED
+        target_dir = run_info['run_dir']
+        # The directory exists if the run was reclaimed from a failed worker
+        os.makedirs(target_dir, exist_ok=True)
+        if self._active_app_encoder is not None:
+            self._active_app_encoder.encode(params=run_info['params'], target_dir=target_dir)
+        execution = None
+        if action is not None:
+            execution = action.act_on_dir(target_dir)
+            if isinstance(execution, ExecutionResult) and execution.failed:
+                return execution, None
+        if decode:
+            return execution, self._active_app_collater.decode_run(
+                self._active_app_decoder, run_id, run_info)
+        return execution, None
+
+    def claim_runs(self, n, lease_seconds=600, status=Status.NEW):
+        """
+        Claim up to `n` runs of this worker's app with the given `status`, so
+        that no other worker will process them while the lease lasts. Renew
+        the lease with `renew_leases` while processing takes long, and hand
+        the runs back with `release_runs`.
+
+        Returns
+        -------
+        list of str:
+            Names of the claimed runs, empty if there are none left.
+        """
+        return self.campaign_db.claim_runs(n, self.worker_id, lease_seconds=lease_seconds,
+                                           status=status, app_id=self._active_app['id'],
+                                           campaign=self.campaign_id)
+
+    def renew_leases(self, lease_seconds=600, run_id_list=None):
+        """
+        Extend the leases on the runs claimed by this worker (or only those in
+        `run_id_list`) to expire `lease_seconds` from now.
+        """
+        return self.campaign_db.renew_leases(self.worker_id, lease_seconds=lease_seconds,
+                                             run_name_list=run_id_list)
+
+    def release_runs(self, run_id_list, status=None):
+        """
+        Release the runs in `run_id_list` claimed by this worker, setting them
+        to `status` (or back to the status they were claimed from if None).
+        """
+        return self.campaign_db.release_runs(self.worker_id, run_id_list, status=status)
+
     def call_for_each_run(self, fn, status=Status.ENCODED):
         """
         Loop through all runs in this campaign with the specified status,
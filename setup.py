@@ -70,6 +70,7 @@ setup(
     author='CCS',
 
     install_requires=open("requirements.txt", "r").readlines(),
+    extras_require={"parquet": ["pyarrow"]},
 
     packages=find_packages(),
 
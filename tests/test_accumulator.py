@@ -0,0 +1,51 @@
+import pandas as pd
+import numpy as np
+from easyvvuq.collate.accumulator import ColumnAccumulator
+
+
+def append_all(frames):
+    result = pd.DataFrame()
+    for frame in frames:
+        result = result.append(frame, ignore_index=True)
+    return result
+
+
+def test_empty():
+    accumulator = ColumnAccumulator()
+    assert(len(accumulator) == 0)
+    assert(accumulator.to_dataframe().empty)
+
+
+def test_same_columns():
+    frames = [pd.DataFrame({'x': np.arange(i, i + 3) * 0.5, 'a': i, 'run_id': f'Run_{i}'})
+              for i in range(10)]
+    accumulator = ColumnAccumulator()
+    for frame in frames:
+        accumulator.append(frame)
+    assert(len(accumulator) == 30)
+    pd.testing.assert_frame_equal(accumulator.to_dataframe(), append_all(frames))
+
+
+def test_multi_index_columns():
+    frames = [pd.DataFrame({('x', ''): [1.0 * i], ('b', 0): [i], ('b', 1): [2 * i]})
+              for i in range(5)]
+    accumulator = ColumnAccumulator()
+    for frame in frames:
+        accumulator.append(frame)
+    result = accumulator.to_dataframe()
+    assert(isinstance(result.columns, pd.MultiIndex))
+    pd.testing.assert_frame_equal(result, append_all(frames))
+
+
+def test_changing_columns():
+    frames = [pd.DataFrame({'x': [1.0], 'a': [1]}),
+              pd.DataFrame({'x': [2.0], 'a': [2]}),
+              pd.DataFrame({'x': [3.0], 'b': ['c']}),
+              pd.DataFrame({'x': [4.0], 'a': [4]})]
+    accumulator = ColumnAccumulator()
+    for frame in frames:
+        accumulator.append(frame)
+    pd.testing.assert_frame_equal(accumulator.to_dataframe(), append_all(frames))
+    accumulator.clear()
+    assert(len(accumulator) == 0)
+    assert(accumulator.to_dataframe().empty)
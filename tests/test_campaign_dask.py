@@ -0,0 +1,102 @@
+import os
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.actions import ExecutionResult
+
+distributed = pytest.importorskip('dask.distributed')
+
+SWEEP = {"a": [0.5, 1.0, 2.0, 3.5, 5.0, 8.0], "b": [1.0, 2.0, 3.0, 4.0, 5.0]}
+N_RUNS = 30
+
+
+class FakeModel:
+    """Writes the output of a run. Fails for a = 8, raises for a = 5."""
+
+    def act_on_dir(self, target_dir):
+        params = {}
+        with open(os.path.join(target_dir, 'input.csv')) as fd:
+            for line in fd:
+                name, value = line.split(',')
+                params[name] = float(value)
+        if params['a'] == 5.0:
+            raise RuntimeError('model crashed')
+        if params['a'] == 8.0:
+            return ExecutionResult(2, 0.01)
+        with open(os.path.join(target_dir, 'output.csv'), 'w') as fd:
+            fd.write('x,y\n')
+            fd.write('{},{}\n'.format(params['a'] + params['b'], params['a'] * params['b']))
+        return ExecutionResult(0, 0.01)
+
+
+@pytest.fixture(scope='module')
+def client():
+    cluster = distributed.LocalCluster(n_workers=2, threads_per_worker=2, processes=False,
+                                       dashboard_address=None)
+    client = distributed.Client(cluster)
+    yield client
+    client.close()
+    cluster.close()
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    campaign = uq.CampaignDask(name='dask', work_dir=str(tmp_path))
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='dask', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname='tests/worker_serve/worker_serve.template', delimiter='$',
+                         target_filename='input.csv'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x', 'y'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=SWEEP))
+    campaign.draw_samples()
+    campaign.populate_runs_dir()
+    return campaign
+
+
+@pytest.mark.parametrize('partition_size', [None, 1, 7, 100])
+def test_apply_for_each_run_dir(campaign, client, partition_size):
+    results = campaign.apply_for_each_run_dir(FakeModel(), client, partition_size=partition_size)
+    assert(len(results) == N_RUNS)
+    progress = campaign.progress()
+    assert(progress[Status.FAILED] == 10)
+    assert(progress[Status.ENCODED] == 20)
+    df = campaign.runs_dataframe(columns=['a', 'exit_code'])
+    assert(list(df['exit_code'][df['a'] == 8.0]) == [2] * 5)
+    campaign.collate()
+    assert(len(campaign.get_collation_result()) == 20)
+
+
+def test_decode_on_workers(campaign, client):
+    campaign.apply_for_each_run_dir(FakeModel(), client, partition_size=4, decode=True)
+    progress = campaign.progress()
+    assert(progress[Status.COLLATED] == 20)
+    assert(progress[Status.FAILED] == 10)
+    result = campaign.get_collation_result()
+    assert(sorted(result['run_id']) ==
+           sorted(run_id for run_id, run in campaign.list_runs(status=Status.COLLATED)))
+    assert(((result['x'] - result['a'] - result['b']).abs() < 1e-12).all())
+
+
+def test_interrupted_record(campaign, client, monkeypatch):
+    from easyvvuq.db.sql import CampaignDB
+    set_run_statuses = CampaignDB.set_run_statuses
+    calls = []
+
+    def interrupted_set_run_statuses(self, run_name_list, status):
+        if status == Status.COLLATED:
+            calls.append(run_name_list)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+        set_run_statuses(self, run_name_list, status)
+    monkeypatch.setattr(CampaignDB, 'set_run_statuses', interrupted_set_run_statuses)
+    with pytest.raises(KeyboardInterrupt):
+        campaign.apply_for_each_run_dir(FakeModel(), client, partition_size=4, decode=True)
+    # Only the partition recorded in full is collated
+    result = campaign.get_collation_result()
+    assert(sorted(result['run_id']) == sorted(calls[0]))
+    assert(campaign.progress()[Status.COLLATED] == len(calls[0]))
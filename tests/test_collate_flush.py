@@ -0,0 +1,128 @@
+import os
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.db.sql import CampaignDB
+
+
+def make_campaign(tmp_path, collation_store='sql'):
+    campaign = uq.Campaign(name='flush', work_dir=str(tmp_path), collation_store=collation_store)
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='flush', params=params,
+                     encoder=uq.encoders.DirectoryBuilder(tree={}),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    sweep = {"a": [0.5, 1.0, 2.0, 3.5, 5.0], "b": [1.0, 2.0, 3.0, 4.0]}
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=sweep))
+    campaign.draw_samples()
+    campaign.populate_runs_dir()
+    # Fake the simulation output for all but the last run
+    for run_id, run in campaign.list_runs()[:-1]:
+        with open(os.path.join(run['run_dir'], 'output.csv'), 'w') as fd:
+            fd.write('x\n{}\n'.format(run['params']['a'] * run['params']['b']))
+    return campaign
+
+
+def collation_result(campaign):
+    return campaign.get_collation_result()
+
+
+def count_flushes(monkeypatch):
+    flushes = []
+    append_data = uq.collate.AggregateSamples.append_data
+
+    def counting_append_data(self, campaign, new_data, app_id):
+        flushes.append(len(new_data))
+        append_data(self, campaign, new_data, app_id)
+    monkeypatch.setattr(uq.collate.AggregateSamples, 'append_data', counting_append_data)
+    return flushes
+
+
+def test_flush_runs(tmp_path, monkeypatch):
+    expected = make_campaign(tmp_path)
+    expected.collate()
+    campaign = make_campaign(tmp_path)
+    flushes = count_flushes(monkeypatch)
+    campaign.collate(flush_runs=6, workers=2)
+    assert(flushes == [6, 6, 6, 1])
+    assert(collation_result(campaign).equals(collation_result(expected)))
+    assert(campaign.campaign_db.get_num_runs(status=Status.COLLATED) == 19)
+    assert(campaign.campaign_db.get_num_runs(status=Status.ENCODED) == 1)
+    with pytest.raises(RuntimeError):
+        campaign.collate(flush_runs=0)
+
+
+def test_flush_mb(tmp_path, monkeypatch):
+    campaign = make_campaign(tmp_path)
+    flushes = count_flushes(monkeypatch)
+    campaign.collate(flush_mb=1e-9)
+    assert(flushes == [1] * 19)
+
+
+def test_resume(tmp_path, monkeypatch):
+    expected = make_campaign(tmp_path)
+    expected.collate()
+    campaign = make_campaign(tmp_path)
+    decode_run = uq.collate.AggregateSamples.decode_run
+
+    def crashing_decode_run(self, decoder, run_id, run_info):
+        if run_id == 'Run_12':
+            raise RuntimeError('crash')
+        return decode_run(self, decoder, run_id, run_info)
+    monkeypatch.setattr(uq.collate.AggregateSamples, 'decode_run', crashing_decode_run)
+    with pytest.raises(RuntimeError):
+        campaign.collate(flush_runs=5)
+    # Runs of the completed flushes are kept
+    assert(campaign.campaign_db.get_num_runs(status=Status.COLLATED) == 10)
+    assert(len(campaign.get_collation_result()) == 10)
+    monkeypatch.setattr(uq.collate.AggregateSamples, 'decode_run', decode_run)
+    campaign.collate(flush_runs=5)
+    assert(collation_result(campaign).equals(collation_result(expected)))
+
+
+@pytest.mark.parametrize('store', ['sql', 'parquet'])
+def test_interrupted_flush(tmp_path, monkeypatch, store):
+    if store == 'parquet':
+        pytest.importorskip('pyarrow')
+    campaign = make_campaign(tmp_path, store)
+    set_run_statuses = CampaignDB.set_run_statuses
+
+    def interrupted_set_run_statuses(self, run_name_list, status):
+        if status == Status.COLLATED and 'Run_7' in run_name_list:
+            raise KeyboardInterrupt
+        set_run_statuses(self, run_name_list, status)
+    monkeypatch.setattr(CampaignDB, 'set_run_statuses', interrupted_set_run_statuses)
+    with pytest.raises(KeyboardInterrupt):
+        campaign.collate(flush_runs=5)
+    # The results of the interrupted flush are not stored
+    assert(len(campaign.get_collation_result()) == 5)
+    monkeypatch.setattr(CampaignDB, 'set_run_statuses', set_run_statuses)
+    campaign.collate(flush_runs=5)
+    assert(sorted(campaign.get_collation_result()['run_id']) ==
+           sorted('Run_{}'.format(i) for i in range(1, 20)))
+
+
+class OldCollater(uq.collate.AggregateSamples, collater_name='old_collater'):
+    """A collater written before collate took any options."""
+
+    def collate(self, campaign, app_id):
+        return super().collate(campaign, app_id)
+
+
+def test_old_collater(tmp_path):
+    campaign = make_campaign(tmp_path)
+    campaign._active_app_collater = OldCollater()
+    with pytest.raises(TypeError):
+        campaign.collate(flush_runs=6)
+    campaign.collate()
+    assert(len(campaign.get_collation_result()) == 19)
+
+
+def test_ignored_option(tmp_path, caplog):
+    campaign = make_campaign(tmp_path)
+    campaign.collate(flush_run=6)
+    assert("['flush_run']" in caplog.text)
+    assert(len(campaign.get_collation_result()) == 19)
@@ -0,0 +1,43 @@
+import os
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+
+
+def make_campaign(tmp_path, collater):
+    campaign = uq.Campaign(name='collate', work_dir=str(tmp_path))
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='collate', params=params,
+                     encoder=uq.encoders.DirectoryBuilder(tree={}),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x', 'y'], header=0),
+                     collater=collater)
+    sweep = {"a": [0.5, 1.0, 2.0, 3.5, 5.0, 8.0], "b": [1.0, 2.0, 3.0, 4.0, 5.0]}
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=sweep))
+    campaign.draw_samples()
+    campaign.populate_runs_dir()
+    # Fake the simulation output for all but the last few runs
+    for run_id, run in campaign.list_runs()[:-3]:
+        with open(os.path.join(run['run_dir'], 'output.csv'), 'w') as fd:
+            fd.write('x,y\n')
+            fd.write('{},{}\n'.format(run['params']['a'] + run['params']['b'],
+                                      run['params']['a'] * run['params']['b']))
+    return campaign
+
+
+@pytest.mark.parametrize('collater', [uq.collate.AggregateSamples,
+                                      uq.collate.AggregateByVariables])
+@pytest.mark.parametrize('workers, use_processes', [(4, False), (3, True)])
+def test_collate_parallel(tmp_path, collater, workers, use_processes):
+    serial = make_campaign(tmp_path, collater())
+    serial.collate()
+    parallel = make_campaign(tmp_path, collater())
+    parallel.collate(workers=workers, use_processes=use_processes)
+    expected = serial.get_collation_result()
+    result = parallel.get_collation_result()
+    assert(len(result) > 0)
+    assert(result.equals(expected))
+    assert(parallel.campaign_db.get_num_runs(status=Status.COLLATED) == 27)
+    assert(parallel.campaign_db.get_num_runs(status=Status.ENCODED) == 3)
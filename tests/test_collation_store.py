@@ -0,0 +1,145 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix
+from easyvvuq.db.sql import CampaignDB
+from easyvvuq.data_structs import CampaignInfo
+
+
+def make_db(tmp_path, store):
+    if store == 'parquet':
+        pytest.importorskip('pyarrow')
+    info = CampaignInfo(name='test',
+                        campaign_dir_prefix=default_campaign_prefix,
+                        easyvvuq_version=uq.__version__,
+                        campaign_dir=str(tmp_path))
+    return CampaignDB(location='sqlite:///{}/test.sqlite'.format(tmp_path),
+                      new_campaign=True, name='test', info=info,
+                      collation_store=store)
+
+
+def frame(start):
+    return pd.DataFrame({
+        'a': [start, start + 1, start + 2],
+        'run_id': ['Run_{}'.format(i) for i in range(start, start + 3)],
+        'te': [0.5 * start, 0.5 * start + 1, 0.5 * start + 2]})
+
+
+def multi_frame(start):
+    return pd.DataFrame({('a', ''): [start, start + 1],
+                         ('run_id', ''): ['Run_{}'.format(start), 'Run_{}'.format(start + 1)],
+                         ('te', 0): [1.0 * start, 2.0 * start],
+                         ('te', 1): [3.0 * start, 4.0 * start]})
+
+
+@pytest.mark.parametrize('store', ['sql', 'parquet'])
+def test_columns_and_filters(tmp_path, store):
+    db = make_db(tmp_path, store)
+    assert(db.get_collation_dataframe(1) is None)
+    db.append_collation_dataframe(frame(1), 1)
+    db.append_collation_dataframe(frame(4), 1)
+    df = db.get_collation_dataframe(1, columns=['run_id', 'te'])
+    assert(list(df.columns) == ['run_id', 'te'])
+    assert(list(df['run_id']) == ['Run_{}'.format(i) for i in range(1, 7)])
+    df = db.get_collation_dataframe(1, filters=[('a', '>', 2), ('a', '<=', 5)])
+    assert(list(df['a']) == [3, 4, 5])
+    assert(list(df.columns)[-2:] == ['run_id', 'te'])
+    df = db.get_collation_dataframe(1, columns=['te'],
+                                    filters=[('run_id', 'in', ['Run_2', 'Run_6'])])
+    assert(list(df['te']) == [1.5, 4.0])
+    with pytest.raises(RuntimeError):
+        db.get_collation_dataframe(1, columns=['missing'])
+    with pytest.raises(RuntimeError):
+        db.get_collation_dataframe(1, filters=[('a', 'like', 2)])
+    db.clear_collation(1)
+    assert(db.get_collation_dataframe(1) is None)
+
+
+@pytest.mark.parametrize('store', ['sql', 'parquet'])
+def test_multi_index(tmp_path, store):
+    db = make_db(tmp_path, store)
+    db.append_collation_dataframe(multi_frame(1), 1)
+    db.append_collation_dataframe(multi_frame(3), 1)
+    df = db.get_collation_dataframe(1)
+    expected = pd.concat([multi_frame(1), multi_frame(3)], ignore_index=True)
+    assert(isinstance(df.columns, pd.MultiIndex))
+    assert(list(df.columns) == list(expected.columns))
+    assert((df.values == expected.values).all())
+    df = db.get_collation_dataframe(1, columns=['te'], filters=[(('te', 1), '>', 4.0)])
+    assert(list(df.columns) == [('te', 0), ('te', 1)])
+    assert(np.array_equal(df.values, [[3.0, 9.0], [6.0, 12.0]]))
+    df = db.get_collation_dataframe(1, filters=[('a', '==', 3)])
+    assert(list(df[('run_id', '')]) == ['Run_3'])
+
+
+def test_parquet_store(tmp_path):
+    pytest.importorskip('pyarrow')
+    db = make_db(tmp_path, 'parquet')
+    db.append_collation_dataframe(frame(1), 1)
+    assert(os.listdir(os.path.join(str(tmp_path), 'collation', 'app1')) ==
+           db.collation_parts(1))
+    # Parts with differing columns are aligned, missing values never match a filter
+    db.append_collation_dataframe(frame(4).drop(columns=['te']), 1)
+    df = db.get_collation_dataframe(1)
+    assert(len(df) == 6)
+    assert(np.isnan(df['te'].values[3:]).all())
+    assert(len(db.get_collation_dataframe(1, filters=[('te', '>=', 0.0)])) == 3)
+
+
+@pytest.mark.parametrize('store', ['sql', 'parquet'])
+def test_append_rolled_back(tmp_path, store):
+    db = make_db(tmp_path, store)
+    db.append_collation_dataframe(frame(1), 1)
+    with pytest.raises(KeyboardInterrupt):
+        with db.transaction():
+            db.append_collation_dataframe(frame(4), 1)
+            raise KeyboardInterrupt
+    assert(list(db.get_collation_dataframe(1)['run_id']) == ['Run_1', 'Run_2', 'Run_3'])
+    with db.transaction():
+        db.append_collation_dataframe(frame(4), 1)
+    assert(len(db.get_collation_dataframe(1)) == 6)
+
+
+def test_store_recorded(tmp_path):
+    db = make_db(tmp_path, 'parquet')
+    location = 'sqlite:///{}/test.sqlite'.format(tmp_path)
+    reopened = CampaignDB(location=location, name='test')
+    assert(reopened.collation_store == 'parquet')
+    assert(reopened.collation_dir == db.collation_dir)
+    assert(CampaignDB(location=location, name='test',
+                      collation_store='sql').collation_store == 'sql')
+
+
+def test_invalid_store(tmp_path):
+    with pytest.raises(RuntimeError):
+        make_db(tmp_path, 'unknown')
+
+
+def test_campaign_parquet_store(tmp_path):
+    pytest.importorskip('pyarrow')
+    campaign = uq.Campaign(name='parquet', work_dir=str(tmp_path), collation_store='parquet')
+    params = {"a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='parquet', params=params,
+                     encoder=uq.encoders.DirectoryBuilder(tree={}),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep={"a": [1.0, 2.0, 3.0]}))
+    campaign.draw_samples()
+    campaign.populate_runs_dir()
+    for run_id, run in campaign.list_runs():
+        with open(os.path.join(run['run_dir'], 'output.csv'), 'w') as fd:
+            fd.write('x\n{}\n'.format(2 * run['params']['a']))
+    campaign.collate()
+    assert(os.path.isdir(os.path.join(campaign.campaign_dir, 'collation', 'app1')))
+    state_file = os.path.join(str(tmp_path), 'state.json')
+    campaign.save_state(state_file)
+    reloaded = uq.Campaign(state_file=state_file, work_dir=str(tmp_path))
+    assert(reloaded.collation_store == 'parquet')
+    result = reloaded.get_collation_result(columns=['run_id', 'x'], filters=[('a', '>', 1.5)])
+    assert(list(result['run_id']) == ['Run_2', 'Run_3'])
+    assert(list(result['x']) == [4.0, 6.0])
+    reloaded.recollate()
+    assert(len(reloaded.get_collation_result()) == 3)
@@ -71,6 +71,18 @@ def test_get_and_set_status(campaign):
     assert(all([campaign.get_run_status(name) == Status.ENCODED for name in run_names]))
 
 
+def test_get_and_set_statuses(campaign, monkeypatch):
+    monkeypatch.setattr('easyvvuq.db.sql.MAX_SQL_PARAMETERS', 100)
+    run_names = ['Run_{}'.format(i) for i in range(1, 1011, 2)]
+    campaign.set_run_statuses(run_names, Status.COLLATED)
+    statuses = campaign.get_run_statuses(['Run_{}'.format(i) for i in range(1, 1012)])
+    assert(len(statuses) == 1010)
+    assert('Run_1011' not in statuses)
+    assert(all([statuses[name] == Status.COLLATED for name in run_names]))
+    assert(campaign.get_num_runs(status=Status.NEW) == 505)
+    assert(campaign.get_run_status('Run_3') == Status.COLLATED)
+
+
 def test_get_num_runs(campaign):
     assert(campaign.get_num_runs() == 1010)
 
@@ -138,3 +150,85 @@ def test_multi_index(tmp_path, app_info):
     df_ref = db.get_collation_dataframe('test')
     assert((np.vstack((df.values, df2.values)) == df_ref.values).all())
     assert((df2.columns == df_ref.columns).all())
+
+
+def test_add_runs_chunked(campaign, monkeypatch):
+    monkeypatch.setattr('easyvvuq.db.sql.BULK_INSERT_CHUNK_SIZE', 7)
+    runs = [RunInfo('run', 'test', '.', 1, {'a': i}, 1, 1) for i in range(20)]
+    campaign.add_runs(runs)
+    assert(campaign.get_num_runs() == 1030)
+    run = campaign.run('Run_1030')
+    assert(run['params'] == {'a': 19})
+    assert(run['ensemble_name'] == 'Ensemble_2')
+    assert(run['status'] == Status.NEW)
+    reopened = CampaignDB(location='sqlite:///{}/test.sqlite'.format(campaign.tmp_path),
+                          new_campaign=False, name='test')
+    assert(reopened._next_run == 1031)
+    assert(reopened._next_ensemble == 3)
+
+
+def test_runs_paginated(campaign, monkeypatch):
+    monkeypatch.setattr('easyvvuq.db.sql.RUNS_PAGE_SIZE', 100)
+    names = ['Run_{}'.format(i) for i in range(1, 1011)]
+    assert(list(campaign.run_ids()) == names)
+    # Runs can be updated while iterating over them
+    for run_id, run in campaign.runs(status=Status.NEW):
+        campaign.set_run_statuses([run_id], Status.ENCODED)
+    assert(campaign.get_num_runs(status=Status.ENCODED) == 1010)
+    assert([run_id for run_id, run in campaign.runs(status=Status.ENCODED)] == names)
+
+
+def test_schema_migration(campaign):
+    from sqlalchemy import inspect, text
+    from easyvvuq.db.sql import SCHEMA_VERSION
+    assert(campaign.schema_version() == SCHEMA_VERSION)
+    # Turn the database into one created before schema versioning
+    indexes = [index['name'] for index in inspect(campaign.engine).get_indexes('run')]
+    assert('ix_run_status_app' in indexes)
+    with campaign.engine.begin() as connection:
+        for index in indexes:
+            connection.execute(text('DROP INDEX {}'.format(index)))
+        for name in ['lease_owner', 'lease_id', 'lease_expires', 'lease_status',
+                     'exit_code', 'wall_time']:
+            connection.execute(text('ALTER TABLE run DROP COLUMN {}'.format(name)))
+        for name in ['collation_store', 'collation_dir']:
+            connection.execute(text('ALTER TABLE campaign_info DROP COLUMN {}'.format(name)))
+        connection.execute(text('DROP TABLE schema_version'))
+    location = 'sqlite:///{}/test.sqlite'.format(campaign.tmp_path)
+    old = CampaignDB(location=location, new_campaign=False, name='test')
+    assert(old.schema_version() == SCHEMA_VERSION)
+    assert(sorted(index['name'] for index in inspect(old.engine).get_indexes('run')) ==
+           sorted(indexes))
+    assert(old.get_num_runs(status=Status.NEW) == 1010)
+    assert('lease_expires' in [col['name'] for col in inspect(old.engine).get_columns('run')])
+    assert(len(old.claim_runs(3, 'worker')) == 3)
+    assert(old.collation_store == 'sql')
+    with old.engine.begin() as connection:
+        connection.execute(text('UPDATE schema_version SET version = {}'.format(
+            SCHEMA_VERSION + 1)))
+    with pytest.raises(RuntimeError):
+        CampaignDB(location=location, new_campaign=False, name='test')
+
+
+def test_runs_dataframe(campaign):
+    runs = [RunInfo('run', 'test', '.', 1, {'a': i, 'b': 'x', 'status': 2.5}, 1, 1)
+            for i in range(5)]
+    campaign.add_runs(runs)
+    campaign.set_run_statuses(['Run_1011', 'Run_1013'], Status.ENCODED)
+    df = campaign.runs_dataframe()
+    assert(len(df) == 1015)
+    assert(list(df.columns) == ['run_name', 'ensemble_name', 'status', 'sample', 'campaign',
+                                'app', 'run_dir', 'a', 'b', 'params.status'])
+    assert(list(df['run_name'][:2]) == ['Run_1', 'Run_2'])
+    df = campaign.runs_dataframe(status=Status.ENCODED,
+                                 columns=['a', 'run_name', 'status', 'params.status'])
+    assert(list(df.columns) == ['a', 'run_name', 'status', 'params.status'])
+    assert(list(df['run_name']) == ['Run_1011', 'Run_1013'])
+    assert(list(df['a']) == [0, 2])
+    assert(df['a'].dtype == np.int64)
+    assert((df['status'] == Status.ENCODED).all())
+    assert(list(df['params.status']) == [2.5, 2.5])
+    df = campaign.runs_dataframe(status=Status.ENCODED, columns=['run_name'])
+    assert(list(df.columns) == ['run_name'])
+    with pytest.raises(RuntimeError):
+        campaign.runs_dataframe(columns=['c'])
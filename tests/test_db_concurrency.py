@@ -0,0 +1,68 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix, Status
+from easyvvuq.db.sql import CampaignDB
+from easyvvuq.data_structs import CampaignInfo, RunInfo
+
+N_WORKERS = 4
+N_RUNS = 200
+N_ADDED = 25
+ENGINE_OPTIONS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}
+
+
+@pytest.fixture
+def db_location(tmp_path):
+    info = CampaignInfo(
+        name='test',
+        campaign_dir_prefix=default_campaign_prefix,
+        easyvvuq_version=uq.__version__,
+        campaign_dir=str(tmp_path))
+    location = 'sqlite:///{}/test.sqlite'.format(tmp_path)
+    db = CampaignDB(location=location, new_campaign=True, name='test', info=info,
+                    engine_options=ENGINE_OPTIONS)
+    db.add_runs([RunInfo('run', 'test', '.', 1, {'a': i}, 1, 1) for i in range(N_RUNS)])
+    return location
+
+
+def work(location, worker):
+    """Update the runs assigned to `worker` one at a time, interleaved with
+    reads and with adding new runs, as a worker process would."""
+    db = CampaignDB(location=location, name='test', engine_options=ENGINE_OPTIONS)
+    run_names = [f'Run_{i}' for i in range(1 + worker, N_RUNS + 1, N_WORKERS)]
+    for i, run_name in enumerate(run_names):
+        db.set_dir_for_run(run_name, f'/tmp/{run_name}')
+        db.set_run_statuses([run_name], Status.ENCODED)
+        assert(db.get_run_status(run_name) == Status.ENCODED)
+        db.status_counts()
+        if i % 2 == 0:
+            db.add_runs([RunInfo('run', 'test', '.', 1, {'a': -1}, 1, 1)])
+    return len(run_names)
+
+
+def test_sessions_are_short_lived(db_location):
+    db = CampaignDB(location=db_location, name='test', engine_options=ENGINE_OPTIONS)
+    assert(db._session is None)
+    db.get_num_runs()
+    assert(db._session is None)
+    runs = db.runs()
+    next(runs)
+    assert(db._session is None)
+    with db.engine.connect() as conn:
+        assert(conn.exec_driver_sql('PRAGMA journal_mode').scalar().lower() == 'wal')
+        assert(conn.exec_driver_sql('PRAGMA busy_timeout').scalar() == 60000)
+
+
+def test_concurrent_workers(db_location):
+    db = CampaignDB(location=db_location, name='test', engine_options=ENGINE_OPTIONS)
+    with ProcessPoolExecutor(max_workers=N_WORKERS) as executor:
+        futures = [executor.submit(work, db_location, worker) for worker in range(N_WORKERS)]
+        while not all(future.done() for future in futures):
+            db.status_counts()
+        assert(sum(future.result() for future in futures) == N_RUNS)
+    counts = db.status_counts()
+    assert(counts[Status.ENCODED] == N_RUNS)
+    assert(counts[Status.NEW] == N_WORKERS * N_ADDED)
+    run_names = [run_name for run_name, _ in db.runs()]
+    assert(len(set(run_names)) == N_RUNS + N_WORKERS * N_ADDED)
+    assert(db.run('Run_1')['run_dir'] == '/tmp/Run_1')
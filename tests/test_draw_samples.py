@@ -0,0 +1,46 @@
+import easyvvuq as uq
+import chaospy as cp
+import pytest
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    campaign = uq.Campaign(name='draw', work_dir=str(tmp_path))
+    params = {
+        "a": {"type": "float", "min": -10.0, "max": 10.0, "default": 0.0},
+        "b": {"type": "float", "min": -10.0, "max": 10.0, "default": 0.0},
+        "out_file": {"type": "string", "default": "output.csv"}}
+    campaign.add_app(name='draw', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname='tests/cooling/cooling.template',
+                         delimiter='$', target_filename='input.json'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['te'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    vary = {"a": cp.Uniform(-5.0, 5.0), "b": cp.Uniform(-5.0, 5.0)}
+    campaign.set_sampler(uq.sampling.RandomSampler(vary=vary, max_num=25))
+    return campaign
+
+
+@pytest.mark.parametrize('batch_size', [1, 4, 10000])
+def test_draw_samples_batches(campaign, batch_size):
+    campaign.draw_samples(replicas=3, batch_size=batch_size)
+    runs = campaign.list_runs()
+    assert(len(runs) == 75)
+    ensembles = {}
+    for run_id, run in runs:
+        ensembles.setdefault(run['ensemble_name'], []).append(run['params'])
+    assert(len(ensembles) == 25)
+    for params in ensembles.values():
+        assert(len(params) == 3)
+        assert(all(p == params[0] for p in params))
+        assert(params[0]['out_file'] == 'output.csv')
+    assert(campaign.campaign_db.run('Run_75')['ensemble_name'] == 'Ensemble_25')
+
+
+def test_draw_samples_num_samples(campaign):
+    campaign.draw_samples(num_samples=7, batch_size=3)
+    assert(len(campaign.list_runs()) == 7)
+    assert(campaign.get_active_sampler().count == 7)
+    with pytest.raises(RuntimeError):
+        campaign.draw_samples(num_samples=1, batch_size=0)
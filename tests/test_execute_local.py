@@ -0,0 +1,72 @@
+import os
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.actions import ExecuteLocal
+
+MODEL = """#!/bin/sh
+a=${1:-$(cat input.txt)}
+echo "running a=$a"
+echo "warning" 1>&2
+case "$a" in
+    2.0) exit 3 ;;
+    3.0) sleep 30 ;;
+esac
+echo "x" > output.csv
+echo "$a" >> output.csv
+"""
+
+
+@pytest.fixture
+def model(tmp_path):
+    path = tmp_path / 'model.sh'
+    path.write_text(MODEL)
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_act_on_dir(tmp_path, model):
+    run_dir = tmp_path / 'run'
+    run_dir.mkdir()
+    result = ExecuteLocal(f'{model} 1.0').act_on_dir(str(run_dir))
+    assert(not result.failed)
+    assert(result.exit_code == 0)
+    assert(result.wall_time > 0.0)
+    assert((run_dir / 'stdout.log').read_text() == 'running a=1.0\n')
+    assert((run_dir / 'stderr.log').read_text() == 'warning\n')
+    assert((run_dir / 'output.csv').read_text() == 'x\n1.0\n')
+    result = ExecuteLocal(f'{model} 2.0', stdout=None, stderr='err.txt').act_on_dir(str(run_dir))
+    assert(result.failed and not result.timed_out)
+    assert(result.exit_code == 3)
+    assert((run_dir / 'err.txt').read_text() == 'warning\n')
+    result = ExecuteLocal(f'{model} 3.0', timeout=0.5).act_on_dir(str(run_dir))
+    assert(result.failed and result.timed_out)
+    assert(result.wall_time < 10.0)
+
+
+def test_apply_for_each_run_dir(tmp_path, model):
+    template = tmp_path / 'input.template'
+    template.write_text('$a\n')
+    campaign = uq.Campaign(name='execute', work_dir=str(tmp_path))
+    params = {"a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='execute', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname=str(template), delimiter='$',
+                         target_filename='input.txt'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep={"a": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]}))
+    campaign.draw_samples()
+    campaign.populate_runs_dir()
+    results = campaign.apply_for_each_run_dir(ExecuteLocal(model, timeout=1.0), max_workers=3)
+    assert(len(results) == 6)
+    assert([run_id for run_id, result in results.items() if result.failed] == ['Run_2', 'Run_3'])
+    progress = campaign.progress()
+    assert(progress[Status.FAILED] == 2)
+    assert(progress[Status.ENCODED] == 4)
+    df = campaign.runs_dataframe(columns=['run_name', 'status', 'exit_code', 'wall_time'])
+    assert(list(df['exit_code'])[:3] == [0, 3, -9])
+    assert((df['wall_time'] > 0.0).all())
+    campaign.collate()
+    assert(list(campaign.get_collation_result()['x']) == [1.0, 4.0, 5.0, 6.0])
@@ -0,0 +1,181 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import chaospy as cp
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.actions import ExecutePython, ExecuteVectorized
+from easyvvuq.executors import ThreadExecutor, ProcessExecutor
+
+SWEEP = {"a": [0.5, 1.0, 2.0, 3.5, 8.0], "b": [1.0, 2.0, 3.0, 4.0]}
+N_RUNS = 20
+
+
+def model(params):
+    if params['a'] == 8.0:
+        raise ValueError('model crashed')
+    return {'x': params['a'] + params['b'], 'y': params['a'] * params['b']}
+
+
+def vector_model(params):
+    t = np.arange(3)
+    return {'t': t, 'z': params['a'] * t + params['b']}
+
+
+def make_campaign(tmp_path, collater=None):
+    campaign = uq.Campaign(name='python', work_dir=str(tmp_path))
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='python', params=params,
+                     collater=collater or uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=SWEEP))
+    campaign.draw_samples()
+    return campaign
+
+
+@pytest.mark.parametrize('executor', [None, ThreadExecutor(2), ProcessExecutor(2)])
+def test_apply_for_each_run(tmp_path, executor):
+    campaign = make_campaign(tmp_path)
+    assert(campaign.apply_for_each_run(ExecutePython(model), executor=executor,
+                                       flush_runs=7) == 16)
+    if executor is not None:
+        executor.shutdown()
+    progress = campaign.progress()
+    assert(progress[Status.COLLATED] == 16)
+    assert(progress[Status.FAILED] == 4)
+    result = campaign.get_collation_result()
+    assert(len(result) == 16)
+    assert(((result['x'] - result['a'] - result['b']).abs() < 1e-12).all())
+    assert(((result['y'] - result['a'] * result['b']).abs() < 1e-12).all())
+    assert(list(result['run_id'][:2]) == ['Run_1', 'Run_2'])
+    # No run directories are created
+    runs_dir = campaign.get_campaign_runs_dir()
+    assert(not os.path.exists(runs_dir) or os.listdir(runs_dir) == [])
+
+
+def test_output_types(tmp_path):
+    campaign = make_campaign(tmp_path)
+    assert(campaign.apply_for_each_run(ExecutePython(vector_model)) == N_RUNS)
+    result = campaign.get_collation_result()
+    assert(len(result) == 3 * N_RUNS)
+    assert(list(result['t'][:3]) == [0, 1, 2])
+    assert(list(result['z'][:3]) == [0.5 * t + 1.0 for t in range(3)])
+    action = ExecutePython(lambda params: pd.DataFrame({'x': [params['a']] * 2}))
+    assert(list(action.act_on_params({'a': 1.0})['x']) == [1.0, 1.0])
+    with pytest.raises(RuntimeError):
+        ExecutePython(lambda params: [params['a']]).act_on_params({'a': 1.0})
+    with pytest.raises(RuntimeError):
+        ExecutePython(model).act_on_dir(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        ExecutePython('model')
+
+
+def test_aggregate_by_variables(tmp_path):
+    campaign = make_campaign(tmp_path, uq.collate.AggregateByVariables())
+    assert(campaign.apply_for_each_run(ExecutePython(model)) == 16)
+    result = campaign.get_collation_result()
+    assert(len(result) == 32)
+    assert(sorted(set(result['Variable'])) == ['x', 'y'])
+
+
+def test_reload_app_without_encoder(tmp_path):
+    campaign = make_campaign(tmp_path)
+    state_file = os.path.join(str(tmp_path), 'state.json')
+    campaign.save_state(state_file)
+    reloaded = uq.Campaign(state_file=state_file, work_dir=str(tmp_path))
+    assert(reloaded._active_app_encoder is None)
+    assert(reloaded._active_app_decoder is None)
+    assert(reloaded.apply_for_each_run(ExecutePython(model)) == 16)
+    with pytest.raises(RuntimeError):
+        reloaded.collate()
+
+
+def ishigami(params):
+    x, y, z = params['x'], params['y'], params['z']
+    return {'f': np.sin(x) + 7 * np.sin(y) ** 2 + 0.1 * z ** 4 * np.sin(x), 'g': x * y}
+
+
+def ishigami_block(block):
+    x, y, z = block.T
+    return np.column_stack([np.sin(x) + 7 * np.sin(y) ** 2 + 0.1 * z ** 4 * np.sin(x), x * y])
+
+
+def make_qmc_campaign(tmp_path, name, collater=None):
+    campaign = uq.Campaign(name=name, work_dir=str(tmp_path))
+    params = {p: {"type": "float", "min": -4.0, "max": 4.0, "default": 0.0} for p in 'xyz'}
+    campaign.add_app(name=name, params=params,
+                     collater=collater or uq.collate.AggregateSamples())
+    sampler = uq.sampling.QMCSampler({p: cp.Uniform(-np.pi, np.pi) for p in 'xyz'},
+                                     n_mc_samples=64)
+    campaign.set_sampler(sampler)
+    return campaign, sampler
+
+
+def test_apply_to_samples(tmp_path):
+    campaign, sampler = make_qmc_campaign(tmp_path, 'vectorized')
+    action = ExecuteVectorized(ishigami_block, ['f', 'g'])
+    assert(campaign.apply_to_samples(action, batch_size=47) == 160)
+    assert(campaign.campaign_db.get_num_runs() == 0)
+    result = campaign.get_collation_result()
+    assert([column for column in result.columns if column != 'index'][:2] == ['f', 'g'])
+    assert(list(result['run_id'][:2]) == ['Run_1', 'Run_2'])
+    assert(result['run_id'].is_unique)
+    campaign.apply_analysis(uq.analysis.QMCAnalysis(sampler=sampler, qoi_cols=['f', 'g']))
+    vectorized = campaign.get_last_analysis()
+
+    # The same as evaluating the model run by run
+    per_run, per_run_sampler = make_qmc_campaign(tmp_path, 'per_run')
+    per_run.draw_samples()
+    per_run.apply_for_each_run(ExecutePython(ishigami))
+    per_run_result = per_run.get_collation_result()
+    for column in ['f', 'g', 'x', 'y', 'z']:
+        assert(np.allclose(result[column], per_run_result[column]))
+    per_run.apply_analysis(uq.analysis.QMCAnalysis(sampler=per_run_sampler,
+                                                   qoi_cols=['f', 'g']))
+    for qoi in ['f', 'g']:
+        for param in 'xyz':
+            assert(np.allclose(vectorized['sobols_first'][qoi][param],
+                               per_run.get_last_analysis()['sobols_first'][qoi][param]))
+
+
+def test_apply_to_samples_restart(tmp_path):
+    calls = []
+
+    def failing_block(block):
+        calls.append(len(block))
+        if len(calls) == 3:
+            raise RuntimeError('model failed')
+        return ishigami_block(block)
+    campaign, sampler = make_qmc_campaign(tmp_path, 'restart')
+    with pytest.raises(RuntimeError):
+        campaign.apply_to_samples(ExecuteVectorized(failing_block, ['f', 'g']), batch_size=47)
+    assert(len(campaign.get_collation_result()) == 94)
+    # Carry on from the state of the sampler stored in the database
+    campaign._active_sampler = campaign.campaign_db.resurrect_sampler(
+        campaign._active_sampler_id)
+    action = ExecuteVectorized(ishigami_block, ['f', 'g'])
+    assert(campaign.apply_to_samples(action, batch_size=47) == 66)
+    expected, _ = make_qmc_campaign(tmp_path, 'expected')
+    expected.apply_to_samples(action)
+    assert(np.allclose(campaign.get_collation_result()['x'],
+                       expected.get_collation_result()['x']))
+
+
+def test_apply_to_samples_partial(tmp_path):
+    campaign, sampler = make_qmc_campaign(tmp_path, 'partial',
+                                          uq.collate.AggregateByVariables())
+    action = ExecuteVectorized(ishigami_block, ['f', 'g'])
+    assert(campaign.apply_to_samples(action, num_samples=10, batch_size=4) == 10)
+    result = campaign.get_collation_result()
+    assert(len(result) == 20)
+    assert(list(result['Variable'][:4]) == ['f', 'g', 'f', 'g'])
+    assert(result['run_id'].iloc[-1] == 'Run_10')
+    # Runs added afterwards continue from the reserved names and samples
+    campaign.draw_samples(num_samples=2)
+    assert([run_id for run_id, _ in campaign.list_runs()] == ['Run_11', 'Run_12'])
+    with pytest.raises(RuntimeError):
+        campaign.apply_to_samples(ExecuteVectorized(ishigami_block, ['f']))
+    with pytest.raises(RuntimeError):
+        campaign.apply_to_samples(action, batch_size=0)
@@ -0,0 +1,162 @@
+import os
+import functools
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.actions import ExecutionResult
+from easyvvuq.executors import (AVAILABLE_EXECUTORS, SerialExecutor, ThreadExecutor,
+                                ProcessExecutor, DaskExecutor, choose_pack_size)
+
+SWEEP = {"a": [0.5, 1.0, 2.0, 3.5, 8.0], "b": [1.0, 2.0, 3.0, 4.0]}
+N_RUNS = 20
+
+
+class FakeModel:
+    """Writes the output of a run. Fails for a = 8."""
+
+    def act_on_dir(self, target_dir):
+        params = {}
+        with open(os.path.join(target_dir, 'input.csv')) as fd:
+            for line in fd:
+                name, value = line.split(',')
+                params[name] = float(value)
+        if params['a'] == 8.0:
+            return ExecutionResult(1, 0.01)
+        with open(os.path.join(target_dir, 'output.csv'), 'w') as fd:
+            fd.write('x,y\n')
+            fd.write('{},{}\n'.format(params['a'] + params['b'], params['a'] * params['b']))
+        return ExecutionResult(0, 0.01)
+
+
+def square(x):
+    return x * x
+
+
+def make_executor(name):
+    if name == 'dask':
+        pytest.importorskip('dask.distributed')
+        return DaskExecutor(n_workers=2, threads_per_worker=2, processes=False)
+    if name == 'serial':
+        return SerialExecutor()
+    return AVAILABLE_EXECUTORS[name](max_workers=2)
+
+
+@pytest.fixture(params=['serial', 'thread', 'process', 'dask'])
+def executor(request):
+    executor = make_executor(request.param)
+    yield executor
+    executor.shutdown()
+
+
+def make_campaign(tmp_path, executor=None):
+    campaign = uq.Campaign(name='executors', work_dir=str(tmp_path), executor=executor)
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='executors', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname='tests/worker_serve/worker_serve.template', delimiter='$',
+                         target_filename='input.csv'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x', 'y'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=SWEEP))
+    campaign.draw_samples()
+    return campaign
+
+
+def test_map(executor):
+    assert(executor.n_workers >= 1)
+    assert(executor.map(square, range(50)) == [x * x for x in range(50)])
+    assert(executor.map(square, []) == [])
+
+
+def test_registered():
+    assert(AVAILABLE_EXECUTORS['serial'] is SerialExecutor)
+    assert(AVAILABLE_EXECUTORS['thread'] is ThreadExecutor)
+    assert(AVAILABLE_EXECUTORS['process'] is ProcessExecutor)
+    assert(AVAILABLE_EXECUTORS['dask'] is DaskExecutor)
+    with ThreadExecutor(max_workers=3) as executor:
+        assert(executor.n_workers == 3)
+        executor.map(square, [1])
+        assert(executor._pool is not None)
+    assert(executor._pool is None)
+
+
+def test_campaign_executor(tmp_path, executor):
+    campaign = make_campaign(tmp_path, executor)
+    campaign.populate_runs_dir(chunk_size=3)
+    assert(campaign.progress()[Status.ENCODED] == N_RUNS)
+    results = campaign.apply_for_each_run_dir(FakeModel())
+    assert(len(results) == N_RUNS)
+    assert(campaign.progress()[Status.FAILED] == 4)
+    campaign.collate()
+    result = campaign.get_collation_result()
+    assert(len(result) == 16)
+    assert(((result['x'] - result['a'] - result['b']).abs() < 1e-12).all())
+    assert(((result['y'] - result['a'] * result['b']).abs() < 1e-12).all())
+
+
+def test_method_executor(tmp_path):
+    campaign = make_campaign(tmp_path)
+    assert(campaign.executor is None)
+    with ThreadExecutor(max_workers=2) as executor:
+        campaign.populate_runs_dir(executor=executor)
+        campaign.apply_for_each_run_dir(FakeModel(), executor=executor)
+        campaign.collate(executor=executor)
+    assert(len(campaign.get_collation_result()) == 16)
+
+
+class TaskCounter:
+    """Serial executor recording the number of items mapped at a time."""
+
+    def __init__(self, n_workers):
+        self.n_workers = n_workers
+        self.tasks = []
+
+    def map(self, fn, items):
+        self.tasks.append(len(items))
+        return [fn(item) for item in items]
+
+    def shutdown(self):
+        pass
+
+
+def test_choose_pack_size():
+    assert(choose_pack_size(1000, 4) == 63)
+    assert(choose_pack_size(1000, 4, wall_time=2.0) == 15)
+    assert(choose_pack_size(1000, 4, wall_time=40.0) == 1)
+    assert(choose_pack_size(10, 4, wall_time=0.001) == 1)
+    assert(choose_pack_size(0, 4) == 1)
+
+
+@pytest.mark.parametrize('pack_workers', [1, 2])
+def test_packed_runs(tmp_path, pack_workers):
+    campaign = make_campaign(tmp_path)
+    campaign.populate_runs_dir()
+    counter = TaskCounter(2)
+    results = campaign.apply_for_each_run_dir(FakeModel(), executor=counter, pack_size=3,
+                                              pack_workers=pack_workers)
+    assert(counter.tasks == [7])
+    assert(list(results) == [f'Run_{i}' for i in range(1, N_RUNS + 1)])
+    assert(all(isinstance(result, ExecutionResult) for result in results.values()))
+    assert(campaign.progress()[Status.FAILED] == 4)
+    campaign.collate()
+    assert(len(campaign.get_collation_result()) == 16)
+    with pytest.raises(RuntimeError):
+        campaign.apply_for_each_run_dir(FakeModel(), pack_size=0)
+
+
+def test_auto_pack_size(tmp_path, monkeypatch):
+    monkeypatch.setattr('easyvvuq.campaign.choose_pack_size',
+                        functools.partial(choose_pack_size, target_seconds=0.035))
+    campaign = make_campaign(tmp_path)
+    campaign.populate_runs_dir()
+    assert(campaign.campaign_db.mean_wall_time() is None)
+    counter = TaskCounter(2)
+    results = campaign.apply_for_each_run_dir(FakeModel(), executor=counter, pack_size='auto')
+    assert(len(results) == N_RUNS)
+    # A first run per worker is timed, the remaining 18 runs are packed
+    # three to a task (0.035 / 0.01)
+    assert(counter.tasks == [2, 6])
+    assert(abs(campaign.campaign_db.mean_wall_time() - 0.01) < 1e-9)
@@ -0,0 +1,73 @@
+import pytest
+import easyvvuq as uq
+from sqlalchemy import inspect
+from easyvvuq.constants import Status
+
+
+def make_campaign(tmp_path, param_table):
+    campaign = uq.Campaign(name='params', work_dir=str(tmp_path))
+    params = {
+        "kappa": {"type": "float", "min": 0.0, "max": 1.0, "default": 0.5},
+        "n": {"type": "integer", "default": 1},
+        "name": {"type": "string", "default": "a"},
+        "vec": {"type": "list", "default": [1.0, 2.0]}}
+    campaign.add_app(name='params', params=params,
+                     encoder=uq.encoders.DirectoryBuilder(tree={}),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x'], header=0),
+                     collater=uq.collate.AggregateSamples(),
+                     param_table=param_table)
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep={'n': [1]}))
+    campaign.add_runs([{'kappa': i / 10, 'n': i % 3, 'name': 'run{}'.format(i)}
+                       for i in range(10)])
+    return campaign
+
+
+def select(campaign, where):
+    return [run_id for run_id, run in campaign.list_runs(where=where)]
+
+
+@pytest.mark.parametrize('param_table', [True, False])
+def test_where(tmp_path, param_table):
+    campaign = make_campaign(tmp_path, param_table)
+    assert(select(campaign, [('kappa', '>', 0.65)]) == ['Run_8', 'Run_9', 'Run_10'])
+    assert(select(campaign, [('kappa', '<=', 0.3), ('n', '==', 1)]) == ['Run_2'])
+    assert(select(campaign, [('name', 'in', ['run3', 'run5'])]) == ['Run_4', 'Run_6'])
+    assert(select(campaign, [('n', 'not in', [0, 1])]) == ['Run_3', 'Run_6', 'Run_9'])
+    db = campaign.campaign_db
+    assert(db.get_num_runs(app_id=1, where=[('n', '!=', 0)]) == 6)
+    campaign.campaign_db.set_run_statuses(['Run_1', 'Run_2'], Status.ENCODED)
+    assert([run_id for run_id in db.run_ids(status=Status.NEW, app_id=1,
+                                             where=[('kappa', '<', 0.25)])] == ['Run_3'])
+    df = campaign.runs_dataframe(columns=['run_name', 'kappa'], where=[('kappa', '>=', 0.8)])
+    assert(list(df['kappa']) == [0.8, 0.9])
+    with pytest.raises(RuntimeError):
+        select(campaign, [('kappa', '~', 0.5)])
+
+
+def test_param_table(tmp_path):
+    campaign = make_campaign(tmp_path, True)
+    columns = inspect(campaign.campaign_db.engine).get_columns('PARAMS_APP1')
+    assert([column['name'] for column in columns] == ['run_name', 'kappa', 'n', 'name'])
+    indexes = inspect(campaign.campaign_db.engine).get_indexes('PARAMS_APP1')
+    assert(len(indexes) == 3)
+    with campaign.campaign_db.engine.connect() as connection:
+        row = connection.execute(campaign.campaign_db._param_table(1).select().where(
+            campaign.campaign_db._param_table(1).c.run_name == 'Run_4')).one()
+    assert(tuple(row) == ('Run_4', 0.3, 0, 'run3'))
+
+
+def test_create_param_table(tmp_path):
+    campaign = make_campaign(tmp_path, False)
+    db = campaign.campaign_db
+    table = db.create_param_table(1)
+    with db.engine.connect() as connection:
+        assert(len(connection.execute(table.select()).all()) == 10)
+    campaign.add_runs([{'kappa': 0.95}])
+    with db.engine.connect() as connection:
+        assert(len(connection.execute(table.select()).all()) == 11)
+    assert(select(campaign, [('kappa', '>', 0.9)]) == ['Run_11'])
+    # Creating the table again leaves it as it is
+    table = db.create_param_table(1)
+    with db.engine.connect() as connection:
+        assert(len(connection.execute(table.select()).all()) == 11)
@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import easyvvuq as uq
+
+
+@pytest.fixture
+def params_spec():
+    return uq.ParamsSpecification({
+        "temp_init": {"type": "float", "min": 0.0, "max": 100.0, "default": 95.0},
+        "n_steps": {"type": "integer", "min": 1, "default": 10},
+        "method": {"type": "string", "allowed": ["euler", "rk4"], "default": "rk4"},
+        "out_file": {"type": "string", "default": "output.csv"}})
+
+
+def test_process_runs_defaults(params_spec):
+    runs = params_spec.process_runs([{'temp_init': 50.0}, {'n_steps': np.int64(3)}, {}])
+    assert(runs[0] == {'temp_init': 50.0, 'n_steps': 10, 'method': 'rk4',
+                       'out_file': 'output.csv'})
+    assert(runs[1]['temp_init'] == 95.0)
+    assert(runs[1]['n_steps'] == 3)
+    assert(runs[2] == params_spec.process_run({}))
+
+
+@pytest.mark.parametrize('bad_run', [
+    {'temp_init': 100.5},
+    {'temp_init': -1},
+    {'temp_init': 'hot'},
+    {'n_steps': 0},
+    {'n_steps': 2.5},
+    {'method': 'rk2'},
+    {'unknown': 1.0}])
+def test_process_runs_errors(params_spec, bad_run):
+    runs = [{'temp_init': float(t)} for t in range(100)]
+    runs.insert(42, bad_run)
+    with pytest.raises(RuntimeError) as error:
+        params_spec.process_runs(runs)
+    assert(str(bad_run)[1:-1] in str(error.value))
+    # without verification nothing is checked
+    params_spec.process_runs(runs, verify=False)
+
+
+def test_process_runs_matches_cerberus(params_spec):
+    runs = [{'temp_init': t, 'n_steps': n, 'method': m}
+            for t in [0, 0.5, 100.0, True] for n in [1, 7, True] for m in ['euler', 'rk4']]
+    params_spec.process_runs([dict(run) for run in runs])
+    for run in runs:
+        params_spec.process_run(dict(run))
+
+
+def test_process_runs_uncompiled_rules():
+    params_spec = uq.ParamsSpecification({
+        "name": {"type": "string", "regex": "[a-z]+", "default": "abc"}})
+    params_spec.process_runs([{'name': 'xyz'}, {}])
+    with pytest.raises(RuntimeError):
+        params_spec.process_runs([{'name': 'xyz'}, {'name': 'XYZ'}])
+
+
+def test_process_runs_non_numeric_bounds():
+    params_spec = uq.ParamsSpecification({
+        "name": {"type": "string", "min": "b", "default": "c"}})
+    params_spec.process_runs([{'name': 'xyz'}, {}])
+    with pytest.raises(RuntimeError):
+        params_spec.process_runs([{'name': 'xyz'}, {'name': 'a'}])
+
+
+def outcome(process, run):
+    try:
+        process(run)
+    except RuntimeError:
+        return 'error'
+    return 'ok'
+
+
+@pytest.mark.parametrize('param_def', [
+    {"default": 1.0},
+    {"default": 1.0, "min": 0.0},
+    {"type": "float", "default": 1.0},
+    {"allowed": [1.0, 2.0], "default": 1.0},
+    {"type": "float", "default": 1.0, "nullable": True}])
+def test_process_runs_none(param_def):
+    params_spec = uq.ParamsSpecification({"x": param_def})
+    expected = outcome(params_spec.process_run, {'x': None})
+    runs = [{'x': 1.0}, {'x': None}]
+    assert(outcome(params_spec.process_runs, runs) == expected)
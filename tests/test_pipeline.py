@@ -0,0 +1,117 @@
+import os
+import time
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.actions import ExecutionResult
+from easyvvuq.pipeline import Pipeline
+
+SWEEP = {"a": [0.5, 1.0, 2.0, 3.5, 5.0, 8.0], "b": [1.0, 2.0, 3.0, 4.0, 5.0]}
+N_RUNS = 30
+
+
+class FakeModel:
+    """Writes the output of a run. Fails for a = 8, and writes no output for
+    a = 5."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def act_on_dir(self, target_dir):
+        start = time.monotonic()
+        time.sleep(self.delay)
+        params = {}
+        with open(os.path.join(target_dir, 'input.csv')) as fd:
+            for line in fd:
+                name, value = line.split(',')
+                params[name] = float(value)
+        if params['a'] == 8.0:
+            return ExecutionResult(1, time.monotonic() - start)
+        if params['a'] != 5.0:
+            with open(os.path.join(target_dir, 'output.csv'), 'w') as fd:
+                fd.write('x,y\n')
+                fd.write('{},{}\n'.format(params['a'] + params['b'], params['a'] * params['b']))
+        return ExecutionResult(0, time.monotonic() - start)
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    campaign = uq.Campaign(name='pipeline', work_dir=str(tmp_path))
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='pipeline', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname='tests/worker_serve/worker_serve.template', delimiter='$',
+                         target_filename='input.csv'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x', 'y'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=SWEEP))
+    campaign.draw_samples()
+    return campaign
+
+
+def test_run_pipeline(campaign):
+    counts = campaign.run_pipeline(FakeModel(), encode_workers=2, execute_workers=4,
+                                   decode_workers=2, flush_runs=7)
+    assert(counts[Status.COLLATED] == 20)
+    assert(counts[Status.ENCODED] == 5)
+    assert(counts[Status.FAILED] == 5)
+    progress = campaign.progress()
+    assert(progress[Status.NEW] == 0)
+    assert(progress[Status.FAILED] == 5)
+    result = campaign.get_collation_result()
+    assert(len(result) == 20)
+    assert(((result['x'] - result['a'] - result['b']).abs() < 1e-12).all())
+    df = campaign.runs_dataframe(columns=['a', 'exit_code'])
+    assert(list(df['exit_code'][df['a'] == 8.0]) == [1] * 5)
+    # Runs without output are collated once it appears
+    for run_id, run in campaign.list_runs(status=Status.ENCODED):
+        with open(os.path.join(run['run_dir'], 'output.csv'), 'w') as fd:
+            fd.write('x,y\n0.0,0.0\n')
+    campaign.collate()
+    assert(len(campaign.get_collation_result()) == 25)
+
+
+def test_pipeline_matches_phases(campaign, tmp_path):
+    campaign.run_pipeline(FakeModel(), execute_workers=3)
+    phased = uq.Campaign(name='pipeline', work_dir=str(tmp_path))
+    phased.add_app(name='pipeline', params=campaign._active_app['params'].params_dict,
+                   encoder=campaign._active_app_encoder, decoder=campaign._active_app_decoder,
+                   collater=uq.collate.AggregateSamples())
+    phased.set_sampler(uq.sampling.BasicSweep(sweep=SWEEP))
+    phased.draw_samples()
+    phased.populate_runs_dir()
+    phased.apply_for_each_run_dir(FakeModel())
+    phased.collate()
+    result = campaign.get_collation_result()
+    assert(list(result['index']) == list(range(len(result))))
+    # The pipeline collates the runs in the order they finish
+    expected = phased.get_collation_result().drop(columns='index')
+    expected = expected.sort_values('run_id').reset_index(drop=True)
+    result = result.drop(columns='index').sort_values('run_id').reset_index(drop=True)
+    assert(result.equals(expected))
+
+
+def test_first_results_stream(campaign):
+    pipeline = Pipeline(campaign, FakeModel(delay=0.05), execute_workers=2, flush_seconds=0.1)
+    flushes = []
+    flush = pipeline._flush
+
+    def record_flush():
+        flushes.append(campaign.progress()[Status.COLLATED])
+        flush()
+    pipeline._flush = record_flush
+    pipeline.run()
+    # Results are recorded while later runs are still being executed
+    assert(any(0 < collated < 20 for collated in flushes))
+    assert(campaign.progress()[Status.COLLATED] == 20)
+
+
+def test_pipeline_without_decoder(campaign):
+    campaign.add_app(name='no_decoder', params={"a": {"type": "float", "default": 1.0}},
+                     encoder=uq.encoders.DirectoryBuilder(tree={}),
+                     collater=uq.collate.AggregateSamples())
+    with pytest.raises(RuntimeError):
+        Pipeline(campaign, FakeModel())
@@ -0,0 +1,41 @@
+import os
+import json
+import pytest
+import chaospy as cp
+import easyvvuq as uq
+from easyvvuq.constants import Status
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    campaign = uq.Campaign(name='populate', work_dir=str(tmp_path))
+    params = {
+        "temp_init": {"type": "float", "min": 0.0, "max": 100.0, "default": 95.0},
+        "kappa": {"type": "float", "min": 0.0, "max": 0.1, "default": 0.025},
+        "t_env": {"type": "float", "min": 0.0, "max": 40.0, "default": 15.0},
+        "out_file": {"type": "string", "default": "output.csv"}}
+    campaign.add_app(name='cooling', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname='tests/cooling/cooling.template',
+                         delimiter='$', target_filename='cooling_in.json'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['te'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    vary = {"kappa": cp.Uniform(0.025, 0.075), "t_env": cp.Uniform(15, 25)}
+    campaign.set_sampler(uq.sampling.RandomSampler(vary=vary, max_num=23))
+    campaign.draw_samples()
+    return campaign
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_populate_runs_dir(campaign, workers):
+    campaign.populate_runs_dir(workers=workers, chunk_size=4)
+    runs = campaign.list_runs()
+    assert(len(runs) == 23)
+    for run_id, run in runs:
+        assert(run['status'] == Status.ENCODED)
+        with open(os.path.join(run['run_dir'], 'cooling_in.json')) as fd:
+            encoded = json.load(fd)
+        assert(float(encoded['kappa']) == pytest.approx(run['params']['kappa']))
+        assert(float(encoded['t_env']) == pytest.approx(run['params']['t_env']))
+    assert(campaign.campaign_db.get_num_runs(status=Status.NEW) == 0)
@@ -0,0 +1,74 @@
+import os
+import pytest
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.tools.progress import main, format_progress
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    campaign = uq.Campaign(name='progress', work_dir=str(tmp_path))
+    params = {"a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    for name in ['first', 'second']:
+        campaign.add_app(name=name, params=params,
+                         encoder=uq.encoders.DirectoryBuilder(tree={}),
+                         decoder=uq.decoders.SimpleCSV(
+                             target_filename='output.csv', output_columns=['x'], header=0),
+                         collater=uq.collate.AggregateSamples())
+        campaign.set_sampler(uq.sampling.BasicSweep(sweep={"a": [1.0, 2.0, 3.0, 4.0]}))
+        campaign.draw_samples()
+    campaign.populate_runs_dir()
+    campaign.campaign_db.set_run_statuses(['Run_5', 'Run_6'], Status.COLLATED)
+    campaign.campaign_db.set_run_statuses(['Run_1'], Status.IGNORED)
+    return campaign
+
+
+def test_status_counts(campaign):
+    db = campaign.campaign_db
+    counts = db.status_counts()
+    assert(counts == {Status.NEW: 3, Status.ENCODED: 2, Status.COLLATED: 2, Status.IGNORED: 1,
+                      Status.CLAIMED: 0, Status.FAILED: 0})
+    assert(db.status_counts(app_id=1) ==
+           {Status.NEW: 3, Status.ENCODED: 0, Status.COLLATED: 0, Status.IGNORED: 1,
+            Status.CLAIMED: 0, Status.FAILED: 0})
+    by_app = db.status_counts(group_by=('app',))
+    assert(sorted(by_app) == [1, 2])
+    assert(by_app[2] == {Status.NEW: 0, Status.ENCODED: 2, Status.COLLATED: 2, Status.IGNORED: 0,
+                         Status.CLAIMED: 0, Status.FAILED: 0})
+    by_app_sampler = db.status_counts(group_by=('app', 'sampler'))
+    assert(sorted(by_app_sampler) == [(1, 1), (2, 2)])
+    assert(db.status_counts(app_id=3) == {status: 0 for status in Status})
+    with pytest.raises(RuntimeError):
+        db.status_counts(group_by=('status',))
+
+
+def test_progress(campaign):
+    assert(campaign.progress()[Status.COLLATED] == 2)
+    assert(sum(campaign.progress().values()) == 4)
+    assert(sum(campaign.progress(all_apps=True).values()) == 8)
+    assert(format_progress(campaign.progress()) ==
+           "NEW 0 | ENCODED 2 | COLLATED 2 | IGNORED 0 | CLAIMED 0 | FAILED 0 | "
+           "total 4 | done 50.0%")
+    previous = campaign.progress()
+    previous[Status.COLLATED] = 0
+    assert(format_progress(campaign.progress(), previous, 2.0).endswith("| 1.0 runs/s"))
+
+
+def test_progress_cli(campaign, capsys):
+    db_location = os.path.join(campaign.campaign_dir, 'campaign.db')
+    assert(main([db_location, 'progress', '--app', 'first', '--once']) == 0)
+    out = capsys.readouterr().out
+    assert("NEW 3 | ENCODED 0 | COLLATED 0 | IGNORED 1 | CLAIMED 0 | FAILED 0 | "
+           "total 4 | done 25.0%" in out)
+
+
+def test_progress_cli_out_of_date(campaign, capsys):
+    from sqlalchemy import text
+    engine = campaign.campaign_db.engine
+    with engine.begin() as connection:
+        connection.execute(text('UPDATE schema_version SET version = 1'))
+    db_location = os.path.join(campaign.campaign_dir, 'campaign.db')
+    assert(main([db_location, 'progress', '--once']) == 1)
+    assert('schema version 1' in capsys.readouterr().err)
+    # The database is left as it was
+    assert(campaign.campaign_db.schema_version() == 1)
@@ -1,5 +1,7 @@
 import easyvvuq as uq
 import chaospy as cp
+import numpy as np
+import pytest
 
 
 def test_lhc():
@@ -22,3 +24,41 @@ def test_halton():
         assert(sample['b'] >= 2.0)
         assert(sample['b'] <= 10.0)
     assert(sampler.n_samples() == 10)
+
+
+def test_lhc_stratified():
+    vary = {'a': cp.Uniform(0, 1), 'b': cp.Uniform(0, 1), 'c': cp.Uniform(0, 1)}
+    sampler = uq.sampling.quasirandom.LHCSampler(vary, max_num=50)
+    samples = np.array([[s['a'], s['b'], s['c']] for s in sampler])
+    # exactly one point in each of the max_num strata, for every parameter
+    for column in samples.T:
+        assert(sorted(np.floor(column * 50).astype(int)) == list(range(50)))
+
+
+def test_lhc_restart():
+    vary = {'a': cp.Uniform(-5, 3), 'b': cp.Normal(0, 1)}
+    sampler = uq.sampling.quasirandom.LHCSampler(vary, max_num=20)
+    first = [next(sampler) for _ in range(8)]
+    restarted = uq.sampling.BaseSamplingElement.deserialize(sampler.serialize())
+    rest = list(restarted)
+    assert(len(rest) == 12)
+    fresh = uq.sampling.quasirandom.LHCSampler(vary, max_num=20, seed=sampler.seed)
+    expected = list(fresh)
+    for sample, ref in zip(first + rest, expected):
+        assert(sample['a'] == pytest.approx(ref['a']))
+        assert(sample['b'] == pytest.approx(ref['b']))
+    with pytest.raises(RuntimeError):
+        uq.sampling.quasirandom.LHCSampler(vary)
+
+
+def test_halton_sequence():
+    vary = {'a': cp.Uniform(0, 1), 'b': cp.Uniform(0, 1)}
+    sampler = uq.sampling.quasirandom.HaltonSampler(vary)
+    samples = [next(sampler) for _ in range(3)]
+    assert([s['a'] for s in samples] == pytest.approx([1 / 2, 1 / 4, 3 / 4]))
+    assert([s['b'] for s in samples] == pytest.approx([1 / 3, 2 / 3, 1 / 9]))
+    # the sequence is extensible: blocks continue where iteration stopped
+    block, names = sampler.sample_block(2)
+    assert(block[:, 0] == pytest.approx([1 / 8, 5 / 8]))
+    assert(block[:, 1] == pytest.approx([4 / 9, 7 / 9]))
+    assert(sampler.count == 5)
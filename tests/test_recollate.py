@@ -1,4 +1,5 @@
 import easyvvuq as uq
+from easyvvuq.constants import Status
 import chaospy as cp
 import os
 import sys
@@ -126,6 +127,10 @@ def test_recollate(tmpdir):
 
     # Rerun some runs
     my_campaign.rerun(['Run_2', 'Run_3', 'Run_4'])
+    statuses = my_campaign.campaign_db.get_run_statuses(['Run_2', 'Run_3', 'Run_4'])
+    assert(all([status == Status.ENCODED for status in statuses.values()]))
+    with pytest.raises(RuntimeError):
+        my_campaign.rerun(['Run_2', 'Run_{}'.format(num_samples + 1)])
     my_campaign.apply_for_each_run_dir(actions)
 
     pprint(my_campaign._log)
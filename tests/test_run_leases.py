@@ -0,0 +1,88 @@
+import time
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import easyvvuq as uq
+from easyvvuq.constants import default_campaign_prefix, Status
+from easyvvuq.db.sql import CampaignDB
+from easyvvuq.data_structs import CampaignInfo, RunInfo
+
+N_RUNS = 120
+
+
+@pytest.fixture
+def db(tmp_path):
+    info = CampaignInfo(
+        name='test',
+        campaign_dir_prefix=default_campaign_prefix,
+        easyvvuq_version=uq.__version__,
+        campaign_dir=str(tmp_path))
+    db = CampaignDB(location='sqlite:///{}/test.sqlite'.format(tmp_path),
+                    new_campaign=True, name='test', info=info)
+    db.location = 'sqlite:///{}/test.sqlite'.format(tmp_path)
+    db.add_runs([RunInfo('run', 'test', '.', 1, {'a': i}, 1, 1) for i in range(N_RUNS)])
+    return db
+
+
+def test_claim_runs(db):
+    claimed = db.claim_runs(5, 'a')
+    assert(claimed == ['Run_1', 'Run_2', 'Run_3', 'Run_4', 'Run_5'])
+    assert(db.claim_runs(3, 'b') == ['Run_6', 'Run_7', 'Run_8'])
+    assert(db.status_counts()[Status.CLAIMED] == 8)
+    assert(db.claim_runs(5, 'c', status=Status.ENCODED) == [])
+    assert(db.claim_runs(1000, 'c') == ['Run_{}'.format(i) for i in range(9, N_RUNS + 1)])
+    assert(db.claim_runs(1, 'd') == [])
+    with pytest.raises(RuntimeError):
+        db.claim_runs(0, 'd')
+
+
+def test_release_runs(db):
+    claimed = db.claim_runs(4, 'a')
+    # Only the worker holding the lease can release the runs
+    assert(db.release_runs('b', claimed) == 0)
+    assert(db.release_runs('a', claimed[:2], status=Status.ENCODED) == 2)
+    assert(db.release_runs('a', claimed[2:]) == 2)
+    assert(db.get_run_statuses(claimed) == {'Run_1': Status.ENCODED, 'Run_2': Status.ENCODED,
+                                            'Run_3': Status.NEW, 'Run_4': Status.NEW})
+    assert(db.claim_runs(2, 'b') == ['Run_3', 'Run_4'])
+
+
+def test_lease_expiry(db):
+    claimed = db.claim_runs(3, 'a', lease_seconds=0.5)
+    assert(db.claim_runs(2, 'b', lease_seconds=0.5) == ['Run_4', 'Run_5'])
+    time.sleep(0.6)
+    assert(db.renew_leases('b', lease_seconds=60) == 2)
+    # Expired leases are claimed again, renewed ones are not
+    assert(db.claim_runs(4, 'c') == claimed + ['Run_6'])
+    assert(db.release_runs('a', claimed) == 0)
+    assert(db.renew_leases('a') == 0)
+    assert(db.release_runs('c', claimed, status=Status.ENCODED) == 3)
+
+
+def test_reclaim_expired_runs(db):
+    db.claim_runs(3, 'a', lease_seconds=0.5)
+    db.claim_runs(3, 'b', lease_seconds=60)
+    assert(db.reclaim_expired_runs() == 0)
+    time.sleep(0.6)
+    assert(db.reclaim_expired_runs() == 3)
+    assert(db.status_counts()[Status.CLAIMED] == 3)
+    assert(db.get_run_status('Run_1') == Status.NEW)
+
+
+def claim_all(location, worker_id):
+    db = CampaignDB(location=location, name='test', engine_options={'journal_mode': 'WAL'})
+    claimed = []
+    while True:
+        run_names = db.claim_runs(7, worker_id)
+        if not run_names:
+            return claimed
+        claimed += run_names
+        db.release_runs(worker_id, run_names, status=Status.ENCODED)
+
+
+def test_concurrent_claims(db):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(claim_all, [db.location] * 4, ['w0', 'w1', 'w2', 'w3']))
+    claimed = [run_name for result in results for run_name in result]
+    assert(len(claimed) == N_RUNS)
+    assert(len(set(claimed)) == N_RUNS)
+    assert(db.status_counts()[Status.ENCODED] == N_RUNS)
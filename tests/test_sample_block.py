@@ -0,0 +1,48 @@
+import easyvvuq as uq
+import chaospy as cp
+import numpy as np
+import pytest
+
+
+VARY = {'a': cp.Uniform(-5, 3), 'b': cp.Uniform(2, 10)}
+
+
+@pytest.mark.parametrize('sampler_class', [
+    uq.sampling.RandomSampler,
+    uq.sampling.quasirandom.LHCSampler,
+    uq.sampling.quasirandom.HaltonSampler])
+def test_random_sample_block(sampler_class):
+    sampler = sampler_class(VARY, max_num=100)
+    block, names = sampler.sample_block(60)
+    assert(names == ['a', 'b'])
+    assert(block.shape == (60, 2))
+    assert((block[:, 0] >= -5.0).all() and (block[:, 0] <= 3.0).all())
+    assert((block[:, 1] >= 2.0).all() and (block[:, 1] <= 10.0).all())
+    block, _ = sampler.sample_block(60)
+    assert(block.shape == (40, 2))
+    assert(sampler.count == 100)
+    block, _ = sampler.sample_block(60)
+    assert(block.shape == (0, 2))
+
+
+@pytest.mark.parametrize('make_sampler', [
+    lambda: uq.sampling.QMCSampler(VARY, n_mc_samples=20),
+    lambda: uq.sampling.PCESampler(VARY, polynomial_order=3),
+    lambda: uq.sampling.SCSampler(VARY, polynomial_order=3)])
+def test_deterministic_sample_block(make_sampler):
+    expected = np.array([[run['a'], run['b']] for run in make_sampler()])
+    sampler = make_sampler()
+    first, names = sampler.sample_block(5)
+    rest, _ = sampler.sample_block(10 ** 6)
+    assert(names == ['a', 'b'])
+    assert(np.allclose(np.vstack([first, rest]), expected))
+    assert(sampler.count == len(expected))
+
+
+def test_default_sample_block():
+    sampler = uq.sampling.BasicSweep(sweep={'a': [1, 2, 3], 'b': [4, 5]})
+    block, names = sampler.sample_block(4)
+    assert(names == ['a', 'b'])
+    assert(block.tolist() == [[1, 4], [1, 5], [2, 4], [2, 5]])
+    block, names = sampler.sample_block(4)
+    assert(block.tolist() == [[3, 4], [3, 5]])
@@ -0,0 +1,144 @@
+import os
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import easyvvuq as uq
+from easyvvuq.constants import Status
+from easyvvuq.tools.run_worker import main
+
+SWEEP = {"a": [0.5, 1.0, 2.0, 3.5, 5.0, 8.0], "b": [1.0, 2.0, 3.0, 4.0, 5.0]}
+N_RUNS = 30
+
+
+class FakeModel:
+    """Writes the output of a run, failing for a = 8 if `fail` is set."""
+
+    def __init__(self, fail=False, worker=None):
+        self.fail = fail
+        self.worker = worker
+
+    def act_on_dir(self, target_dir):
+        params = {}
+        with open(os.path.join(target_dir, 'input.csv')) as fd:
+            for line in fd:
+                name, value = line.split(',')
+                params[name] = float(value)
+        if self.fail and params['a'] == 8.0:
+            raise RuntimeError('model failed')
+        if self.worker is not None:
+            self.worker.stop()
+        with open(os.path.join(target_dir, 'output.csv'), 'w') as fd:
+            fd.write('x,y\n')
+            fd.write('{},{}\n'.format(params['a'] + params['b'], params['a'] * params['b']))
+
+
+def make_campaign(tmp_path, collation_store='sql'):
+    campaign = uq.Campaign(name='serve', work_dir=str(tmp_path),
+                           db_options={'journal_mode': 'WAL'}, collation_store=collation_store)
+    params = {
+        "a": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0},
+        "b": {"type": "float", "min": 0.0, "max": 10.0, "default": 1.0}}
+    campaign.add_app(name='serve', params=params,
+                     encoder=uq.encoders.GenericEncoder(
+                         template_fname='tests/worker_serve/worker_serve.template', delimiter='$',
+                         target_filename='input.csv'),
+                     decoder=uq.decoders.SimpleCSV(
+                         target_filename='output.csv', output_columns=['x', 'y'], header=0),
+                     collater=uq.collate.AggregateSamples())
+    campaign.set_sampler(uq.sampling.BasicSweep(sweep=SWEEP))
+    campaign.draw_samples()
+    return campaign
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    return make_campaign(tmp_path)
+
+
+def make_worker(campaign, worker_id=None):
+    return uq.Worker(db_location=campaign.db_location, campaign_name=campaign.campaign_name,
+                     worker_id=worker_id, db_options={'journal_mode': 'WAL'})
+
+
+def test_serve(campaign):
+    counts = make_worker(campaign).serve(action=FakeModel(), batch_size=4, concurrency=3)
+    assert(counts[Status.COLLATED] == N_RUNS)
+    assert(campaign.progress()[Status.COLLATED] == N_RUNS)
+    result = campaign.get_collation_result()
+    assert(len(result) == N_RUNS)
+    assert(list(result['run_id']) == ['Run_{}'.format(i) for i in range(1, N_RUNS + 1)])
+    assert(((result['x'] - result['a'] - result['b']).abs() < 1e-12).all())
+    run = campaign.campaign_db.run('Run_3')
+    assert(os.path.isfile(os.path.join(run['run_dir'], 'output.csv')))
+
+
+def test_serve_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    campaign = make_campaign(tmp_path, 'parquet')
+    worker = make_worker(campaign)
+    assert(worker.campaign_db.collation_store == 'parquet')
+    counts = worker.serve(action=FakeModel(), batch_size=4, concurrency=3)
+    assert(counts[Status.COLLATED] == N_RUNS)
+    result = campaign.get_collation_result()
+    assert(sorted(result['run_id']) == sorted('Run_{}'.format(i) for i in range(1, N_RUNS + 1)))
+    assert(((result['y'] - result['a'] * result['b']).abs() < 1e-12).all())
+    assert(os.path.isdir(os.path.join(campaign.campaign_dir, 'collation', 'app1')))
+
+
+def test_serve_without_decoding(campaign):
+    counts = make_worker(campaign).serve(batch_size=7, decode=False)
+    assert(counts[Status.ENCODED] == N_RUNS)
+    for run_id, run in campaign.list_runs():
+        assert(run['status'] == Status.ENCODED)
+        assert(os.path.isfile(os.path.join(run['run_dir'], 'input.csv')))
+    # Runs without output are left for the campaign to collate
+    campaign.apply_for_each_run_dir(FakeModel())
+    campaign.collate()
+    assert(len(campaign.get_collation_result()) == N_RUNS)
+
+
+def test_serve_without_decoder(campaign):
+    campaign.add_app(name='no_decoder', params={"a": {"type": "float", "default": 1.0}},
+                     encoder=uq.encoders.DirectoryBuilder(tree={}),
+                     collater=uq.collate.AggregateSamples())
+    worker = uq.Worker(db_location=campaign.db_location, campaign_name=campaign.campaign_name,
+                       app_name='no_decoder')
+    with pytest.raises(RuntimeError):
+        worker.serve(batch_size=4)
+
+
+def test_serve_failures(campaign):
+    counts = make_worker(campaign).serve(action=FakeModel(fail=True), batch_size=4,
+                                         concurrency=2)
+    assert(counts[Status.FAILED] == 5)
+    assert(counts[Status.COLLATED] == N_RUNS - 5)
+    assert(campaign.progress()[Status.FAILED] == 5)
+
+
+def test_serve_stop(campaign):
+    worker = make_worker(campaign)
+    counts = worker.serve(action=FakeModel(worker=worker), batch_size=10, concurrency=1)
+    # The run in progress is finished, the rest of the batch is released
+    assert(counts[Status.COLLATED] == 1)
+    progress = campaign.progress()
+    assert(progress[Status.NEW] == N_RUNS - 1)
+    assert(progress[Status.CLAIMED] == 0)
+
+
+def serve(db_location, worker_id):
+    worker = uq.Worker(db_location=db_location, campaign_name='serve', worker_id=worker_id,
+                       db_options={'journal_mode': 'WAL'})
+    return worker.serve(action=FakeModel(), batch_size=2, concurrency=2)[Status.COLLATED]
+
+
+def test_serve_many_workers(campaign):
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        collated = list(executor.map(serve, [campaign.db_location] * 3, ['w0', 'w1', 'w2']))
+    assert(sum(collated) == N_RUNS)
+    result = campaign.get_collation_result()
+    assert(sorted(result['run_id']) == sorted('Run_{}'.format(i) for i in range(1, N_RUNS + 1)))
+
+
+def test_run_worker_cli(campaign, capsys):
+    assert(main([campaign.db_location, 'serve', '--batch-size', '8', '--no-decode']) == 0)
+    assert('ENCODED 30' in capsys.readouterr().out)
+    assert(campaign.progress()[Status.ENCODED] == N_RUNS)